@@ -0,0 +1,80 @@
+"""
+Compara la búsqueda de solapamientos por pares (O(n²)) con el barrido de
+core.conflict_detector sobre eventos sintéticos, y mide la actualización
+incremental de un evento.
+
+Uso:
+    OPENROUTER_API_KEY=x python benchmarks/bench_conflicts.py [--events 5000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from core.conflict_detector import ConflictDetector, event_key
+from models.event import Event
+
+
+def make_events(count, seed=1):
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 6, tzinfo=timezone.utc)
+    events = []
+    for i in range(count):
+        event = Event()
+        event.google_event_id = f"ev{i}"
+        event.title = f"Evento {i % 50}"
+        day = rng.randrange(count // 8 + 1)
+        event.start_datetime = base + timedelta(days=day, hours=rng.randrange(8, 20), minutes=rng.choice((0, 15, 30, 45)))
+        event.end_datetime = event.start_datetime + timedelta(minutes=rng.choice((15, 30, 45, 60, 90)))
+        events.append(event)
+    return events
+
+
+def brute_force_pairs(events):
+    pairs = set()
+    for i, a in enumerate(events):
+        for b in events[i + 1:]:
+            if a.start_datetime < b.end_datetime and b.start_datetime < a.end_datetime:
+                pairs.add(frozenset((event_key(a), event_key(b))))
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=5000)
+    args = parser.parse_args()
+    events = make_events(args.events)
+
+    start = time.perf_counter()
+    expected = brute_force_pairs(events)
+    brute = time.perf_counter() - start
+
+    start = time.perf_counter()
+    detector = ConflictDetector(events)
+    pairs = {frozenset((event_key(a), event_key(b))) for a, b in detector.conflicting_pairs()}
+    sweep = time.perf_counter() - start
+    assert pairs == expected, "El barrido no coincide con la búsqueda por pares"
+
+    moved = events[len(events) // 2]
+    start = time.perf_counter()
+    moved.start_datetime += timedelta(minutes=30)
+    moved.end_datetime += timedelta(minutes=30)
+    detector.sync(events)
+    detector.conflicts_for(moved)
+    incremental = time.perf_counter() - start
+    pairs = {frozenset((event_key(a), event_key(b))) for a, b in detector.conflicting_pairs()}
+    assert pairs == brute_force_pairs(events), "La actualización incremental no coincide"
+
+    print(f"{len(events)} eventos, {len(pairs)} pares solapados, {len(detector.clusters())} grupos")
+    print(f"por pares     {brute * 1000:9.1f} ms")
+    print(f"barrido       {sweep * 1000:9.1f} ms")
+    print(f"mover uno     {incremental * 1000:9.1f} ms (sync + conflicts_for)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Compara el formato de eventos de una línea por evento (el anterior) con
+core.event_encoding.encode_events_compact sobre logs/raw_events.json.
+
+Uso:
+    OPENROUTER_API_KEY=x python benchmarks/bench_event_encoding.py [--events logs/raw_events.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from core.event_encoding import encode_events_compact
+from core.google_calendar import GoogleCalendarManager
+from core.prompt_builder import estimate_tokens
+
+
+def encode_verbose(events):
+    return "\n".join(
+        f"- {event.title}: {event.start_datetime.strftime('%Y-%m-%d %H:%M')} a {event.end_datetime.strftime('%H:%M')}"
+        for event in events
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', default=os.path.join(ROOT, 'logs', 'raw_events.json'))
+    args = parser.parse_args()
+
+    with open(args.events, encoding='utf-8') as f:
+        payload = json.load(f)
+    # _convert_to_event no usa el estado del manager
+    manager = GoogleCalendarManager.__new__(GoogleCalendarManager)
+    events = [manager._convert_to_event(item) for item in payload]
+
+    for name, encode in (("una línea por evento", encode_verbose), ("compacto", encode_events_compact)):
+        start = time.perf_counter()
+        text = encode(events)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {len(events)} eventos  {len(text):8d} chars  "
+              f"~{estimate_tokens(text):7d} tokens  {elapsed * 1000:6.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Mide FreeBusyIndex (core.free_slots) con eventos sintéticos: construcción del
+índice y la consulta "45 minutos libres esta semana".
+
+Uso:
+    OPENROUTER_API_KEY=x python benchmarks/bench_free_slots.py [--events 5000] [--repeat 1000]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from bench_conflicts import make_events
+from core.free_slots import FreeBusyIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args()
+    events = make_events(args.events)
+
+    start = time.perf_counter()
+    index = FreeBusyIndex(events)
+    build = time.perf_counter() - start
+
+    week_start = datetime(2025, 2, 3, tzinfo=timezone.utc)
+    week_end = week_start + timedelta(days=7)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        slots = index.find_free_slots(week_start, week_end, timedelta(minutes=45), tz=timezone.utc, limit=1)
+    first = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        all_slots = index.find_free_slots(week_start, week_end, timedelta(minutes=45), tz=timezone.utc)
+    whole_week = (time.perf_counter() - start) / args.repeat
+
+    print(f"{len(events)} eventos -> {len(index)} intervalos ocupados fusionados")
+    print(f"construcción          {build * 1000:8.2f} ms")
+    print(f"primer hueco de 45'   {first * 1e6:8.1f} µs  {slots[0][0]:%a %H:%M}" if slots else "sin huecos")
+    print(f"todos los de 45'      {whole_week * 1e6:8.1f} µs  ({len(all_slots)} huecos)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Compara la latencia de peticiones con requests.post "en frío" frente a la
+sesión compartida de core.http_client, contra el servidor stub local.
+
+En local no hay TLS, así que la diferencia medida es solo el handshake TCP
+y la creación de la sesión; contra OpenRouter el ahorro es mayor.
+
+Uso:
+    OPENROUTER_API_KEY=x python benchmarks/bench_http_pool.py [--requests 200]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+from core import http_client
+from stub_server import StubServer
+
+
+def _measure(send, count):
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = send()
+        response.raise_for_status()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(name, timings):
+    ordered = sorted(timings)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{name:<24} p50={statistics.median(ordered) * 1000:7.3f} ms  "
+          f"p95={p95 * 1000:7.3f} ms  total={sum(ordered) * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    body = json.dumps({'model': 'stub', 'messages': [{'role': 'user', 'content': 'hola'}]})
+    headers = {'Content-Type': 'application/json'}
+
+    with StubServer() as server:
+        url = f"{server.url}/api/v1/chat/completions"
+        _report("requests.post (sin pool)",
+                _measure(lambda: requests.post(url, data=body, headers=headers), args.requests))
+        _report("http_client.post (pool)",
+                _measure(lambda: http_client.post(url, data=body, headers=headers), args.requests))
+    http_client.close_session()
+
+
+if __name__ == '__main__':
+    main()
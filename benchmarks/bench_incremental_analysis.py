@@ -0,0 +1,58 @@
+"""
+Mide la actualización incremental de los agregados diarios del análisis
+mensual (core.analysis_store) sobre una base de datos temporal: primera
+ejecución, repetición sin cambios y repetición con un solo día modificado.
+
+Uso:
+    OPENROUTER_API_KEY=x python benchmarks/bench_incremental_analysis.py [--events 3000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from bench_conflicts import make_events
+from core import database
+from core.analysis_store import AnalysisStore
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    changed = func()
+    print(f"{label:<24} {(time.perf_counter() - start) * 1000:8.1f} ms  ({len(changed)} días escritos)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=3000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DATABASE_PATH = os.path.join(tmp, 'calendar.db')
+        store = AnalysisStore(database.DatabaseManager())
+        # Todo el volumen concentrado en un mes
+        events = make_events(args.events)
+        base_day = events[0].start_datetime.replace(day=1, hour=0, minute=0)
+        for i, event in enumerate(events):
+            offset = timedelta(days=i % 28) - (event.start_datetime.replace(hour=0, minute=0) - base_day)
+            event.start_datetime += offset
+            event.end_datetime += offset
+        month = base_day.strftime('%Y-%m')
+
+        timed("primera ejecución", lambda: store.update_month(month, events))
+        timed("sin cambios", lambda: store.update_month(month, events))
+        events[0].end_datetime += timedelta(minutes=15)
+        timed("un evento movido", lambda: store.update_month(month, events))
+        start = time.perf_counter()
+        summary = store.month_summary(month)
+        print(f"{'resumen del mes':<24} {(time.perf_counter() - start) * 1000:8.1f} ms")
+        print(summary)
+
+
+if __name__ == '__main__':
+    main()
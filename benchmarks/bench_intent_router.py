@@ -0,0 +1,48 @@
+"""
+Mide el tiempo de decisión del router local de FunctionIdentifier.
+
+Uso:
+    OPENROUTER_API_KEY=x python benchmarks/bench_intent_router.py [--rounds 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.function_identifier import FunctionIdentifier
+
+MESSAGES = [
+    "Traduce 'reunión a las 5' a código Morse",
+    "¿Qué tengo mañana por la tarde?",
+    "Optimiza mi semana, tengo demasiadas reuniones seguidas",
+    "pasa esto a morse: SOS",
+    "Necesito un código para la puerta",
+    "Mueve la llamada con Ana al jueves a las 10:30",
+    "Resume los eventos de este mes y dime dónde puedo descansar más",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=2000)
+    args = parser.parse_args()
+
+    identifier = FunctionIdentifier()
+    for message in MESSAGES:
+        function_id, confidence = identifier.route(message)
+        print(f"{confidence:4.2f} {function_id:<14} {message}")
+
+    decisions = args.rounds * len(MESSAGES)
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for message in MESSAGES:
+            identifier.route(message)
+    elapsed = time.perf_counter() - start
+    print(f"\n{decisions} decisiones en {elapsed * 1000:.1f} ms "
+          f"({elapsed / decisions * 1e6:.2f} µs por decisión)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Mide la analítica local (core.calendar_analytics) sobre logs/raw_events.json,
+repitiendo los eventos para simular calendarios más grandes.
+
+Uso:
+    OPENROUTER_API_KEY=x python benchmarks/bench_local_analytics.py [--events logs/raw_events.json] [--scale 10]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import timedelta
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from core.calendar_analytics import build_predictions_response
+from core.google_calendar import GoogleCalendarManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', default=os.path.join(ROOT, 'logs', 'raw_events.json'))
+    parser.add_argument('--scale', type=int, default=10)
+    args = parser.parse_args()
+
+    with open(args.events, encoding='utf-8') as f:
+        payload = json.load(f)
+    # _convert_to_event no usa el estado del manager
+    manager = GoogleCalendarManager.__new__(GoogleCalendarManager)
+    base = [manager._convert_to_event(item) for item in payload]
+    if not base:
+        sys.exit("Sin eventos en " + args.events)
+    now = max(e.start_datetime for e in base)
+
+    for scale in (1, args.scale):
+        events = []
+        for copy in range(scale):
+            # Cada copia se desplaza una semana hacia atrás
+            for event in base:
+                clone = manager._convert_to_event(event_payload(event))
+                clone.start_datetime -= timedelta(weeks=copy)
+                clone.end_datetime -= timedelta(weeks=copy)
+                events.append(clone)
+        start = time.perf_counter()
+        response = build_predictions_response(events, now)
+        elapsed = time.perf_counter() - start
+        print(f"x{scale:<4} {len(events):6d} eventos  {elapsed * 1000:7.1f} ms  {len(response)} chars")
+
+
+def event_payload(event):
+    return {
+        'id': event.google_event_id,
+        'summary': event.title,
+        'start': {'dateTime': event.start_datetime.isoformat()},
+        'end': {'dateTime': event.end_datetime.isoformat()},
+    }
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Compara la carga del log en DevPanel con readlines()[-1000:] frente a
+utils.log_reader.tail_lines, y el filtrado línea a línea frente a scan_log
+(mmap), sobre un log sintético.
+
+Uso:
+    OPENROUTER_API_KEY=x python benchmarks/bench_log_reader.py [--mb 50] [--lines 1000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from utils.log_reader import tail_lines, scan_log
+
+LEVELS = ['INFO'] * 90 + ['DEBUG'] * 6 + ['WARNING'] * 3 + ['ERROR']
+NAMES = ['core.google_calendar', 'core.ai_assistant', 'ui.main_window', 'root']
+
+
+def write_log(path, megabytes, seed=1):
+    rng = random.Random(seed)
+    moment = datetime(2025, 1, 6, 8)
+    target = megabytes * 1024 * 1024
+    with open(path, 'w', encoding='utf-8') as f:
+        while f.tell() < target:
+            lines = []
+            for i in range(1000):
+                moment += timedelta(milliseconds=rng.randrange(1, 500))
+                lines.append(
+                    f"{moment.strftime('%Y-%m-%d %H:%M:%S')},{moment.microsecond // 1000:03d} - "
+                    f"{rng.choice(NAMES)} - {rng.choice(LEVELS)} - "
+                    f"Evento {rng.randrange(10000)} procesado en {rng.random():.3f}s (calendario primary)\n"
+                )
+            f.write(''.join(lines))
+
+
+def readlines_tail(path, count):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.rstrip('\n') for line in f.readlines()[-count:]]
+
+
+def readlines_filter(path, level, text, count):
+    needle = f" - {level} - "
+    with open(path, 'r', encoding='utf-8') as f:
+        matches = [line.rstrip('\n') for line in f if needle in line and text in line]
+    return matches[-count:]
+
+
+def measure(func, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mb', type=int, default=50)
+    parser.add_argument('--lines', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'calendar_app.log')
+        write_log(path, args.mb)
+        print(f"Log de {os.path.getsize(path) / 1024 / 1024:.1f} MB, últimas {args.lines} líneas\n")
+
+        cases = [
+            ('cola del archivo', (readlines_tail, path, args.lines), (tail_lines, path, args.lines)),
+            ('nivel ERROR', (readlines_filter, path, 'ERROR', '', args.lines),
+             (lambda p, n: scan_log(p, 'ERROR', limit=n), path, args.lines)),
+            ('ERROR + texto', (readlines_filter, path, 'ERROR', 'Evento 42', args.lines),
+             (lambda p, n: scan_log(p, 'ERROR', 'Evento 42', limit=n), path, args.lines)),
+        ]
+        for name, (old, *old_args), (new, *new_args) in cases:
+            old_time, old_result = measure(old, *old_args)
+            new_time, new_result = measure(new, *new_args)
+            status = 'ok' if old_result == new_result else 'DISTINTO'
+            print(f"{name:<18} readlines {old_time * 1000:>9.1f} ms   log_reader {new_time * 1000:>8.2f} ms   "
+                  f"x{old_time / new_time:>7.1f}  ({len(new_result)} líneas, {status})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Mide el tiempo de hilo de interfaz que cuesta mostrar una ráfaga de logs en
+el QPlainTextEdit de DevPanel: una llamada appendPlainText + moveCursor por
+registro (antes) frente al volcado por lotes del búfer circular (ahora).
+
+Uso:
+    OPENROUTER_API_KEY=x QT_QPA_PLATFORM=offscreen python benchmarks/bench_log_view.py [--lines 20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from PyQt6.QtGui import QTextCursor
+from PyQt6.QtWidgets import QApplication, QPlainTextEdit
+
+from ui.components.dev_panel import LogViewer
+
+
+def make_widget():
+    widget = QPlainTextEdit()
+    widget.setReadOnly(True)
+    widget.setMaximumBlockCount(LogViewer.MAX_BLOCK_COUNT)
+    widget.resize(800, 600)
+    widget.show()
+    return widget
+
+
+def per_record(widget, lines):
+    for line in lines:
+        widget.appendPlainText(line)
+        widget.moveCursor(QTextCursor.MoveOperation.End)
+
+
+def batched(widget, lines, batch_size):
+    for i in range(0, len(lines), batch_size):
+        widget.appendPlainText('\n'.join(lines[i:i + batch_size]))
+        widget.moveCursor(QTextCursor.MoveOperation.End)
+
+
+def measure(app, func, *args):
+    widget = make_widget()
+    app.processEvents()
+    start = time.perf_counter()
+    func(widget, *args)
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    blocks = widget.blockCount()
+    widget.close()
+    return elapsed, blocks
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lines', type=int, default=20000)
+    parser.add_argument('--rate', type=int, default=5000,
+                        help='registros por segundo para calcular el tamaño de lote')
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    lines = [f"2025-01-06 10:00:00,{i % 1000:03d} - DEBUG - Evento {i} procesado (calendario primary)"
+             for i in range(args.lines)]
+    batch_size = max(1, args.rate * LogViewer.FLUSH_INTERVAL_MS // 1000)
+
+    old_time, old_blocks = measure(app, per_record, lines)
+    new_time, new_blocks = measure(app, batched, lines, batch_size)
+    print(f"{args.lines} líneas, lotes de {batch_size} (cada {LogViewer.FLUSH_INTERVAL_MS} ms a {args.rate}/s)\n")
+    print(f"por registro  {old_time * 1000:>9.1f} ms  ({old_blocks} bloques)")
+    print(f"por lotes     {new_time * 1000:>9.1f} ms  ({new_blocks} bloques)  x{old_time / new_time:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Mide cuánto tarda quien loguea (GUI o worker) con un FileHandler síncrono
+frente al pipeline de utils.logger (QueueHandler + QueueListener), con varios
+hilos logueando a la vez y, opcionalmente, un sink lento (p. ej. disco de red).
+
+Uso:
+    OPENROUTER_API_KEY=x python benchmarks/bench_logging.py [--threads 8] [--messages 5000] [--slow-ms 0.2]
+"""
+import argparse
+import logging
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from logging.handlers import QueueListener
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from utils.logger import AsyncQueueHandler, LOG_FORMAT
+
+
+class SlowFileHandler(logging.FileHandler):
+    """FileHandler que simula un disco lento"""
+
+    def __init__(self, filename, delay):
+        super().__init__(filename, encoding='utf-8')
+        self.delay = delay
+
+    def emit(self, record):
+        if self.delay:
+            time.sleep(self.delay)
+        super().emit(record)
+
+
+def make_sink(path, delay):
+    handler = SlowFileHandler(path, delay)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    return handler
+
+
+def run_load(log, threads, messages):
+    """Devuelve las latencias por llamada (en µs) de todos los hilos"""
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def worker(n):
+        local = []
+        barrier.wait()
+        for i in range(messages):
+            t0 = time.perf_counter()
+            log.info("hilo %d mensaje %d: %s", n, i, {'evento': i, 'calendario': 'primary'})
+            local.append((time.perf_counter() - t0) * 1e6)
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return latencies, time.perf_counter() - start
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def report(name, latencies, elapsed, drained):
+    total = len(latencies)
+    print(f"{name:<10} {total / elapsed:>12,.0f} msg/s  "
+          f"p50 {percentile(latencies, 50):>8.1f} µs  p99 {percentile(latencies, 99):>9.1f} µs  "
+          f"máx {max(latencies) / 1000:>8.1f} ms  vaciado {drained * 1000:>8.1f} ms")
+
+
+def bench_sync(path, args):
+    log = logging.getLogger('bench.sync')
+    log.propagate = False
+    handler = make_sink(path, args.slow_ms / 1000)
+    log.addHandler(handler)
+    latencies, elapsed = run_load(log, args.threads, args.messages)
+    handler.close()
+    log.removeHandler(handler)
+    return latencies, elapsed, 0.0
+
+
+def bench_queue(path, args):
+    log = logging.getLogger('bench.queue')
+    log.propagate = False
+    log_queue = queue.SimpleQueue()
+    sink = make_sink(path, args.slow_ms / 1000)
+    listener = QueueListener(log_queue, sink, respect_handler_level=True)
+    listener.start()
+    handler = AsyncQueueHandler(log_queue)
+    log.addHandler(handler)
+    latencies, elapsed = run_load(log, args.threads, args.messages)
+    # Tiempo que tarda el listener en escribir lo pendiente
+    t0 = time.perf_counter()
+    listener.stop()
+    drained = time.perf_counter() - t0
+    sink.close()
+    log.removeHandler(handler)
+    return latencies, elapsed, drained
+
+
+def count_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return sum(1 for _ in f)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--messages', type=int, default=5000)
+    parser.add_argument('--slow-ms', type=float, default=0.0,
+                        help='retardo por registro del sink, en milisegundos')
+    args = parser.parse_args()
+
+    expected = args.threads * args.messages
+    print(f"{args.threads} hilos × {args.messages} mensajes, sink con {args.slow_ms} ms por registro\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, bench in (('síncrono', bench_sync), ('cola', bench_queue)):
+            path = os.path.join(tmp, f'{name}.log')
+            latencies, elapsed, drained = bench(path, args)
+            report(name, latencies, elapsed, drained)
+            written = count_lines(path)
+            if written != expected:
+                print(f"  ¡{written} líneas escritas de {expected}!")
+
+
+if __name__ == '__main__':
+    main()
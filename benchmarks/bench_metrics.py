@@ -0,0 +1,77 @@
+"""
+Mide el coste de la instrumentación de utils.metrics: una llamada vacía con y
+sin @metrics.timed, y _convert_to_event sobre los eventos de logs/raw_events.json
+(ya instrumentado) frente a la función original sin envolver.
+
+Uso:
+    OPENROUTER_API_KEY=x python benchmarks/bench_metrics.py [--events logs/raw_events.json] [--calls 200000]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from utils.metrics import MetricsRegistry
+from core.google_calendar import GoogleCalendarManager
+
+
+def per_call(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', default=os.path.join(ROOT, 'logs', 'raw_events.json'))
+    parser.add_argument('--calls', type=int, default=200000)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+
+    def noop():
+        pass
+
+    timed_noop = registry.timed('bench.noop')(noop)
+    base = per_call(noop, args.calls)
+    timed = per_call(timed_noop, args.calls)
+    print(f"llamada vacía       {base:6.3f} µs   con timed {timed:6.3f} µs   (+{timed - base:.3f} µs por llamada)")
+
+    # Varios hilos registrando en el mismo histograma
+    def worker():
+        for _ in range(args.calls // args.threads):
+            timed_noop()
+    pool = [threading.Thread(target=worker) for _ in range(args.threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    print(f"{args.threads} hilos           {elapsed / args.calls * 1e6:6.3f} µs por llamada registrada")
+
+    with open(args.events, encoding='utf-8') as f:
+        events = json.load(f)
+    manager = GoogleCalendarManager.__new__(GoogleCalendarManager)
+    original = GoogleCalendarManager._convert_to_event.__wrapped__
+    rounds = max(1, 20000 // len(events))
+    for name, convert in (('sin métricas', lambda e: original(manager, e)),
+                          ('con métricas', manager._convert_to_event)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for event in events:
+                convert(event)
+        elapsed = time.perf_counter() - start
+        print(f"_convert_to_event {name}: {elapsed / (rounds * len(events)) * 1e6:6.2f} µs por evento")
+    print(json.dumps(registry.snapshot()['bench.noop'], indent=2))
+
+
+if __name__ == '__main__':
+    main()
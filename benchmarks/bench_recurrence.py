@@ -0,0 +1,91 @@
+"""
+Reconstruye series maestras a partir de las instancias de logs/raw_events.json
+(pedidas con singleEvents=True), compara el tamaño de ambos payloads y mide la
+expansión local con core.recurrence, en frío y con caché. También comprueba
+que las instancias expandidas coinciden con las originales.
+
+Uso:
+    OPENROUTER_API_KEY=x python benchmarks/bench_recurrence.py [--events logs/raw_events.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from core.recurrence import RecurrenceExpander, _parse_google_time
+
+
+def rebuild_masters(items):
+    """Una serie DAILY por recurringEventId, con EXDATE para los días sin instancia"""
+    series = defaultdict(list)
+    singles = []
+    for item in items:
+        if item.get('recurringEventId'):
+            series[item['recurringEventId']].append(item)
+        else:
+            singles.append(item)
+
+    masters = []
+    for series_id, instances in series.items():
+        instances.sort(key=lambda i: str(_parse_google_time(i['originalStartTime'])))
+        first = instances[0]
+        starts = [_parse_google_time(i['originalStartTime']) for i in instances]
+        days = {s if 'date' in first['start'] else s.date() for s in starts}
+        first_day = min(days)
+        span = (max(days) - first_day).days + 1
+        master = {k: v for k, v in first.items() if k not in ('recurringEventId', 'originalStartTime')}
+        master['id'] = series_id
+        master['recurrence'] = [f"RRULE:FREQ=DAILY;COUNT={span}"]
+        missing = [first_day + timedelta(days=n) for n in range(span) if first_day + timedelta(days=n) not in days]
+        if missing and 'date' in first['start']:
+            master['recurrence'].append("EXDATE;VALUE=DATE:" + ",".join(d.strftime('%Y%m%d') for d in missing))
+        elif missing:
+            # EXDATE en hora local de la serie, como lo escribe Google
+            local_time = starts[0].strftime('T%H%M%S')
+            zone = first['start'].get('timeZone')
+            prefix = f"EXDATE;TZID={zone}:" if zone else "EXDATE:"
+            master['recurrence'].append(prefix + ",".join(d.strftime('%Y%m%d') + local_time for d in missing))
+        masters.append(master)
+    return masters + singles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', default=os.path.join(ROOT, 'logs', 'raw_events.json'))
+    args = parser.parse_args()
+
+    with open(args.events, encoding='utf-8') as f:
+        items = json.load(f)
+    masters = rebuild_masters(items)
+
+    starts = [_parse_google_time(i['start']) for i in items]
+    as_datetime = lambda d: d if isinstance(d, datetime) else datetime(d.year, d.month, d.day, tzinfo=timezone.utc)
+    range_start = min(as_datetime(s) for s in starts)
+    range_end = max(as_datetime(s) for s in starts) + timedelta(days=2)
+
+    expander = RecurrenceExpander()
+    start = time.perf_counter()
+    expanded = expander.expand(masters, range_start, range_end)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    expander.expand(masters, range_start, range_end)
+    cached = time.perf_counter() - start
+
+    original_ids = {i['id'] for i in items}
+    expanded_ids = {i['id'] for i in expanded}
+    print(f"singleEvents=True   {len(items):5d} items  {len(json.dumps(items)) / 1024:8.1f} KiB")
+    print(f"series maestras     {len(masters):5d} items  {len(json.dumps(masters)) / 1024:8.1f} KiB")
+    print(f"expansión en frío   {cold * 1000:8.2f} ms -> {len(expanded)} instancias")
+    print(f"expansión en caché  {cached * 1000:8.2f} ms")
+    print(f"ids coincidentes    {len(original_ids & expanded_ids)}/{len(original_ids)}"
+          f" (sobrantes: {len(expanded_ids - original_ids)})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Compara el coste en el hilo de la interfaz de actualizar la gráfica de
+ResourceMonitor: append + remove(0) por punto (antes) frente al búfer circular
+con QLineSeries.replace (ahora), con las series unidas a un QChart. También
+mide cuánto tarda una muestra completa de ResourceSampler, que ahora se toma
+fuera del hilo de la interfaz.
+
+Uso:
+    OPENROUTER_API_KEY=x QT_QPA_PLATFORM=offscreen python benchmarks/bench_resource_monitor.py [--updates 2000] [--history 300]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from PyQt6.QtCharts import QChart, QChartView, QLineSeries
+from PyQt6.QtCore import QPointF
+from PyQt6.QtWidgets import QApplication
+
+from utils.ring_buffer import RingBuffer
+from ui.workers.resource_sampler import ResourceSampler
+
+
+def make_chart(series_count):
+    chart = QChart()
+    chart.setAnimationOptions(QChart.AnimationOption.NoAnimation)
+    series = [QLineSeries() for _ in range(series_count)]
+    for s in series:
+        chart.addSeries(s)
+    chart.createDefaultAxes()
+    view = QChartView(chart)
+    view.resize(400, 300)
+    view.show()
+    return view, series
+
+
+def old_update(series, values, history, updates):
+    for step in range(updates):
+        for s, value in zip(series, values[step]):
+            s.append(QPointF(step, value))
+        while series[0].count() > history:
+            for s in series:
+                s.remove(0)
+
+
+def new_update(series, values, history, updates):
+    times = RingBuffer(history)
+    buffers = [RingBuffer(history) for _ in series]
+    for step in range(updates):
+        times.append(step)
+        for buffer, value in zip(buffers, values[step]):
+            buffer.append(value)
+        x = times.values()
+        for s, buffer in zip(series, buffers):
+            s.replace([QPointF(a, b) for a, b in zip(x, buffer.values())])
+
+
+def measure(app, func, values, history, updates):
+    view, series = make_chart(len(values[0]))
+    app.processEvents()
+    start = time.perf_counter()
+    func(series, values, history, updates)
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    counts = [s.count() for s in series]
+    view.close()
+    return elapsed, counts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--updates', type=int, default=2000)
+    parser.add_argument('--history', type=int, default=300)
+    parser.add_argument('--series', type=int, default=3)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    rng = random.Random(1)
+    values = [[rng.uniform(0, 100) for _ in range(args.series)] for _ in range(args.updates)]
+
+    old_time, old_counts = measure(app, old_update, values, args.history, args.updates)
+    new_time, new_counts = measure(app, new_update, values, args.history, args.updates)
+    print(f"{args.updates} actualizaciones de {args.series} series, historial de {args.history} puntos\n")
+    print(f"append + remove(0)   {old_time * 1000:8.1f} ms  ({old_time / args.updates * 1e6:7.1f} µs/actualización)  {old_counts}")
+    print(f"búfer + replace      {new_time * 1000:8.1f} ms  ({new_time / args.updates * 1e6:7.1f} µs/actualización)  {new_counts}")
+
+    sampler = ResourceSampler()
+    sampler._thread_times = sampler._read_thread_times()
+    samples = 20
+    start = time.perf_counter()
+    for _ in range(samples):
+        sampler._sample(1.0)
+    sample_time = (time.perf_counter() - start) / samples
+    print(f"\nmuestra de recursos (psutil, hilos, descriptores, GC): {sample_time * 1000:.2f} ms, fuera del hilo de la interfaz")
+
+
+if __name__ == '__main__':
+    main()
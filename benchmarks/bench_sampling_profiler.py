@@ -0,0 +1,75 @@
+"""
+Mide el coste del perfilador por muestreo sobre una carga de CPU con varios
+hilos (conversión de los eventos de logs/raw_events.json): tiempo con y sin
+el perfilador activo, y muestras tomadas por segundo.
+
+Uso:
+    OPENROUTER_API_KEY=x python benchmarks/bench_sampling_profiler.py [--threads 3] [--rounds 20] [--interval-ms 5]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import utils.sampling_profiler as sampling_profiler
+from utils.sampling_profiler import SamplingProfiler
+from core.google_calendar import GoogleCalendarManager
+
+
+def workload(events, threads, rounds):
+    manager = GoogleCalendarManager.__new__(GoogleCalendarManager)
+    convert = GoogleCalendarManager._convert_to_event.__wrapped__
+
+    def worker():
+        for _ in range(rounds):
+            for event in events:
+                convert(manager, event)
+
+    pool = [threading.Thread(target=worker, name=f'worker-{i}') for i in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', default=os.path.join(ROOT, 'logs', 'raw_events.json'))
+    parser.add_argument('--threads', type=int, default=3)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--interval-ms', type=float, default=5)
+    args = parser.parse_args()
+
+    with open(args.events, encoding='utf-8') as f:
+        events = json.load(f)
+
+    workload(events, args.threads, 1)  # calentamiento
+    base = min(workload(events, args.threads, args.rounds) for _ in range(3))
+
+    sampling_profiler.PROFILE_DIRECTORY = tempfile.mkdtemp()
+    profiler = SamplingProfiler(interval=args.interval_ms / 1000)
+    times = []
+    for _ in range(3):
+        profiler.start()
+        times.append(workload(events, args.threads, args.rounds))
+        path = profiler.stop()
+    profiled = min(times)
+
+    with open(path, encoding='utf-8') as f:
+        stacks = f.read().splitlines()
+    print(f"{args.threads} hilos × {args.rounds} rondas de {len(events)} eventos, muestra cada {args.interval_ms} ms\n")
+    print(f"sin perfilador  {base * 1000:8.1f} ms")
+    print(f"con perfilador  {profiled * 1000:8.1f} ms  (+{(profiled / base - 1) * 100:.1f}%)")
+    print(f"muestras        {profiler.samples} ({profiler.samples / times[-1]:.0f}/s), {len(stacks)} pilas distintas")
+
+
+if __name__ == '__main__':
+    main()
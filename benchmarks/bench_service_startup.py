@@ -0,0 +1,61 @@
+"""
+Mide el coste de construir los servicios de Google al arrancar.
+
+Compara el camino anterior (build() en cada llamada) con los servicios
+compartidos de core.google_services. No hace peticiones de red: las
+credenciales son ficticias y solo se construyen los clientes.
+
+Uso:
+    python benchmarks/bench_service_startup.py [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+from core import google_services
+
+
+def _time_it(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(name, timings):
+    total = sum(timings)
+    print(f"{name:<32} total={total * 1000:8.2f} ms  "
+          f"primera={timings[0] * 1000:7.2f} ms  "
+          f"media={total / len(timings) * 1000:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    credentials = Credentials(token='benchmark-token')
+
+    def legacy():
+        # Lo que hacían _initialize_service y get_user_info
+        build('calendar', 'v3', credentials=credentials)
+        build('oauth2', 'v2', credentials=credentials)
+
+    def shared():
+        google_services.get_service('calendar', 'v3', credentials)
+        google_services.get_service('oauth2', 'v2', credentials)
+
+    _report("build() en cada llamada", _time_it(legacy, args.repeat))
+    google_services.clear_services()
+    _report("servicios compartidos", _time_it(shared, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Mide tiempo hasta el primer token frente a la respuesta completa usando
+AIAssistant contra el servidor stub con streaming SSE.
+
+Uso:
+    OPENROUTER_API_KEY=x python benchmarks/bench_streaming.py [--token-delay 0.02]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.ai_assistant import AIAssistant
+from stub_server import StubServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--token-delay', type=float, default=0.02)
+    parser.add_argument('--delay', type=float, default=0.2)
+    args = parser.parse_args()
+
+    message = "Organiza mi semana con bloques de concentración por la mañana y reuniones por la tarde"
+
+    with StubServer(delay=args.delay, token_delay=args.token_delay) as server:
+        assistant = AIAssistant()
+        assistant.api_url = f"{server.url}/api/v1/chat/completions"
+
+        start = time.perf_counter()
+        assistant.process_message(message)
+        blocking = time.perf_counter() - start
+
+        first_token = []
+        start = time.perf_counter()
+        response = assistant.stream_message(
+            message,
+            on_token=lambda token: first_token or first_token.append(time.perf_counter() - start)
+        )
+        streamed = time.perf_counter() - start
+
+    print(f"respuesta completa (sin streaming): {blocking * 1000:8.1f} ms")
+    print(f"primer token (streaming):           {first_token[0] * 1000:8.1f} ms")
+    print(f"respuesta completa (streaming):     {streamed * 1000:8.1f} ms")
+    print(f"texto recibido: {response!r}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+"""
+Servidor local que imita la API de Google Calendar v3 sobre un calendario
+sintético (benchmarks/synthetic_calendar.py) o un payload como
+logs/raw_events.json.
+
+- GET    /calendar/v3/calendars/<id>/events: timeMin, timeMax, singleEvents,
+  orderBy, updatedMin, maxResults (hasta 2500) y pageToken
+- GET    /calendar/v3/calendars/<id>/events/<evento>/instances
+- POST, PUT y DELETE de eventos: los cambios se guardan en memoria y los
+  eventos creados aparecen en los listados (los sintéticos no cambian)
+
+La aplicación lo usa con GOOGLE_CALENDAR_ENDPOINT=<url>/calendar/v3/ (o con
+core.google_services.set_api_endpoint).
+
+Uso:
+    python benchmarks/fake_calendar_server.py [--port 8766] [--count 12000 | --scale 10 | --events logs/raw_events.json]
+        [--delay 0.0] [opciones del generador: --days, --recurrence, --overlap, ...]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import synthetic_calendar
+from stub_server import StubHandler, StubServer
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+API_PREFIX = '/calendar/v3/calendars/'
+MAX_RESULTS = 2500
+DEFAULT_MAX_RESULTS = 250
+# Consultas cuyas claves ordenadas se conservan para servir las páginas siguientes
+CACHED_QUERIES = 8
+
+
+def _parse_time(value: dict) -> datetime:
+    if 'dateTime' in value:
+        return datetime.fromisoformat(value['dateTime'].replace('Z', '+00:00'))
+    return datetime.combine(date.fromisoformat(value['date']), datetime.min.time(), timezone.utc)
+
+
+def _parse_updated(item: dict) -> datetime:
+    return datetime.fromisoformat(item['updated'].replace('Z', '+00:00'))
+
+
+class PayloadCalendar:
+    """Mismo interfaz que SyntheticCalendar sobre una lista de eventos ya expandidos"""
+
+    def __init__(self, items):
+        self._items = items
+        self._spans = [(_parse_time(item['start']), _parse_time(item['end'])) for item in items]
+        self.start = min((start for start, _ in self._spans), default=datetime.now(timezone.utc))
+        self.end = max((end for _, end in self._spans), default=self.start)
+        self.count = len(items)
+
+    def window_keys(self, low, high, single_events=True):
+        # Sin series maestras: con singleEvents=false se devuelven las mismas instancias
+        keys = [(start.timestamp(), 0, i) for i, (start, end) in enumerate(self._spans) if start < high and end > low]
+        keys.sort(key=lambda key: (key[0], key[1]))
+        return keys
+
+    def item(self, key):
+        return self._items[key[2]]
+
+    def instances(self, series_id, low, high):
+        return [self._items[i] for _, _, i in self.window_keys(low, high) if self._items[i].get('recurringEventId') == series_id]
+
+    def describe(self):
+        return {'count': self.count, 'source': 'payload'}
+
+
+class CalendarHandler(StubHandler):
+    """Rutas de events() sobre el FakeCalendarServer (server.fake); el resto responde 404"""
+
+    def _json(self, status: int, payload):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json; charset=UTF-8')
+
+    def _error(self, status: int, message: str):
+        self._json(status, {'error': {'code': status, 'message': message}})
+
+    def _route(self):
+        """(id de evento o None, resto de la ruta, parámetros) o None si la ruta no es de eventos"""
+        url = urlsplit(self.path)
+        if not url.path.startswith(API_PREFIX):
+            return None
+        parts = [unquote(part) for part in url.path[len(API_PREFIX):].split('/')]
+        if len(parts) < 2 or parts[1] != 'events':
+            return None
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        return (parts[2] if len(parts) > 2 else None), parts[3:], params
+
+    def do_GET(self):
+        time.sleep(self.server.delay)
+        route = self._route()
+        if route is None:
+            self._error(404, 'Not Found')
+            return
+        event_id, rest, params = route
+        if event_id is None:
+            self._list(params)
+        elif rest == ['instances']:
+            self._instances(event_id, params)
+        else:
+            item = self.server.fake.created.get(event_id)
+            if item is None:
+                self._error(404, 'Not Found')
+            else:
+                self._json(200, item)
+
+    def _window(self, params):
+        calendar = self.server.fake.calendar
+        low = datetime.fromisoformat(params['timeMin'].replace('Z', '+00:00')) if 'timeMin' in params else calendar.start
+        high = datetime.fromisoformat(params['timeMax'].replace('Z', '+00:00')) if 'timeMax' in params else calendar.end + timedelta(days=1)
+        return low, high
+
+    def _list(self, params):
+        single_events = params.get('singleEvents') == 'true'
+        if params.get('orderBy') == 'startTime' and not single_events:
+            # Igual que Google: orderBy=startTime solo con singleEvents
+            self._error(400, 'The requested ordering is not available for the particular query.')
+            return
+        low, high = self._window(params)
+        keys = self.server.fake.window_keys(low, high, single_events)
+        if 'updatedMin' in params:
+            # Los sintéticos no cambian: solo cuentan los creados o modificados por la aplicación
+            updated_min = datetime.fromisoformat(params['updatedMin'].replace('Z', '+00:00'))
+            keys = [key for key in keys if _parse_updated(self.server.fake.item(key)) >= updated_min]
+        offset = int(params.get('pageToken') or 0)
+        size = min(int(params.get('maxResults') or DEFAULT_MAX_RESULTS), MAX_RESULTS)
+        page = keys[offset:offset + size]
+        result = {
+            'kind': 'calendar#events',
+            'summary': 'Calendario sintético',
+            'timeZone': 'UTC',
+            'items': [self.server.fake.item(key) for key in page],
+        }
+        if offset + size < len(keys):
+            result['nextPageToken'] = str(offset + size)
+        self._json(200, result)
+
+    def _instances(self, event_id, params):
+        low, high = self._window(params)
+        items = self.server.fake.calendar.instances(event_id, low, high)
+        if items is None:
+            self._error(404, 'Not Found')
+            return
+        self._json(200, {'kind': 'calendar#events', 'items': items[:MAX_RESULTS]})
+
+    def do_POST(self):
+        body = json.loads(self._read_body() or b'{}')
+        time.sleep(self.server.delay)
+        route = self._route()
+        if route is None or route[0] is not None:
+            self._error(404, 'Not Found')
+            return
+        body.update(kind='calendar#event', id=uuid.uuid4().hex, status='confirmed')
+        self._json(200, self.server.fake.store(body))
+
+    def do_PUT(self):
+        body = json.loads(self._read_body() or b'{}')
+        time.sleep(self.server.delay)
+        route = self._route()
+        if route is None or route[0] is None:
+            self._error(404, 'Not Found')
+            return
+        body.update(kind='calendar#event', id=route[0])
+        self._json(200, self.server.fake.store(body))
+
+    def do_DELETE(self):
+        time.sleep(self.server.delay)
+        route = self._route()
+        if route is None or route[0] is None:
+            self._error(404, 'Not Found')
+            return
+        self.server.fake.remove(route[0])
+        self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+class FakeCalendarServer(StubServer):
+    """Servidor de la API de Calendar en un hilo; `endpoint` es la URL para set_api_endpoint"""
+
+    def __init__(self, calendar, port: int = 0, delay: float = 0.0):
+        super().__init__(port, delay, handler=CalendarHandler)
+        self.httpd.fake = self
+        self.calendar = calendar
+        # Eventos creados o modificados por la aplicación, por id
+        self.created = {}
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.url}/calendar/v3/"
+
+    def window_keys(self, low, high, single_events):
+        # Las páginas siguientes de la misma consulta no recalculan la ventana
+        query = (low, high, single_events)
+        with self._lock:
+            keys = self._pages.get(query)
+            if keys is not None:
+                self._pages.move_to_end(query)
+                return keys
+            created = list(self.created.values())
+        keys = self.calendar.window_keys(low, high, single_events)
+        extra = [(_parse_time(item['start']).timestamp(), 3, item) for item in created
+                 if _parse_time(item['start']) < high and _parse_time(item['end']) > low]
+        if extra:
+            keys = sorted(keys + extra, key=lambda key: (key[0], key[1]))
+        with self._lock:
+            self._pages[query] = keys
+            while len(self._pages) > CACHED_QUERIES:
+                self._pages.popitem(last=False)
+        return keys
+
+    def item(self, key):
+        return key[2] if key[1] == 3 else self.calendar.item(key)
+
+    def store(self, item):
+        item['updated'] = datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+        with self._lock:
+            self.created[item['id']] = item
+            self._pages.clear()
+        return item
+
+    def remove(self, event_id):
+        with self._lock:
+            self._pages.clear()
+            self.created.pop(event_id, None)
+
+
+def load_calendar(args):
+    """Calendario según --events, --count o --scale (veces el tamaño de logs/raw_events.json)"""
+    if args.count or args.scale:
+        count = args.count or round(args.scale * base_count())
+        return synthetic_calendar.from_arguments(args, count)
+    with open(args.events, encoding='utf-8') as f:
+        return PayloadCalendar(json.load(f))
+
+
+def base_count() -> int:
+    """Eventos de logs/raw_events.json: el tamaño "de hoy" para --scale"""
+    with open(os.path.join(ROOT, 'logs', 'raw_events.json'), encoding='utf-8') as f:
+        return len(json.load(f)) or 1
+
+
+def add_dataset_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--count', type=int, help='eventos sintéticos')
+    group.add_argument('--scale', type=float, help='eventos sintéticos: veces el tamaño de logs/raw_events.json')
+    synthetic_calendar.add_arguments(parser)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--delay', type=float, default=0.0)
+    parser.add_argument('--events', default=os.path.join(ROOT, 'logs', 'raw_events.json'))
+    add_dataset_arguments(parser)
+    args = parser.parse_args()
+
+    calendar = load_calendar(args)
+    server = FakeCalendarServer(calendar, args.port, args.delay)
+    print(f"API de Calendar falsa ({calendar.describe()}) en {server.endpoint}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
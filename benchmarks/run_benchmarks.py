@@ -0,0 +1,374 @@
+"""
+Suite de benchmarks reproducible sobre logs/raw_events.json (o cualquier
+payload con la forma de events().list de Google Calendar) o sobre un
+calendario sintético de --count eventos o --scale veces el tamaño actual.
+
+Mide el parseo del payload, la conversión a Event, la descarga del mes desde
+la API falsa (benchmarks/fake_calendar_server.py) con y sin expansión local
+de recurrencias, el pintado de las vistas de mes, semana y día del
+CalendarWidget (Qt offscreen), la búsqueda y las operaciones de SQLite.
+Guarda los resultados en JSON y, si hay una línea base, marca como regresión
+todo caso cuya mediana empeore más del umbral.
+
+Uso:
+    OPENROUTER_API_KEY=x python benchmarks/run_benchmarks.py [--events logs/raw_events.json]
+        [--count 12000 | --scale 10] [--repeat 5] [--filter render]
+        [--baseline benchmarks/baseline.json] [--save-baseline] [--threshold 0.15]
+
+Sale con código 1 si hay regresiones respecto a la línea base.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+# Sin pantalla: Qt pinta en memoria
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from fake_calendar_server import FakeCalendarServer, PayloadCalendar, add_dataset_arguments, load_calendar
+
+RESULTS_DIRECTORY = os.path.join(ROOT, 'benchmarks', 'results')
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+SEARCH_QUERIES = ('reunión', 'daily', 'a', 'zzz-sin-resultados')
+# Tiempo mínimo de medición por caso y tope de repeticiones
+MIN_CASE_SECONDS = 1.0
+MAX_RUNS = 200
+
+
+class Suite:
+    """Casos registrados con su preparación; cada caso es una función sin argumentos"""
+
+    def __init__(self):
+        self.cases = []
+
+    def case(self, name):
+        def decorator(func):
+            self.cases.append((name, func))
+            return func
+        return decorator
+
+
+suite = Suite()
+
+
+class Context:
+    """Datos compartidos por los casos (payload, eventos, widget, base de datos, API falsa)"""
+
+    def __init__(self, calendar, description, raw=None):
+        from PyQt6.QtWidgets import QApplication
+        from core.google_calendar import GoogleCalendarManager
+
+        self.app = QApplication.instance() or QApplication(sys.argv)
+        self.calendar = calendar
+        self.description = description
+        if raw is None:
+            # Calendario sintético: el payload completo de singleEvents=True
+            raw = json.dumps(list(calendar.items()), ensure_ascii=False).encode('utf-8')
+        self.raw = raw
+        self.payload = json.loads(raw)
+        if not self.payload:
+            sys.exit(f"Sin eventos en {description}")
+        # _convert_to_event no usa el estado del manager
+        self.manager = GoogleCalendarManager.__new__(GoogleCalendarManager)
+        self.events = [self.manager._convert_to_event(item) for item in self.payload]
+        self._widget = None
+        self._db = None
+        self._server = None
+
+    @property
+    def busiest_day(self):
+        return Counter(e.start_datetime.date() for e in self.events).most_common(1)[0][0]
+
+    @property
+    def widget(self):
+        if self._widget is None:
+            from PyQt6.QtCore import QDate
+            from ui.components.calendar_widget import CalendarWidget
+            widget = CalendarWidget()
+            widget.refresh_timer.stop()
+            widget.resize(1200, 800)
+            widget.show()
+            day = self.busiest_day
+            widget.current_date = QDate(day.year, day.month, day.day)
+            widget.set_events(self.events)
+            self._widget = widget
+        return self._widget
+
+    @property
+    def db(self):
+        if self._db is None:
+            import core.database as database
+            self._tmp = tempfile.TemporaryDirectory()
+            database.DATABASE_PATH = os.path.join(self._tmp.name, 'calendar.db')
+            self._db = database.DatabaseManager()
+        return self._db
+
+    @property
+    def month_range(self):
+        day = self.busiest_day
+        start = datetime(day.year, day.month, 1, tzinfo=timezone.utc)
+        end = datetime(day.year + day.month // 12, day.month % 12 + 1, 1, tzinfo=timezone.utc)
+        return start, end
+
+    def calendar_manager(self, expand_recurrence: bool):
+        """GoogleCalendarManager real contra la API falsa (sin credenciales)"""
+        from google.auth.credentials import AnonymousCredentials
+        from core.google_calendar import GoogleCalendarManager
+
+        class AnonymousAuth:
+            def get_credentials(self):
+                return AnonymousCredentials()
+
+        if self._server is None:
+            from core.google_services import set_api_endpoint
+            self._server = FakeCalendarServer(self.calendar).start()
+            set_api_endpoint('calendar', self._server.endpoint)
+        manager = GoogleCalendarManager(AnonymousAuth())
+        manager.settings.expand_recurrence_locally = expand_recurrence
+        return manager
+
+    def close(self):
+        if self._server is not None:
+            self._server.stop()
+
+    def render(self, view):
+        widget = self.widget
+        widget.current_view = view
+        widget.refresh_view()
+        # Incluir el layout y el pintado que provoca el refresco
+        self.app.processEvents()
+
+
+@suite.case('parse.payload_json')
+def parse_payload(ctx):
+    return lambda: json.loads(ctx.raw)
+
+
+@suite.case('convert.events')
+def convert_events(ctx):
+    convert = ctx.manager._convert_to_event
+    return lambda: [convert(item) for item in ctx.payload]
+
+
+@suite.case('fetch.month_api')
+def fetch_month(ctx):
+    manager = ctx.calendar_manager(expand_recurrence=False)
+    start, end = ctx.month_range
+    return lambda: manager.get_events(start, end, log_raw=False)
+
+
+@suite.case('fetch.month_api_expanded')
+def fetch_month_expanded(ctx):
+    manager = ctx.calendar_manager(expand_recurrence=True)
+    start, end = ctx.month_range
+
+    def run():
+        # Sin la caché de instancias: se mide la expansión completa
+        manager.recurrence_expander.clear()
+        return manager.get_events(start, end, log_raw=False)
+    return run
+
+
+@suite.case('render.month')
+def render_month(ctx):
+    return lambda: ctx.render('month')
+
+
+@suite.case('render.week')
+def render_week(ctx):
+    return lambda: ctx.render('week')
+
+
+@suite.case('render.day')
+def render_day(ctx):
+    return lambda: ctx.render('day')
+
+
+@suite.case('search.queries')
+def search_queries(ctx):
+    from ui.workers.search_worker import SearchWorker
+
+    class StaticCalendar:
+        def get_events(self, **kwargs):
+            return ctx.events
+
+    calendar = StaticCalendar()
+    results = []
+
+    def run():
+        for query in SEARCH_QUERIES:
+            worker = SearchWorker(calendar, query)
+            worker.finished.connect(results.append)
+            worker.search()
+        results.clear()
+    return run
+
+
+@suite.case('db.insert_chat_rows')
+def db_insert(ctx):
+    db = ctx.db
+
+    def run():
+        for i in range(200):
+            db.execute_update(
+                "INSERT INTO ai_chat_history (user_message, ai_response) VALUES (?, ?)",
+                (f"mensaje {i}", f"respuesta {i}")
+            )
+    return run
+
+
+@suite.case('db.query_chat_rows')
+def db_query(ctx):
+    db = ctx.db
+    db.execute_many(
+        "INSERT INTO ai_chat_history (user_message, ai_response) VALUES (?, ?)",
+        [(f"mensaje {i}", f"respuesta {i}") for i in range(2000)]
+    )
+    return lambda: [db.execute_query("SELECT * FROM ai_chat_history ORDER BY id DESC LIMIT 50") for _ in range(50)]
+
+
+@suite.case('db.analysis_aggregates')
+def db_aggregates(ctx):
+    from core.analysis_store import AnalysisStore
+    store = AnalysisStore(ctx.db)
+    month = ctx.busiest_day.strftime('%Y-%m')
+
+    def run():
+        # Desde cero: todos los días se recalculan y escriben
+        ctx.db.execute_update("DELETE FROM analysis_day_aggregates WHERE month = ?", (month,))
+        store.update_month(month, ctx.events)
+        store.month_summary(month)
+    return run
+
+
+def measure(func, repeat):
+    # El calentamiento fija cuántas repeticiones caben en MIN_CASE_SECONDS:
+    # los casos cortos se repiten más para que la mediana no dependa del ruido
+    start = time.perf_counter()
+    func()
+    warmup = time.perf_counter() - start
+    runs = min(MAX_RUNS, max(repeat, int(MIN_CASE_SECONDS / max(warmup, 1e-6))))
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {
+        'min_ms': min(times),
+        'median_ms': statistics.median(times),
+        'mean_ms': statistics.fmean(times),
+        'runs': runs,
+    }
+
+
+def environment():
+    from PyQt6.QtCore import QT_VERSION_STR
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'qt': QT_VERSION_STR,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Devuelve (líneas del informe, número de regresiones)"""
+    lines = []
+    regressions = 0
+    for name, result in results.items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            lines.append(f"  {name:<26} sin línea base")
+            continue
+        change = result['median_ms'] / base['median_ms'] - 1
+        if change > threshold:
+            status = 'REGRESIÓN'
+            regressions += 1
+        elif change < -threshold:
+            status = 'mejora'
+        else:
+            status = 'igual'
+        lines.append(f"  {name:<26} {base['median_ms']:9.2f} -> {result['median_ms']:9.2f} ms  {change:+7.1%}  {status}")
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', default=os.path.join(ROOT, 'logs', 'raw_events.json'))
+    add_dataset_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=5, help='repeticiones mínimas por caso')
+    parser.add_argument('--filter', default='', help='solo los casos cuyo nombre contiene este texto')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='guardar estos resultados como línea base')
+    parser.add_argument('--threshold', type=float, default=0.15, help='empeoramiento de la mediana que cuenta como regresión')
+    parser.add_argument('--output', help='archivo de resultados (por defecto benchmarks/results/results_<fecha>.json)')
+    args = parser.parse_args()
+
+    # El logging de la app distorsiona los tiempos y llena la salida
+    logging.disable(logging.INFO)
+
+    calendar = load_calendar(args)
+    if isinstance(calendar, PayloadCalendar):
+        dataset = {'path': os.path.relpath(args.events, ROOT)}
+        with open(args.events, 'rb') as f:
+            ctx = Context(calendar, dataset['path'], f.read())
+    else:
+        dataset = dict(calendar.describe(), source='synthetic')
+        ctx = Context(calendar, 'calendario sintético')
+    print(f"{len(ctx.payload)} eventos de {ctx.description}, al menos {args.repeat} repeticiones por caso\n")
+
+    results = {}
+    for name, setup in suite.cases:
+        if args.filter not in name:
+            continue
+        results[name] = measure(setup(ctx), args.repeat)
+        r = results[name]
+        print(f"  {name:<26} mediana {r['median_ms']:9.2f} ms   mín {r['min_ms']:9.2f} ms")
+    ctx.close()
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'dataset': dict(dataset, events=len(ctx.payload), sha1=hashlib.sha1(ctx.raw).hexdigest()),
+        'results': results,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIRECTORY, f"results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados en {os.path.relpath(output, ROOT)}")
+
+    regressions = 0
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Línea base guardada en {os.path.relpath(args.baseline, ROOT)}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('dataset', {}).get('sha1') != report['dataset']['sha1']:
+            print("Aviso: la línea base se midió con otro conjunto de eventos")
+        lines, regressions = compare(results, baseline, args.threshold)
+        print(f"\nComparación con {os.path.relpath(args.baseline, ROOT)} (umbral {args.threshold:.0%}):")
+        print("\n".join(lines))
+    else:
+        print("Sin línea base: usa --save-baseline para crearla")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Servidor local que imita las APIs externas que usa la aplicación.
+
+- POST /api/v1/chat/completions: respuesta estilo OpenRouter; con
+  "stream": true responde server-sent events token a token
+- GET  /predictions: texto con el formato de la API de predicciones
+
+Habla HTTP/1.1 para que los clientes puedan reutilizar conexiones.
+
+Uso:
+    python benchmarks/stub_server.py [--port 8765] [--delay 0.0] [--token-delay 0.02]
+"""
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import argparse
+import json
+import threading
+import time
+
+PREDICTIONS_TEXT = (
+    '{ "predictions": [ { "event": "Semana de entregas", "probability": 70 } ] }'
+    '\n\nAnalysis:\n\nRespuesta simulada del servidor local.\n\nDEBUG: stub'
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Los retardos (delay, token_delay) se configuran en el servidor
+    protocol_version = 'HTTP/1.1'
+    # Sin Nagle: cabeceras y cuerpo van en escrituras separadas
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def do_GET(self):
+        time.sleep(self.server.delay)
+        if self.path.startswith('/predictions'):
+            self._send(200, PREDICTIONS_TEXT.encode('utf-8'), 'text/plain; charset=utf-8')
+        else:
+            self._send(404, b'{}', 'application/json')
+
+    def do_POST(self):
+        payload = json.loads(self._read_body() or b'{}')
+        time.sleep(self.server.delay)
+        if not self.path.startswith('/api/v1/chat/completions'):
+            self._send(404, b'{}', 'application/json')
+            return
+        last = payload.get('messages', [{}])[-1].get('content', '')
+        content = f"eco: {last}"[:200]
+        if 'morse' in last.lower():
+            # Simula la detección de intención dentro de la misma respuesta
+            content = "FUNCION: codigo_morse"
+        if payload.get('stream'):
+            self._stream(payload.get('model'), content)
+            return
+        # Sin streaming el cliente espera a que se "generen" todos los tokens
+        time.sleep(len(content.split(' ')) * self.server.token_delay)
+        body = json.dumps({
+            'id': 'stub',
+            'model': payload.get('model'),
+            'choices': [{'message': {'role': 'assistant', 'content': content}}]
+        }).encode('utf-8')
+        self._send(200, body, 'application/json')
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+
+    def _stream(self, model, content: str):
+        """Envía la respuesta como SSE con transfer-encoding chunked"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        # Comentario inicial como el que envía OpenRouter mientras procesa
+        self._write_chunk(b": OPENROUTER PROCESSING\n\n")
+        for token in content.split(' '):
+            time.sleep(self.server.token_delay)
+            event = {
+                'id': 'stub',
+                'model': model,
+                'choices': [{'delta': {'content': token + ' '}}]
+            }
+            self._write_chunk(f"data: {json.dumps(event)}\n\n".encode('utf-8'))
+        self._write_chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class StubServer:
+    """Servidor stub en un hilo, pensado para benchmarks y pruebas manuales"""
+
+    def __init__(self, port: int = 0, delay: float = 0.0, token_delay: float = 0.0, handler=StubHandler):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.delay = delay
+        self.httpd.token_delay = token_delay
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0)
+    parser.add_argument('--token-delay', type=float, default=0.02)
+    args = parser.parse_args()
+    server = StubServer(args.port, args.delay, args.token_delay)
+    print(f"Stub escuchando en {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
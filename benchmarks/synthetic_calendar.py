@@ -0,0 +1,320 @@
+"""
+Generador de calendarios sintéticos con la forma de la API de Google Calendar.
+
+Cada evento se calcula a partir de su índice (sin estado), así que se puede
+pedir cualquier ventana de tiempo de un calendario de 1M de eventos sin
+tenerlo entero en memoria. Parámetros:
+
+- count: eventos totales (instancias incluidas) en el periodo
+- recurrence: fracción de eventos que son instancias de series DAILY/WEEKLY
+- overlap: probabilidad de que un evento suelto se solape con el siguiente
+- description_size: tamaño medio de la descripción en caracteres
+- timezones: zonas horarias que se reparten entre los eventos
+- all_day: fracción de eventos sueltos de día completo
+
+Uso:
+    python benchmarks/synthetic_calendar.py --count 12000 [--days 31] [--recurrence 0.2]
+        [--overlap 0.2] [--description-size 200] [--output logs/synthetic_events.json]
+
+Escribe en streaming el payload de singleEvents=True (como logs/raw_events.json).
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+DEFAULT_START = datetime(2025, 3, 1, tzinfo=timezone.utc)
+DEFAULT_TIMEZONES = ('Europe/Madrid', 'UTC', 'America/New_York', 'America/Santiago', 'Asia/Tokyo')
+TITLES = ('Reunión de equipo', 'Daily', 'Revisión de código', 'Llamada con cliente', 'Almuerzo',
+          'Gimnasio', 'Clase', 'Entrega', 'Planificación', 'Médico', 'Estudio', 'Viaje')
+LOREM = ('Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor '
+         'incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud '
+         'exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat. ')
+ORGANIZER = {'email': 'sintetico@example.com', 'self': True}
+# Periodos de las series: diarias y semanales
+SERIES_PERIODS = (1, 7)
+MASK64 = (1 << 64) - 1
+
+
+def _unit(seed: int, index: int, salt: int) -> float:
+    """Número en [0, 1) que depende solo de (seed, index, salt) (splitmix64)"""
+    z = (seed * 0x9E3779B97F4A7C15 + index * 0xBF58476D1CE4E5B9 + salt * 0x94D049BB133111EB) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return ((z ^ (z >> 31)) >> 11) / float(1 << 53)
+
+
+def _google_time(moment, zone_name: str) -> dict:
+    if isinstance(moment, datetime):
+        return {'dateTime': moment.isoformat(), 'timeZone': zone_name}
+    return {'date': moment.isoformat()}
+
+
+def _occurrence_key(start) -> str:
+    # Mismo sufijo de id que usa Google (y core.recurrence) para las instancias
+    if isinstance(start, datetime):
+        return start.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    return start.strftime('%Y%m%d')
+
+
+class Series:
+    """Serie recurrente: COUNT instancias cada `period` días a la misma hora local"""
+
+    def __init__(self, index, first_start, duration, period, count, title, description):
+        self.id = f"synth{index:07d}r"
+        self.first_start = first_start
+        self.duration = duration
+        self.period = period
+        self.count = count
+        self.title = title
+        self.description = description
+        # Última instancia; sumar días a un datetime con zona conserva la hora local (como RRULE)
+        self.last_end = first_start + timedelta(days=period * (count - 1)) + duration
+
+    def starts(self, low: datetime, high: datetime):
+        """Inicios de las instancias que se solapan con [low, high)"""
+        period = timedelta(days=self.period)
+        # Primera candidata aproximada; el ±1 cubre los cambios de horario
+        k = max(0, int((low - self.duration - self.first_start) / period) - 1)
+        while k < self.count:
+            start = self.first_start + period * k
+            if start >= high:
+                break
+            if start + self.duration > low:
+                yield start
+            k += 1
+
+    def master(self, created: str) -> dict:
+        zone = self.first_start.tzinfo.key
+        return {
+            'kind': 'calendar#event', 'id': self.id, 'status': 'confirmed',
+            'created': created, 'updated': created,
+            'summary': self.title, 'description': self.description,
+            'organizer': ORGANIZER, 'creator': ORGANIZER,
+            'start': _google_time(self.first_start, zone),
+            'end': _google_time(self.first_start + self.duration, zone),
+            'recurrence': [f"RRULE:FREQ={'DAILY' if self.period == 1 else 'WEEKLY'};COUNT={self.count}"],
+            'iCalUID': f"{self.id}@synthetic", 'sequence': 0, 'eventType': 'default',
+        }
+
+    def instance(self, start: datetime, created: str) -> dict:
+        item = self.master(created)
+        del item['recurrence']
+        zone = self.first_start.tzinfo.key
+        item['id'] = f"{self.id}_{_occurrence_key(start)}"
+        item['recurringEventId'] = self.id
+        item['start'] = _google_time(start, zone)
+        item['end'] = _google_time(start + self.duration, zone)
+        item['originalStartTime'] = dict(item['start'])
+        return item
+
+
+class SyntheticCalendar:
+    """Calendario determinista: el mismo seed y parámetros dan siempre los mismos eventos"""
+
+    def __init__(self, count: int, days: int = 31, start: datetime = DEFAULT_START,
+                 recurrence: float = 0.2, overlap: float = 0.2, description_size: int = 200,
+                 timezones=DEFAULT_TIMEZONES, all_day: float = 0.03, seed: int = 1):
+        self.count = count
+        self.days = days
+        self.start = start
+        self.end = start + timedelta(days=days)
+        self.overlap = overlap
+        self.description_size = description_size
+        self.timezones = [ZoneInfo(name) for name in timezones]
+        self.all_day = all_day
+        self.seed = seed
+        self.created = (start - timedelta(days=30)).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        self._lorem = LOREM * (max(1, description_size) * 20 // len(LOREM) + 2)
+
+        self.series = self._make_series(round(count * recurrence))
+        self.singles = count - sum(s.count for s in self.series)
+        # Separación media entre eventos sueltos; la duración máxima acota las búsquedas por ventana
+        self.step = days * 86400 / max(1, self.singles)
+        self.max_single = timedelta(seconds=2 * self.step + 3 * 3600, days=2)
+        self._series_by_id = {s.id: s for s in self.series}
+
+    def _make_series(self, instances: int):
+        rng = random.Random(self.seed)
+        series = []
+        while instances > 0:
+            period = rng.choice(SERIES_PERIODS)
+            zone = rng.choice(self.timezones)
+            # Empieza en la primera semana del periodo, en horario de 7 a 20 (hora local)
+            day = (self.start + timedelta(days=rng.randrange(min(7, self.days)))).astimezone(zone)
+            first = datetime(day.year, day.month, day.day, rng.randrange(7, 20), rng.choice((0, 15, 30, 45)), tzinfo=zone)
+            if first < self.start:
+                # En zonas al oeste de UTC el primer día local puede caer antes del periodo
+                first += timedelta(days=1)
+            count = min(instances, max(1, (self.days - 7) // period + 1))
+            series.append(Series(
+                len(series), first, timedelta(minutes=rng.choice((15, 30, 45, 60, 90))), period, count,
+                rng.choice(TITLES), self._description(rng.random(), rng.random()),
+            ))
+            instances -= count
+        return series
+
+    def _description(self, size_u: float, offset_u: float) -> str:
+        if not self.description_size:
+            return ''
+        # Distribución exponencial: muchas cortas y alguna muy larga (hasta 20 veces la media)
+        size = min(int(-self.description_size * math.log(1 - size_u)), 20 * self.description_size)
+        offset = int(offset_u * len(LOREM))
+        return self._lorem[offset:offset + size]
+
+    # --- Eventos sueltos: el índice determina inicio, duración, zona y textos ---
+
+    def _single_start(self, i: int) -> datetime:
+        return self.start + timedelta(seconds=(i + _unit(self.seed, i, 0)) * self.step)
+
+    def _single_bounds(self, i: int):
+        start = self._single_start(i)
+        if _unit(self.seed, i, 1) < self.overlap:
+            # Termina después de que empiece el siguiente
+            following = self._single_start(i + 1)
+            end = following + timedelta(minutes=5 + 120 * _unit(self.seed, i, 2))
+        else:
+            gap = (self._single_start(i + 1) - start) if i + 1 < self.singles else timedelta(hours=1)
+            end = start + gap * (0.3 + 0.65 * _unit(self.seed, i, 2))
+        return start, end
+
+    def single(self, i: int) -> dict:
+        start, end = self._single_bounds(i)
+        zone = self.timezones[int(_unit(self.seed, i, 3) * len(self.timezones))]
+        start = start.astimezone(zone).replace(microsecond=0)
+        end = end.astimezone(zone).replace(microsecond=0)
+        if _unit(self.seed, i, 4) < self.all_day:
+            # Fin exclusivo, como en Google
+            start_value = _google_time(start.date(), zone.key)
+            end_value = _google_time(start.date() + timedelta(days=1), zone.key)
+        else:
+            start_value = _google_time(start, zone.key)
+            end_value = _google_time(end, zone.key)
+        event_id = f"synth{i:07d}"
+        return {
+            'kind': 'calendar#event', 'id': event_id, 'status': 'confirmed',
+            'created': self.created, 'updated': self.created,
+            'summary': f"{TITLES[int(_unit(self.seed, i, 5) * len(TITLES))]} {i}",
+            'description': self._description(_unit(self.seed, i, 6), _unit(self.seed, i, 7)),
+            'organizer': ORGANIZER, 'creator': ORGANIZER,
+            'start': start_value, 'end': end_value,
+            'iCalUID': f"{event_id}@synthetic", 'sequence': 0, 'eventType': 'default',
+        }
+
+    def _single_range(self, low: datetime, high: datetime):
+        """Índices candidatos a solaparse con [low, high)"""
+        first = math.floor((low - self.max_single - self.start).total_seconds() / self.step)
+        last = math.ceil((high - self.start).total_seconds() / self.step)
+        return range(max(0, first), min(self.singles, last + 1))
+
+    @staticmethod
+    def _overlaps(item_start, item_end, low, high) -> bool:
+        return item_start < high and item_end > low
+
+    # --- Consultas con la semántica de events().list ---
+
+    def window_keys(self, low: datetime, high: datetime, single_events: bool = True):
+        """Claves (inicio, tipo, índice o inicio de instancia) de los eventos de la ventana, ordenadas.
+
+        Las claves son ligeras: el evento completo se genera con item(key) al paginar.
+        """
+        keys = []
+        for i in self._single_range(low, high):
+            start, end = self._single_bounds(i)
+            if _unit(self.seed, i, 4) < self.all_day:
+                # Los de día completo ocupan el día local entero
+                zone = self.timezones[int(_unit(self.seed, i, 3) * len(self.timezones))]
+                day = start.astimezone(zone).date()
+                start = datetime(day.year, day.month, day.day, tzinfo=zone)
+                end = start + timedelta(days=1)
+            if self._overlaps(start, end, low, high):
+                keys.append((start.timestamp(), 0, i))
+        for index, series in enumerate(self.series):
+            if single_events:
+                keys.extend((start.timestamp(), 1, (index, start)) for start in series.starts(low, high))
+            elif self._overlaps(series.first_start, series.last_end, low, high):
+                keys.append((series.first_start.timestamp(), 2, index))
+        keys.sort(key=lambda key: (key[0], key[1]))
+        return keys
+
+    def item(self, key) -> dict:
+        _, kind, value = key
+        if kind == 0:
+            return self.single(value)
+        if kind == 1:
+            index, start = value
+            return self.series[index].instance(start, self.created)
+        return self.series[value].master(self.created)
+
+    def items(self, low: datetime = None, high: datetime = None, single_events: bool = True):
+        """Eventos de la ventana (por defecto todo el periodo), generados uno a uno"""
+        for key in self.window_keys(low or self.start, high or self.end, single_events):
+            yield self.item(key)
+
+    def instances(self, series_id: str, low: datetime, high: datetime):
+        series = self._series_by_id.get(series_id)
+        if series is None:
+            return None
+        return [series.instance(start, self.created) for start in series.starts(low, high)]
+
+    def describe(self) -> dict:
+        return {
+            'count': self.count, 'days': self.days, 'start': self.start.isoformat(),
+            'series': len(self.series), 'singles': self.singles, 'overlap': self.overlap,
+            'description_size': self.description_size, 'all_day': self.all_day,
+            'timezones': [zone.key for zone in self.timezones], 'seed': self.seed,
+        }
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Opciones del generador, compartidas con el servidor falso y la suite de benchmarks"""
+    parser.add_argument('--days', type=int, default=31, help='días del periodo (desde el 1 de marzo de 2025)')
+    parser.add_argument('--recurrence', type=float, default=0.2, help='fracción de instancias de series')
+    parser.add_argument('--overlap', type=float, default=0.2, help='probabilidad de solape con el evento siguiente')
+    parser.add_argument('--description-size', type=int, default=200, help='caracteres de descripción de media')
+    parser.add_argument('--timezones', default=','.join(DEFAULT_TIMEZONES))
+    parser.add_argument('--all-day', type=float, default=0.03)
+    parser.add_argument('--seed', type=int, default=1)
+
+
+def from_arguments(args, count: int) -> SyntheticCalendar:
+    return SyntheticCalendar(
+        count, days=args.days, recurrence=args.recurrence, overlap=args.overlap,
+        description_size=args.description_size, timezones=args.timezones.split(','),
+        all_day=args.all_day, seed=args.seed,
+    )
+
+
+def write_payload(calendar: SyntheticCalendar, path: str):
+    """Escribe el payload como array JSON sin construirlo entero en memoria; devuelve cuántos eventos"""
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for item in calendar.items():
+            if written:
+                f.write(',\n')
+            json.dump(item, f, ensure_ascii=False)
+            written += 1
+        f.write(']\n')
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, required=True)
+    parser.add_argument('--output', default=os.path.join('logs', 'synthetic_events.json'))
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    calendar = from_arguments(args, args.count)
+    written = write_payload(calendar, args.output)
+    info = calendar.describe()
+    print(f"{written} eventos ({info['singles']} sueltos, {info['series']} series) en {args.output}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -57,11 +57,37 @@ LOG_DIRECTORY = 'logs'
 OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY')
 if not OPENROUTER_API_KEY:
     raise ValueError("OPENROUTER_API_KEY no encontrada en variables de entorno")
+# Presupuesto de tokens por petición y para el resumen del historial antiguo
+AI_PROMPT_TOKEN_BUDGET = int(os.getenv('AI_PROMPT_TOKEN_BUDGET', '6000'))
+AI_HISTORY_SUMMARY_TOKENS = int(os.getenv('AI_HISTORY_SUMMARY_TOKENS', '300'))
+# Caché de respuestas de la IA (segundos de validez y número máximo de entradas)
+AI_CACHE_TTL_SECONDS = int(os.getenv('AI_CACHE_TTL_SECONDS', str(24 * 3600)))
+AI_CACHE_MAX_ENTRIES = int(os.getenv('AI_CACHE_MAX_ENTRIES', '200'))
 DEFAULT_AI_CONTEXT = """
 You are a helpful calendar assistant. You help users manage their schedule and create events.
 You can understand natural language requests and convert them into structured event data.
 Always be concise and focused on calendar-related tasks.
 """
 
+# HTTP constants (sesión compartida para IA y predicciones)
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '30'))
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '2'))
+# Plazo máximo (segundos) de cada paso de los workers de análisis
+PREDICTIONS_STEP_TIMEOUT = float(os.getenv('PREDICTIONS_STEP_TIMEOUT', '60'))
+AI_STEP_TIMEOUT = float(os.getenv('AI_STEP_TIMEOUT', '90'))
+CALENDAR_STEP_TIMEOUT = float(os.getenv('CALENDAR_STEP_TIMEOUT', '60'))
+# Semanas de historial que usa la analítica local
+LOCAL_ANALYTICS_WEEKS = int(os.getenv('LOCAL_ANALYTICS_WEEKS', '8'))
+# Jornada laboral para buscar huecos libres (horas locales, lunes=0)
+WORKING_HOURS_START = int(os.getenv('WORKING_HOURS_START', '9'))
+WORKING_HOURS_END = int(os.getenv('WORKING_HOURS_END', '18'))
+WORKING_DAYS = tuple(int(d) for d in os.getenv('WORKING_DAYS', '0,1,2,3,4').split(','))
+# Zona horaria de la jornada (p. ej. Europe/Madrid); por defecto la del sistema
+CALENDAR_TIMEZONE = os.getenv('CALENDAR_TIMEZONE')
+
 # Google Calendar constants
 GOOGLE_TOKEN_FILE = 'google_token.pickle'
+# URL base alternativa de la API de Calendar (p. ej. el servidor falso de benchmarks)
+GOOGLE_CALENDAR_ENDPOINT = os.getenv('GOOGLE_CALENDAR_ENDPOINT')
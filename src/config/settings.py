@@ -19,6 +19,9 @@ class Settings(QObject):
         super().__init__()
         self.use_mock_api = False
         self.mock_api_response = ""
+        self.use_local_analytics = True  # Predicciones calculadas en local
+        self.expand_recurrence_locally = False  # Expandir series recurrentes sin singleEvents
+        self.enable_tracing = False  # Escribir trazas de acciones en logs/traces
         self.auto_refresh_enabled = True
         self.dark_mode = False  # Add dark_mode setting
         self.load()  # Cargar configuración al inicializar
@@ -32,6 +35,9 @@ class Settings(QObject):
                     data = json.load(f)
                     self.use_mock_api = data.get('use_mock_api', False)
                     self.mock_api_response = data.get('mock_api_response', "")
+                    self.use_local_analytics = data.get('use_local_analytics', True)
+                    self.expand_recurrence_locally = data.get('expand_recurrence_locally', False)
+                    self.enable_tracing = data.get('enable_tracing', False)
                     self.auto_refresh_enabled = data.get('auto_refresh_enabled', True)
                     self.dark_mode = data.get('dark_mode', False)  # Load dark_mode setting
                 logging.info("Settings loaded successfully")
@@ -49,6 +55,9 @@ class Settings(QObject):
                 json.dump({
                     'use_mock_api': self.use_mock_api,
                     'mock_api_response': self.mock_api_response,
+                    'use_local_analytics': self.use_local_analytics,
+                    'expand_recurrence_locally': self.expand_recurrence_locally,
+                    'enable_tracing': self.enable_tracing,
                     'auto_refresh_enabled': self.auto_refresh_enabled,
                     'dark_mode': self.dark_mode  # Save dark_mode setting
                 }, f, indent=4)
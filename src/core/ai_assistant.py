@@ -1,15 +1,25 @@
 import requests
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from config.constants import OPENROUTER_API_KEY, APP_NAME, OPENROUTER_API_KEY
 from utils.logger import logger
+from utils.metrics import metrics
+from utils.tracing import tracer
 from models.ai_context import AIContext
 from models.ai_chat import AIChat
 from .database import DatabaseManager
+from . import http_client
+from .cancellation import CancellationToken, OperationCancelled
+from .prompt_builder import PromptBuilder
+from .response_cache import ResponseCache
+from .functions import FUNCTIONS
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Respuesta con la que el modelo pide ejecutar una función local
+FUNCTION_CALL_PREFIX = "FUNCION:"
+
 class AIAssistant:
     def __init__(self, db_manager=None):
         self.db_manager = db_manager
@@ -17,6 +27,8 @@ class AIAssistant:
         self.model = "google/gemini-2.0-flash-lite-preview-02-05:free"
         self.active_context = None
         self.conversation_history = []
+        self.prompt_builder = PromptBuilder()
+        self.response_cache = ResponseCache(db_manager) if db_manager else None
         
         # Solo cargar el contexto si tenemos db_manager
         if self.db_manager:
@@ -52,7 +64,7 @@ class AIAssistant:
                 ]
             }
 
-            response = requests.post(
+            response = http_client.post(
                 url=self.api_url,
                 headers={
                     "Authorization": f"Bearer {OPENROUTER_API_KEY}",  # Usar la clave de API correcta
@@ -97,8 +109,16 @@ class AIAssistant:
             logger.error("Error al comunicarse con el asistente: %s", str(e))
             return f"Error al comunicarse con el asistente: {str(e)}"
 
-    def process_message(self, message: str) -> str:
-        """Procesa un mensaje y obtiene respuesta de DeepSeek"""
+    @metrics.timed('ai.process_message')
+    def process_message(self, message: str, cache_fingerprint: Optional[str] = None,
+                        cancel_token: Optional[CancellationToken] = None) -> str:
+        """Procesa un mensaje y obtiene respuesta de DeepSeek.
+
+        Con `cache_fingerprint` (huella de los eventos analizados) el prompt se
+        trata como autocontenido: se envía sin historial y la respuesta se cachea.
+        Con `cancel_token` la petición se aborta al cancelarlo y la
+        cancelación se propaga como OperationCancelled.
+        """
         try:
             logger.info("Iniciando procesamiento de mensaje en AIAssistant")
             
@@ -107,18 +127,27 @@ class AIAssistant:
                 return "Error: API key no configurada. Por favor, configura OPENROUTER_API_KEY en el archivo .env"
 
             logger.info("Preparando request a DeepSeek...")
-            messages = self._prepare_messages(message)
+            messages = self._prepare_messages(message, include_history=cache_fingerprint is None)
+
+            cache_key = None
+            if cache_fingerprint is not None and self.response_cache:
+                cache_key = self.response_cache.make_key(self.model, messages, cache_fingerprint)
+                cached_response = self.response_cache.get(cache_key)
+                if cached_response is not None:
+                    logger.info("Respuesta obtenida de la caché")
+                    self._update_conversation_history(message, cached_response)
+                    return cached_response
             
             logger.debug("Enviando request a DeepSeek API...")
             try:
-                response = requests.post(
+                response = http_client.post(
                     url=self.api_url,
                     headers=self._get_headers(),
                     data=json.dumps({
                         "model": self.model,
                         "messages": messages
                     }),
-                    timeout=30  # Timeout de 30 segundos
+                    cancel_token=cancel_token
                 )
                 response.raise_for_status()
                 logger.info("Respuesta recibida de DeepSeek")
@@ -139,11 +168,16 @@ class AIAssistant:
             
             ai_response = response_data['choices'][0]['message']['content']
             logger.info("Respuesta procesada exitosamente")
+
+            if cache_key:
+                self.response_cache.set(cache_key, ai_response)
             
             self._update_conversation_history(message, ai_response)
             
             return ai_response
 
+        except OperationCancelled:
+            raise
         except Exception as e:
             logger.error("Error crítico en process_message")
             logger.error(f"Tipo de error: {type(e).__name__}")
@@ -151,6 +185,81 @@ class AIAssistant:
             logger.error("Stack trace:", exc_info=True)
             return f"Error al procesar el mensaje: {str(e)}"
 
+    def stream_message(self, message: str, on_token: Optional[Callable[[str], None]] = None,
+                       functions: Optional[str] = None) -> str:
+        """Procesa un mensaje recibiendo la respuesta token a token (SSE).
+
+        Si se pasa `functions` (lista '- id: descripción'), el modelo puede
+        responder 'FUNCION: <id>' en lugar de texto; esa respuesta no se
+        envía a `on_token` ni se guarda en el historial (ver record_turn).
+        """
+        try:
+            logger.info("Iniciando procesamiento en streaming en AIAssistant")
+
+            if not OPENROUTER_API_KEY:
+                logger.error("API key no configurada")
+                return "Error: API key no configurada. Por favor, configura OPENROUTER_API_KEY en el archivo .env"
+
+            messages = self._prepare_messages(message, functions)
+            chunks = []
+            # Con funciones, retener el inicio hasta descartar que sea una llamada
+            decided = functions is None
+            is_function_call = False
+            try:
+                response = http_client.post(
+                    url=self.api_url,
+                    headers=self._get_headers(),
+                    data=json.dumps({
+                        "model": self.model,
+                        "messages": messages,
+                        "stream": True
+                    }),
+                    stream=True
+                )
+                response.raise_for_status()
+
+                with response, tracer.span('ai.stream', cat='http') as span:
+                    for data in http_client.iter_sse_data(response):
+                        if data == '[DONE]':
+                            break
+                        chunk = json.loads(data)
+                        if 'error' in chunk:
+                            raise RuntimeError(chunk['error'].get('message', chunk['error']))
+                        choices = chunk.get('choices') or [{}]
+                        token = choices[0].get('delta', {}).get('content')
+                        if not token:
+                            continue
+                        chunks.append(token)
+                        if not decided:
+                            head = ''.join(chunks).lstrip().upper()
+                            if len(head) < len(FUNCTION_CALL_PREFIX) and FUNCTION_CALL_PREFIX.startswith(head):
+                                continue
+                            decided = True
+                            is_function_call = head.startswith(FUNCTION_CALL_PREFIX)
+                            token = ''.join(chunks)
+                        if on_token and not is_function_call:
+                            on_token(token)
+                    span.set(tokens=len(chunks))
+                if not decided and on_token and chunks:
+                    on_token(''.join(chunks))
+                logger.info("Streaming de DeepSeek completado")
+
+            except requests.Timeout:
+                logger.error("Timeout en streaming de DeepSeek")
+                return "Error: Timeout en la comunicación con DeepSeek"
+            except requests.RequestException as e:
+                logger.error(f"Error en streaming de DeepSeek: {str(e)}")
+                return f"Error en la comunicación con DeepSeek: {str(e)}"
+
+            ai_response = ''.join(chunks)
+            if not is_function_call:
+                self._update_conversation_history(message, ai_response)
+            return ai_response
+
+        except Exception as e:
+            logger.error(f"Error en stream_message: {str(e)}", exc_info=True)
+            return f"Error al procesar el mensaje: {str(e)}"
+
     def _save_chat(self, user_message: str, ai_response: str):
         """Guarda la conversación en la base de datos"""
         if not self.db_manager:
@@ -195,7 +304,32 @@ class AIAssistant:
         results = self.db_manager.execute_query(query, (limit,))
         return [AIChat.from_dict(dict(row)) for row in results]
 
-    def _prepare_messages(self, message: str) -> List[Dict[str, str]]:
+    def parse_function_call(self, response: str) -> Optional[str]:
+        """Devuelve la ID de función si la respuesta es 'FUNCION: <id>' y la
+        función existe; None si es texto o el modelo inventó la ID"""
+        text = response.strip()
+        if not text.upper().startswith(FUNCTION_CALL_PREFIX):
+            return None
+        function_id = text[len(FUNCTION_CALL_PREFIX):].strip().split()
+        if not function_id:
+            return None
+        function_id = function_id[0].lower()
+        if function_id not in FUNCTIONS:
+            logger.warning("El modelo pidió una función inexistente: %s", function_id)
+            return None
+        return function_id
+
+    def is_function_call(self, response: str) -> bool:
+        """True si la respuesta tiene la forma 'FUNCION: ...', exista o no la función"""
+        return response.strip().upper().startswith(FUNCTION_CALL_PREFIX)
+
+    def record_turn(self, message: str, response: str):
+        """Guarda en el historial un turno resuelto fuera de stream_message
+        (p. ej. el resultado de una función local en lugar de 'FUNCION: <id>')"""
+        self._update_conversation_history(message, response)
+
+    def _prepare_messages(self, message: str, functions: Optional[str] = None,
+                          include_history: bool = True) -> List[Dict[str, str]]:
         """Prepara los mensajes para la API de DeepSeek"""
         # Mensaje del sistema
         system_message = {
@@ -204,6 +338,15 @@ class AIAssistant:
             Ayudas a organizar, optimizar y analizar eventos y horarios.
             Proporciona respuestas concisas y prácticas."""
         }
+
+        # Detección de intención dentro de la misma petición
+        if functions:
+            system_message["content"] += f"""
+
+            Funciones locales disponibles:
+{functions}
+            Si el usuario pide explícitamente una de ellas, responde únicamente
+            "{FUNCTION_CALL_PREFIX} <id>" sin ningún otro texto."""
         
         # Mensaje del usuario
         user_message = {
@@ -211,8 +354,9 @@ class AIAssistant:
             "content": message
         }
         
-        # Combinar todo
-        return [system_message] + self.conversation_history + [user_message]
+        # Combinar todo dentro del presupuesto de tokens
+        history = self.conversation_history if include_history else []
+        return self.prompt_builder.build(system_message, history, user_message)
 
     def _get_headers(self) -> Dict[str, str]:
         """Obtiene los headers para la API de DeepSeek"""
@@ -249,9 +393,12 @@ class AIAssistant:
         try:
             query = "SELECT user_message, ai_response FROM ai_chat_history ORDER BY id DESC LIMIT 20"
             results = self.db_manager.execute_query(query)
-            for user_message, ai_response in results:
-                self.conversation_history.append({"role": "user", "content": user_message})
-                self.conversation_history.append({"role": "assistant", "content": ai_response})
+            # La consulta trae los más recientes primero: invertir a orden cronológico
+            history = []
+            for user_message, ai_response in reversed(results):
+                history.append({"role": "user", "content": user_message})
+                history.append({"role": "assistant", "content": ai_response})
+            self.conversation_history = history[-20:]
             logger.info("Historial de chat cargado exitosamente.")
         except Exception as e:
             logger.error(f"Error al cargar el historial de chat: {str(e)}") 
\ No newline at end of file
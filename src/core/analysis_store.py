@@ -0,0 +1,139 @@
+import hashlib
+import json
+import time
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+from models.event import Event
+from utils.logger import logger
+
+def _day_fingerprint(events: List[Event]) -> str:
+    """Huella de los eventos de un día (cambia si se crea, mueve, renombra o borra alguno)"""
+    lines = sorted(
+        f"{e.google_event_id}|{e.title}|{e.start_datetime.timestamp()}|{e.end_datetime.timestamp()}"
+        for e in events
+    )
+    return hashlib.sha1("\n".join(lines).encode('utf-8')).hexdigest()
+
+def _aggregate_day(events: List[Event]) -> Dict:
+    timed = [e for e in events if not e.is_all_day()]
+    return {
+        'events': len(events),
+        'busy_minutes': int(sum((e.end_datetime - e.start_datetime).total_seconds() for e in timed) // 60),
+        'first_start': min(e.start_datetime for e in timed).strftime('%H:%M') if timed else None,
+        'last_end': max(e.end_datetime for e in timed).strftime('%H:%M') if timed else None,
+        'top_titles': json.dumps(
+            [title for title, _ in Counter(e.title or 'Sin título' for e in events).most_common(3)],
+            ensure_ascii=False
+        ),
+    }
+
+class AnalysisStore:
+    """Agregados por día y evento de análisis de cada mes, guardados en SQLite.
+
+    Cada día lleva la huella de sus eventos; en una nueva ejecución solo se
+    recalculan y escriben los días cuya huella cambió.
+    """
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    def update_month(self, month: str, events: Iterable[Event]) -> List[str]:
+        """Sincroniza los agregados del mes ('YYYY-MM'); devuelve los días modificados"""
+        by_day = defaultdict(list)
+        for event in events:
+            if event.start_datetime and event.end_datetime:
+                day = event.start_datetime.date().isoformat()
+                if day.startswith(month):
+                    by_day[day].append(event)
+
+        stored = {
+            row['day']: row['fingerprint']
+            for row in self.db_manager.execute_query(
+                "SELECT day, fingerprint FROM analysis_day_aggregates WHERE month = ?", (month,)
+            )
+        }
+
+        now = time.time()
+        rows = []
+        for day, day_events in by_day.items():
+            fingerprint = _day_fingerprint(day_events)
+            if stored.get(day) == fingerprint:
+                continue
+            aggregate = _aggregate_day(day_events)
+            rows.append((
+                day, month, fingerprint, aggregate['events'], aggregate['busy_minutes'],
+                aggregate['first_start'], aggregate['last_end'], aggregate['top_titles'], now
+            ))
+        if rows:
+            self.db_manager.execute_many(
+                """INSERT OR REPLACE INTO analysis_day_aggregates
+                   (day, month, fingerprint, events, busy_minutes, first_start, last_end, top_titles, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows
+            )
+
+        removed = [(day,) for day in stored if day not in by_day]
+        if removed:
+            self.db_manager.execute_many("DELETE FROM analysis_day_aggregates WHERE day = ?", removed)
+
+        changed = sorted([row[0] for row in rows] + [day for day, in removed])
+        logger.info(f"Agregados de {month}: {len(changed)} días actualizados de {len(by_day)}")
+        return changed
+
+    def month_aggregates(self, month: str) -> List[Dict]:
+        """Agregados guardados del mes, por día"""
+        rows = self.db_manager.execute_query(
+            """SELECT day, events, busy_minutes, first_start, last_end, top_titles
+               FROM analysis_day_aggregates WHERE month = ? ORDER BY day""",
+            (month,)
+        )
+        return [dict(row, top_titles=json.loads(row['top_titles'] or '[]')) for row in rows]
+
+    def month_summary(self, month: str) -> str:
+        """Resumen del mes en texto a partir de los agregados"""
+        days = self.month_aggregates(month)
+        if not days:
+            return f"Sin eventos registrados en {month}."
+        total_events = sum(d['events'] for d in days)
+        total_hours = sum(d['busy_minutes'] for d in days) / 60
+        busiest = max(days, key=lambda d: d['busy_minutes'])
+        titles = Counter(title for d in days for title in d['top_titles'])
+        weekdays = Counter()
+        for d in days:
+            weekdays[date.fromisoformat(d['day']).weekday()] += d['busy_minutes']
+        names = ('lunes', 'martes', 'miércoles', 'jueves', 'viernes', 'sábado', 'domingo')
+        return "\n".join([
+            f"Resumen de {month}: {total_events} eventos en {len(days)} días, {total_hours:.1f}h ocupadas.",
+            f"Día más cargado: {busiest['day']} ({busiest['busy_minutes'] / 60:.1f}h, {busiest['events']} eventos).",
+            f"Día de la semana con más carga: {names[weekdays.most_common(1)[0][0]]}.",
+            f"Eventos más frecuentes: {', '.join(t for t, _ in titles.most_common(5))}.",
+        ])
+
+    def get_synced_at(self, month: str) -> Optional[float]:
+        """Momento (timestamp) en que se pidieron los eventos de la última sincronización del mes"""
+        rows = self.db_manager.execute_query(
+            "SELECT synced_at FROM analysis_months WHERE month = ?", (month,)
+        )
+        return rows[0]['synced_at'] if rows else None
+
+    def set_synced_at(self, month: str, synced_at: float):
+        self.db_manager.execute_update(
+            "INSERT OR REPLACE INTO analysis_months (month, synced_at) VALUES (?, ?)",
+            (month, synced_at)
+        )
+
+    def get_analysis_event_id(self, month: str) -> Optional[str]:
+        rows = self.db_manager.execute_query(
+            "SELECT event_id FROM analysis_events WHERE month = ?", (month,)
+        )
+        return rows[0]['event_id'] if rows else None
+
+    def set_analysis_event_id(self, month: str, event_id: str):
+        self.db_manager.execute_update(
+            "INSERT OR REPLACE INTO analysis_events (month, event_id, updated_at) VALUES (?, ?, ?)",
+            (month, event_id, time.time())
+        )
+
+    def clear_analysis_event_id(self, month: str):
+        self.db_manager.execute_update("DELETE FROM analysis_events WHERE month = ?", (month,))
@@ -0,0 +1,219 @@
+import json
+from array import array
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterable, List, Optional
+from models.event import Event
+from config.constants import LOCAL_ANALYTICS_WEEKS
+from core.cancellation import CancellationToken
+
+# Palabras que identifican reuniones en el título (sin asistentes en el modelo)
+MEETING_KEYWORDS = (
+    'reunión', 'reunion', 'meeting', 'llamada', 'call', 'sync', 'standup',
+    'daily', '1:1', 'one on one', 'entrevista', 'interview', 'comité', 'junta'
+)
+
+WEEKDAYS = ('lunes', 'martes', 'miércoles', 'jueves', 'viernes', 'sábado', 'domingo')
+
+def _is_meeting(title: str) -> bool:
+    title = (title or '').lower()
+    return any(keyword in title for keyword in MEETING_KEYWORDS)
+
+def _is_all_day(event: Event, hours: float) -> bool:
+    return event.is_all_day() or (hours >= 23.9 and event.start_datetime.hour == 0)
+
+class CalendarAnalytics:
+    """Métricas de carga calculadas localmente a partir de los eventos.
+
+    Los eventos se pasan una sola vez a columnas (`array`) y cada métrica
+    se obtiene recorriendo esas columnas, sin llamadas de red.
+    """
+
+    def __init__(self, events: Iterable[Event], now: Optional[datetime] = None):
+        self.now = now or datetime.now(timezone.utc)
+        self.titles: List[str] = []
+        self.weeks: List[str] = []
+        self.starts = array('d')      # timestamp de inicio
+        self.hours = array('d')       # duración en horas
+        self.hour_of_day = array('b')
+        self.weekday = array('b')
+        self.meeting = array('b')
+
+        for event in sorted((e for e in events if e.start_datetime and e.end_datetime),
+                            key=lambda e: e.start_datetime):
+            hours = (event.end_datetime - event.start_datetime).total_seconds() / 3600
+            if _is_all_day(event, hours):
+                continue  # Los eventos de día completo no cuentan como carga
+            year, week, _ = event.start_datetime.isocalendar()
+            self.titles.append(event.title or 'Sin título')
+            self.weeks.append(f"{year}-W{week:02d}")
+            self.starts.append(event.start_datetime.timestamp())
+            self.hours.append(max(hours, 0.0))
+            self.hour_of_day.append(event.start_datetime.hour)
+            self.weekday.append(event.start_datetime.weekday())
+            self.meeting.append(_is_meeting(event.title))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def weekly_load(self) -> List[Dict[str, Any]]:
+        """Eventos y horas ocupadas por semana ISO"""
+        counts = Counter(self.weeks)
+        hours = defaultdict(float)
+        for week, duration in zip(self.weeks, self.hours):
+            hours[week] += duration
+        return [
+            {'week': week, 'events': counts[week], 'hours': round(hours[week], 1)}
+            for week in sorted(counts)
+        ]
+
+    def busiest_hours(self, top: int = 3) -> List[Dict[str, int]]:
+        """Horas del día con más eventos"""
+        buckets = array('i', [0] * 24)
+        for hour in self.hour_of_day:
+            buckets[hour] += 1
+        ranked = sorted(range(24), key=lambda h: (-buckets[h], h))
+        return [{'hour': h, 'events': buckets[h]} for h in ranked[:top] if buckets[h]]
+
+    def busiest_weekdays(self, top: int = 3) -> List[Dict[str, Any]]:
+        """Días de la semana con más horas ocupadas"""
+        buckets = array('d', [0.0] * 7)
+        for day, duration in zip(self.weekday, self.hours):
+            buckets[day] += duration
+        ranked = sorted(range(7), key=lambda d: (-buckets[d], d))
+        return [{'weekday': WEEKDAYS[d], 'hours': round(buckets[d], 1)} for d in ranked[:top] if buckets[d]]
+
+    def meeting_ratio(self) -> float:
+        """Fracción del tiempo ocupado que corresponde a reuniones"""
+        total = sum(self.hours)
+        if not total:
+            return 0.0
+        meetings = sum(h for h, is_meeting in zip(self.hours, self.meeting) if is_meeting)
+        return round(meetings / total, 2)
+
+    def recurring_patterns(self, min_occurrences: int = 3) -> List[Dict[str, Any]]:
+        """Títulos que se repiten el mismo día de la semana y a la misma hora"""
+        slots = Counter(zip(self.titles, self.weekday, self.hour_of_day))
+        # Consistencia = semanas en las que apareció en ese horario
+        observed_weeks = len(set(self.weeks)) or 1
+        patterns = []
+        for (title, day, hour), count in slots.most_common():
+            if count < min_occurrences:
+                break
+            patterns.append({
+                'title': title,
+                'weekday': WEEKDAYS[day],
+                'hour': hour,
+                'occurrences': count,
+                'consistency': round(min(1.0, count / observed_weeks), 2)
+            })
+        return patterns
+
+    def forecast_next_week(self, weeks: int = LOCAL_ANALYTICS_WEEKS) -> Optional[Dict[str, Any]]:
+        """Horas previstas para la próxima semana (tendencia lineal por mínimos cuadrados).
+
+        Solo cuenta las `weeks` semanas completas anteriores a la actual (la
+        actual va a medias y arrastraría la tendencia a la baja); las semanas
+        sin eventos cuentan como 0h para que cada x sea una semana real.
+        """
+        hours_by_week = defaultdict(float)
+        for week, duration in zip(self.weeks, self.hours):
+            hours_by_week[week] += duration
+        monday = self.now - timedelta(days=self.now.weekday())
+        history = []
+        for offset in range(weeks, 0, -1):
+            year, week, _ = (monday - timedelta(weeks=offset)).isocalendar()
+            history.append(hours_by_week.get(f"{year}-W{week:02d}", 0.0))
+        if len(history) < 2 or not any(history):
+            return None
+        n = len(history)
+        mean_x = (n - 1) / 2
+        mean_y = sum(history) / n
+        variance = sum((x - mean_x) ** 2 for x in range(n))
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(range(n), history)) / variance
+        predicted = max(0.0, mean_y + slope * (n - mean_x))
+        return {
+            'hours': round(predicted, 1),
+            'average': round(mean_y, 1),
+            'trend_per_week': round(slope, 2),
+            'weeks_used': n
+        }
+
+    def compute(self, cancel_token: Optional[CancellationToken] = None) -> Dict[str, Any]:
+        """Todas las métricas en un diccionario serializable.
+
+        Con `cancel_token` se comprueba la cancelación entre una métrica y la siguiente.
+        """
+        steps = (
+            ('weekly_load', self.weekly_load),
+            ('busiest_hours', self.busiest_hours),
+            ('busiest_weekdays', self.busiest_weekdays),
+            ('meeting_ratio', self.meeting_ratio),
+            ('recurring_patterns', self.recurring_patterns),
+            ('forecast', self.forecast_next_week),
+        )
+        metrics = {'events': len(self), 'total_hours': round(sum(self.hours), 1)}
+        for name, step in steps:
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+            metrics[name] = step()
+        return metrics
+
+    def predictions(self, metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Traduce las métricas al formato de predicciones de la API remota"""
+        next_monday = (self.now - timedelta(days=self.now.weekday()) + timedelta(days=7)).date()
+        next_range = {
+            'start_date': next_monday.isoformat(),
+            'end_date': (next_monday + timedelta(days=6)).isoformat()
+        }
+        predictions = []
+
+        forecast = metrics['forecast']
+        if forecast:
+            trend = 'al alza' if forecast['trend_per_week'] > 0 else 'a la baja'
+            predictions.append({
+                'event': f"Carga prevista de {forecast['hours']}h la próxima semana",
+                'probability': min(95, 50 + 5 * forecast['weeks_used']),
+                'estimated_date_range': next_range,
+                'causes': [f"Media de {forecast['average']}h/semana con tendencia {trend}"],
+                'conditions': ["Que se mantenga el ritmo de las últimas semanas"],
+                'consequences': ["Semana sobrecargada" if forecast['hours'] > forecast['average'] * 1.2
+                                 else "Carga similar a la habitual"]
+            })
+
+        for pattern in metrics['recurring_patterns'][:5]:
+            predictions.append({
+                'event': f"{pattern['title']} el {pattern['weekday']} a las {pattern['hour']:02d}:00",
+                'probability': int(pattern['consistency'] * 100),
+                'estimated_date_range': next_range,
+                'causes': [f"Se ha repetido {pattern['occurrences']} veces en ese horario"],
+                'conditions': ["Que no se cancele ni se mueva"],
+                'consequences': ["Bloque fijo a respetar al planificar"]
+            })
+        return predictions
+
+def build_predictions_response(events: Iterable[Event], now: Optional[datetime] = None,
+                               cancel_token: Optional[CancellationToken] = None) -> str:
+    """Genera una respuesta con el mismo formato que la API de predicciones"""
+    analytics = CalendarAnalytics(events, now)
+    metrics = analytics.compute(cancel_token)
+    if cancel_token:
+        cancel_token.raise_if_cancelled()
+    payload = {'predictions': analytics.predictions(metrics), 'metrics': metrics}
+
+    lines = [f"{metrics['events']} eventos, {metrics['total_hours']}h ocupadas."]
+    if metrics['busiest_hours']:
+        hours = ", ".join(f"{h['hour']:02d}:00 ({h['events']})" for h in metrics['busiest_hours'])
+        lines.append(f"Horas con más eventos: {hours}.")
+    if metrics['busiest_weekdays']:
+        days = ", ".join(f"{d['weekday']} ({d['hours']}h)" for d in metrics['busiest_weekdays'])
+        lines.append(f"Días más cargados: {days}.")
+    lines.append(f"Reuniones: {int(metrics['meeting_ratio'] * 100)}% del tiempo ocupado.")
+    if metrics['forecast']:
+        lines.append(f"Previsión para la próxima semana: {metrics['forecast']['hours']}h.")
+
+    return (
+        json.dumps(payload, ensure_ascii=False)
+        + "\n\nAnalysis:\n\n" + "\n".join(lines)
+        + "\n\nDEBUG:\nanalítica local"
+    )
@@ -1,12 +1,24 @@
-import requests
 import json
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, timedelta, timezone
 import calendar
 from utils.logger import logger
 from models.event import Event
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+from googleapiclient.errors import HttpError
 from core.ai_assistant import AIAssistant
 from config.settings import Settings
+from core import http_client
+from core.cancellation import CancellationToken
+from core.event_encoding import encode_events_compact
+from core.calendar_analytics import build_predictions_response
+from core.analysis_store import AnalysisStore
+from core.free_slots import local_timezone
+from config.constants import LOCAL_ANALYTICS_WEEKS
+
+# Segundos que se restan al momento de la descarga al guardarlo como sincronizado
+MONTH_SYNC_MARGIN_SECONDS = 60
+# Estados con los que Google indica que el evento ya no existe
+EVENT_GONE_STATUSES = (404, 410)
 
 class CalendarAnalyzer:
     def __init__(self, calendar_manager=None, db_manager=None):
@@ -16,6 +28,8 @@ class CalendarAnalyzer:
         self.api_url = 'https://magicloops.dev/api/loop/b3dab971-9034-4bf6-93ad-4c701def8f33/run'
         self.analysis_event_title = 'Análisis Mensual de Eventos'
         self.ai_assistant = AIAssistant(db_manager)
+        # Agregados diarios e id del evento de análisis (requiere base de datos)
+        self.analysis_store = AnalysisStore(db_manager) if db_manager else None
         logger.info("CalendarAnalyzer inicializado con configuración")
 
     def _process_api_response(self, response_text: str) -> Dict[str, Any]:
@@ -65,26 +79,47 @@ class CalendarAnalyzer:
             logger.debug(f"Respuesta que causó el error: {response_text[:500]}...")  # Primeros 500 caracteres
             raise
 
-    def get_predictions(self) -> str:
+    def get_predictions(self, cancel_token: CancellationToken = None) -> str:
         """Obtiene predicciones, ya sea de la API real o simulada"""
         try:
             if self.settings.use_mock_api:
                 logger.info("Usando API simulada para predicciones")
                 return self.settings.mock_api_response
+            elif self.settings.use_local_analytics:
+                logger.info("Usando analítica local para predicciones")
+                return self._get_local_predictions(cancel_token)
             else:
                 logger.info("Usando API real para predicciones")
                 # Aquí iría la lógica de la API real
-                return self._get_real_predictions()
+                return self._get_real_predictions(cancel_token)
 
         except Exception as e:
             logger.error(f"Error obteniendo predicciones: {str(e)}", exc_info=True)
             raise
 
-    def _get_real_predictions(self):
+    def _get_local_predictions(self, cancel_token: CancellationToken = None) -> str:
+        """Calcula las predicciones a partir de los eventos, sin red"""
+        if not self.calendar_manager:
+            # Mismo formato que la API: sin predicciones y el motivo en el análisis
+            logger.warning("Analítica local sin calendario conectado")
+            return (
+                json.dumps({'predictions': []})
+                + "\n\nAnalysis:\n\nSin calendario: conecta Google Calendar para calcular predicciones."
+                + "\n\nDEBUG:\nanalítica local"
+            )
+        now = datetime.now(timezone.utc)
+        start = now - timedelta(weeks=LOCAL_ANALYTICS_WEEKS)
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        events = self.calendar_manager.get_events(start, now + timedelta(weeks=1), log_raw=False)
+        logger.info(f"Analítica local sobre {len(events)} eventos")
+        return build_predictions_response(events, now, cancel_token)
+
+    def _get_real_predictions(self, cancel_token: CancellationToken = None):
         """Obtiene predicciones de la API real"""
         try:
             logger.info("Solicitando predicciones a API real...")
-            response = requests.get(self.api_url)
+            response = http_client.get(self.api_url, cancel_token=cancel_token)
             response.raise_for_status()
             
             # Esperar y obtener la respuesta
@@ -97,7 +132,7 @@ class CalendarAnalyzer:
             logger.error(f"Error obteniendo predicciones de API real: {str(e)}")
             raise
 
-    def process_with_ai(self, api_response: str) -> Dict[str, Any]:
+    def process_with_ai(self, api_response: str, cancel_token: CancellationToken = None) -> Dict[str, Any]:
         """Procesa la respuesta de la API con IA"""
         try:
             logger.info("Iniciando process_with_ai")
@@ -105,8 +140,12 @@ class CalendarAnalyzer:
             # Procesar con IA primero
             logger.info("Preparando llamada a DeepSeek...")
             prompt = f"Analiza estas predicciones y genera un resumen claro en español:\n{api_response}"
+            month = self._current_month()
+            month_summary = self._month_summary(month)
+            if month_summary:
+                prompt += f"\n\nResumen del mes (calculado a partir del calendario):\n{month_summary}"
             
-            ai_response = self.ai_assistant.process_message(prompt)
+            ai_response = self.ai_assistant.process_message(prompt, cancel_token=cancel_token)
             logger.info("Respuesta de DeepSeek recibida")
             
             # Extraer el análisis usando la nueva función
@@ -133,7 +172,9 @@ class CalendarAnalyzer:
             
             return {
                 'ai_analysis': ai_response,
-                'api_analysis': analysis_text
+                'api_analysis': analysis_text,
+                'month_summary': month_summary,
+                'month': month
             }
             
         except Exception as e:
@@ -141,18 +182,19 @@ class CalendarAnalyzer:
             logger.error("Stack trace:", exc_info=True)
             raise
 
-    def save_to_calendar(self, analysis_result: Dict[str, str]):
+    def save_to_calendar(self, analysis_result: Dict[str, str], cancel_token: CancellationToken = None):
         """Guarda los resultados en el calendario"""
         try:
             logger.info("Guardando resultados en el calendario")
             
-            # Obtener el último día del mes actual
-            today = datetime.now()
-            last_day = calendar.monthrange(today.year, today.month)[1]
-            event_date = date(today.year, today.month, last_day)
+            # Último día del mismo mes que se analizó (aunque haya cambiado entretanto)
+            month = analysis_result.get('month') or self._current_month()
+            event_date = self._last_day(month)
             
             # Formatear descripción con ambos análisis
             description = f"{analysis_result['ai_analysis']}\n\n\nAnálisis:\n{analysis_result['api_analysis']}"
+            if analysis_result.get('month_summary'):
+                description += f"\n\n{analysis_result['month_summary']}"
             
             event_data = {
                 'summary': self.analysis_event_title,
@@ -165,12 +207,9 @@ class CalendarAnalyzer:
                 }
             }
             
-            # Eliminar evento anterior si existe
-            self._delete_previous_analysis()
-            
-            # Crear nuevo evento
-            self.calendar_manager.create_event(event_data)
-            logger.info("Evento de análisis creado exitosamente")
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+            self._save_analysis_event(event_data, month)
             return True
             
         except Exception as e:
@@ -204,10 +243,7 @@ class CalendarAnalyzer:
 
     def _prepare_events_summary(self, events) -> str:
         """Prepara un resumen de eventos para la API"""
-        summary = "Análisis de eventos del mes:\n"
-        for event in events:
-            summary += f"- {event.title} ({event.start_datetime})\n"
-        return summary
+        return "Análisis de eventos del mes:\n" + encode_events_compact(events)
 
     def _create_event_from_dict(self, event_data: dict) -> Event:
         """Crea una instancia de Event desde un diccionario"""
@@ -229,23 +265,9 @@ class CalendarAnalyzer:
         """Actualiza o crea el evento con el resultado del análisis"""
         try:
             # Obtener último día del mes
-            today = date.today()
-            _, last_day = calendar.monthrange(today.year, today.month)
-            last_date = date(today.year, today.month, last_day)
-            
-            # Buscar y eliminar evento existente con el mismo título
-            logger.info(f"Buscando eventos existentes con título '{self.analysis_event_title}'")
-            events = self.calendar_manager.get_events()
+            month = self._current_month()
+            last_date = self._last_day(month)
             
-            for event in events:
-                if event.title == self.analysis_event_title:
-                    logger.info(f"Eliminando evento existente con ID: {event.google_event_id}")
-                    try:
-                        self.calendar_manager.delete_event(event.google_event_id)
-                    except Exception as e:
-                        logger.error(f"Error eliminando evento existente: {str(e)}")
-            
-            # Crear nuevo evento
             event_data = {
                 'summary': self.analysis_event_title,
                 'description': analysis_result['analysis'],
@@ -257,23 +279,112 @@ class CalendarAnalyzer:
                 }
             }
             
-            # Crear nuevo evento
-            self.calendar_manager.create_event(event_data)
-            logger.info(f"Nuevo evento de análisis creado para {last_date}")
+            # Actualizar por id si ya existe, si no crear
+            self._save_analysis_event(event_data, month)
+            logger.info(f"Evento de análisis guardado para {last_date}")
                 
         except Exception as e:
             logger.error(f"Error creando evento de análisis: {str(e)}")
             raise
 
-    def _delete_previous_analysis(self):
-        """Elimina el evento de análisis anterior si existe"""
+    def _current_month(self) -> str:
+        """Clave 'YYYY-MM' del mes actual en la zona local del calendario.
+
+        Se calcula una vez por análisis y se pasa a los agregados y al evento
+        de análisis, para que cerca de medianoche no acaben en meses distintos.
+        """
+        return datetime.now(local_timezone()).strftime('%Y-%m')
+
+    def _month_bounds(self, month: str) -> Tuple[datetime, datetime]:
+        """Límites [inicio, fin) del mes 'YYYY-MM' en la zona local del calendario"""
+        zone = local_timezone()
+        year, number = map(int, month.split('-'))
+        return (datetime(year, number, 1, tzinfo=zone),
+                datetime(year + number // 12, number % 12 + 1, 1, tzinfo=zone))
+
+    def _last_day(self, month: str) -> date:
+        year, number = map(int, month.split('-'))
+        return date(year, number, calendar.monthrange(year, number)[1])
+
+    def _month_summary(self, month: Optional[str] = None) -> str:
+        """Actualiza los agregados diarios del mes (solo días con cambios) y los resume.
+
+        Si el mes ya se sincronizó, primero se piden solo los eventos
+        modificados desde entonces (updatedMin); sin cambios no se descarga
+        el mes y se usan los agregados guardados.
+        """
+        if not self.analysis_store or not self.calendar_manager:
+            return ""
+        try:
+            now = datetime.now(timezone.utc)
+            month = month or self._current_month()
+            month_start, month_end = self._month_bounds(month)
+
+            synced_at = self.analysis_store.get_synced_at(month)
+            if synced_at is not None and not self._month_changed(month, month_start, month_end, synced_at):
+                logger.info(f"Sin cambios en {month} desde la última sincronización")
+                return self.analysis_store.month_summary(month)
+
+            # Margen para cambios que el servidor registra mientras dura la descarga
+            fetched_at = now.timestamp() - MONTH_SYNC_MARGIN_SECONDS
+            events = [
+                e for e in self.calendar_manager.get_events(month_start, month_end, log_raw=False)
+                if e.title != self.analysis_event_title
+            ]
+            self.analysis_store.update_month(month, events)
+            self.analysis_store.set_synced_at(month, fetched_at)
+            return self.analysis_store.month_summary(month)
+        except Exception as e:
+            logger.warning(f"No se pudieron actualizar los agregados del mes: {str(e)}")
+            return ""
+
+    def _month_changed(self, month: str, month_start: datetime, month_end: datetime, synced_at: float) -> bool:
+        """Si algún evento del mes cambió desde `synced_at`, sin contar el propio evento de análisis"""
+        analysis_event_id = self.analysis_store.get_analysis_event_id(month)
+        changed = self.calendar_manager.get_changed_event_ids(
+            month_start, month_end, datetime.fromtimestamp(synced_at, timezone.utc)
+        )
+        return any(event_id != analysis_event_id for event_id in changed)
+
+    def _save_analysis_event(self, event_data: dict, month: str):
+        """Actualiza el evento de análisis del mes 'YYYY-MM' por su id guardado o lo crea"""
+        event_id = self.analysis_store.get_analysis_event_id(month) if self.analysis_store else None
+        if event_id:
+            try:
+                self.calendar_manager.update_event(dict(event_data, id=event_id))
+                logger.info(f"Evento de análisis actualizado: {event_id}")
+                return
+            except HttpError as e:
+                # Solo si se borró desde Google Calendar; con timeouts, 5xx o cuota
+                # se conserva el id para no dejar un evento duplicado
+                if e.resp.status not in EVENT_GONE_STATUSES:
+                    logger.error(f"No se pudo actualizar el evento {event_id}: {str(e)}")
+                    raise
+                logger.warning(f"El evento {event_id} ya no existe, se creará de nuevo")
+                self.analysis_store.clear_analysis_event_id(month)
+        else:
+            self._delete_previous_analysis(month)
+
+        created = self.calendar_manager.create_event(event_data)
+        if self.analysis_store and created and created.google_event_id:
+            self.analysis_store.set_analysis_event_id(month, created.google_event_id)
+        logger.info("Evento de análisis creado exitosamente")
+
+    def _delete_previous_analysis(self, month: str):
+        """Elimina el evento de análisis anterior del mes 'YYYY-MM' si existe"""
         try:
+            event_id = self.analysis_store.get_analysis_event_id(month) if self.analysis_store else None
+            if event_id:
+                # Acceso directo por id, sin volver a descargar el mes
+                logger.info(f"Eliminando evento de análisis anterior: {event_id}")
+                self.analysis_store.clear_analysis_event_id(month)
+                self.calendar_manager.delete_event(event_id)
+                return
+
             logger.info("Buscando evento de análisis anterior...")
             
             # Obtener eventos del último día del mes
-            today = datetime.now()
-            last_day = calendar.monthrange(today.year, today.month)[1]
-            target_date = date(today.year, today.month, last_day)
+            target_date = self._last_day(month)
             
             # Buscar eventos
             events = self.calendar_manager.get_events()
@@ -0,0 +1,74 @@
+import threading
+import time
+import weakref
+from typing import Optional
+
+class OperationCancelled(Exception):
+    """La operación se canceló antes de terminar"""
+
+class OperationTimeout(OperationCancelled):
+    """La operación superó su plazo"""
+
+class CancellationToken:
+    """Token de cancelación cooperativa con plazo opcional.
+
+    Los tokens hijos (`child`) heredan la cancelación del padre y pueden
+    tener su propio plazo, p. ej. uno por paso de un worker.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, parent: 'CancellationToken' = None):
+        self._event = threading.Event()
+        self._parent = parent
+        # Débiles: un padre de larga vida (sesión de chat o de análisis) no
+        # retiene los tokens de cada paso cuando ya nadie los usa
+        self._children = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        if parent and parent.deadline is not None:
+            self.deadline = min(self.deadline or parent.deadline, parent.deadline)
+
+    def cancel(self):
+        """Cancela este token y sus hijos"""
+        self._event.set()
+        with self._lock:
+            children = list(self._children)
+        for child in children:
+            child.cancel()
+
+    def child(self, timeout: Optional[float] = None) -> 'CancellationToken':
+        """Crea un token hijo con plazo propio"""
+        token = CancellationToken(timeout, parent=self)
+        with self._lock:
+            self._children.add(token)
+        if self.is_cancelled:
+            token.cancel()
+        return token
+
+    @property
+    def timed_out(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set() or self.timed_out
+
+    def remaining(self) -> Optional[float]:
+        """Segundos hasta el plazo, o None si no tiene"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def wait(self, timeout: float) -> bool:
+        """Espera hasta `timeout` segundos; True si el token quedó cancelado"""
+        remaining = self.remaining()
+        if remaining is not None:
+            timeout = min(timeout, remaining)
+        self._event.wait(timeout)
+        return self.is_cancelled
+
+    def raise_if_cancelled(self):
+        """Lanza OperationTimeout/OperationCancelled si corresponde"""
+        if self._event.is_set():
+            raise OperationCancelled("Operación cancelada")
+        if self.timed_out:
+            raise OperationTimeout("Tiempo de espera agotado")
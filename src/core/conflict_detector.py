@@ -0,0 +1,147 @@
+import bisect
+import heapq
+from typing import Dict, Iterable, List, Set, Tuple
+from models.event import Event
+
+def event_key(event: Event) -> str:
+    """Clave estable de un evento dentro del detector"""
+    return event.google_event_id or f"local-{id(event)}"
+
+def blocks_time(event: Event) -> bool:
+    """Solo los eventos con hora ocupan tiempo; los de día completo no chocan"""
+    if not event.start_datetime or not event.end_datetime:
+        return False
+    if event.end_datetime <= event.start_datetime:
+        return False
+    hours = (event.end_datetime - event.start_datetime).total_seconds() / 3600
+    return not (event.is_all_day() or (hours >= 23.9 and event.start_datetime.hour == 0))
+
+class ConflictDetector:
+    """Detecta solapamientos entre eventos con un barrido sobre intervalos ordenados.
+
+    Los intervalos se mantienen ordenados por inicio, así que añadir, quitar o
+    sincronizar eventos no obliga a reordenar todo el calendario.
+    """
+
+    def __init__(self, events: Iterable[Event] = ()):
+        self._intervals: List[Tuple[float, float, str]] = []  # (inicio, fin, clave)
+        self._events: Dict[str, Event] = {}
+        self._positions: Dict[str, Tuple[float, float, str]] = {}  # intervalo indexado por clave
+        self._max_duration = 0.0
+        self.set_events(events)
+
+    def __len__(self):
+        return len(self._intervals)
+
+    def set_events(self, events: Iterable[Event]):
+        """Reconstruye el índice completo (O(n log n))"""
+        self._events = {event_key(e): e for e in events if blocks_time(e)}
+        self._positions = {key: self._interval(key, e) for key, e in self._events.items()}
+        self._intervals = sorted(self._positions.values())
+        self._max_duration = max((end - start for start, end, _ in self._intervals), default=0.0)
+
+    def sync(self, events: Iterable[Event]):
+        """Aplica solo las diferencias con la lista de eventos actual"""
+        incoming = {event_key(e): e for e in events if blocks_time(e)}
+        for key in list(self._events):
+            if key not in incoming:
+                self.remove(self._events[key])
+        for key, event in incoming.items():
+            # Comparar con el intervalo indexado: el evento pudo cambiar en sitio
+            if self._positions.get(key) != self._interval(key, event):
+                self.add(event)
+            else:
+                self._events[key] = event
+
+    def add(self, event: Event):
+        """Añade un evento al índice (O(log n) para localizar su posición)"""
+        self.remove(event)
+        if not blocks_time(event):
+            return
+        key = event_key(event)
+        interval = self._interval(key, event)
+        bisect.insort(self._intervals, interval)
+        self._events[key] = event
+        self._positions[key] = interval
+        self._max_duration = max(self._max_duration, interval[1] - interval[0])
+
+    def remove(self, event: Event):
+        """Quita un evento del índice si estaba"""
+        key = event_key(event)
+        self._events.pop(key, None)
+        interval = self._positions.pop(key, None)
+        if interval is None:
+            return
+        index = bisect.bisect_left(self._intervals, interval)
+        if index < len(self._intervals) and self._intervals[index] == interval:
+            del self._intervals[index]
+
+    def conflicts_for(self, event: Event) -> List[Event]:
+        """Eventos que se solapan con `event`, sin recorrer todo el índice"""
+        if not blocks_time(event):
+            return []
+        key = event_key(event)
+        start, end, _ = self._interval(key, event)
+        # Solo pueden solaparse los que empiezan en [inicio - duración máxima, fin)
+        low = bisect.bisect_left(self._intervals, (start - self._max_duration,))
+        high = bisect.bisect_left(self._intervals, (end,))
+        return [
+            self._events[other_key]
+            for other_start, other_end, other_key in self._intervals[low:high]
+            if other_key != key and other_end > start
+        ]
+
+    def conflicting_pairs(self) -> List[Tuple[Event, Event]]:
+        """Pares de eventos solapados, en orden de inicio"""
+        pairs = []
+        active = []  # montículo de (fin, clave) de los eventos en curso
+        for start, end, key in self._intervals:
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            for _, other_key in active:
+                pairs.append((self._events[other_key], self._events[key]))
+            heapq.heappush(active, (end, key))
+        return pairs
+
+    def clusters(self) -> List[List[Event]]:
+        """Grupos de eventos encadenados por solapamientos (dos o más eventos)"""
+        clusters = []
+        current = []
+        current_end = None
+        for start, end, key in self._intervals:
+            if current and start < current_end:
+                current.append(self._events[key])
+                current_end = max(current_end, end)
+                continue
+            if len(current) > 1:
+                clusters.append(current)
+            current = [self._events[key]]
+            current_end = end
+        if len(current) > 1:
+            clusters.append(current)
+        return clusters
+
+    def conflicting_keys(self) -> Set[str]:
+        """Claves de todos los eventos que tienen algún conflicto"""
+        return {event_key(e) for cluster in self.clusters() for e in cluster}
+
+    @staticmethod
+    def _interval(key, event: Event) -> Tuple[float, float, str]:
+        return (event.start_datetime.timestamp(), event.end_datetime.timestamp(), key)
+
+def describe_conflicts(detector: ConflictDetector, limit: int = 20) -> str:
+    """Resumen de conflictos en texto para los prompts"""
+    clusters = detector.clusters()
+    if not clusters:
+        return "Sin conflictos de horario."
+    lines = [f"{len(clusters)} grupos de eventos solapados:"]
+    for cluster in clusters[:limit]:
+        day = cluster[0].start_datetime.strftime('%Y-%m-%d')
+        items = ", ".join(
+            f"{e.title or 'Sin título'} {e.start_datetime.strftime('%H:%M')}-{e.end_datetime.strftime('%H:%M')}"
+            for e in cluster
+        )
+        lines.append(f"- {day}: {items}")
+    if len(clusters) > limit:
+        lines.append(f"- ... y {len(clusters) - limit} grupos más")
+    return "\n".join(lines)
@@ -1,6 +1,7 @@
 import sqlite3
 from pathlib import Path
 from utils.logger import logger
+from utils.metrics import metrics
 import os
 
 # Update the path to calendar.db in the root data folder
@@ -41,9 +42,60 @@ class DatabaseManager:
                 )
             """)
             
+            # Caché de respuestas de la IA
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ai_response_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ai_response_cache_access
+                ON ai_response_cache (last_access)
+            """)
+            
+            # Agregados diarios para el análisis mensual incremental
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS analysis_day_aggregates (
+                    day TEXT PRIMARY KEY,
+                    month TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    events INTEGER NOT NULL,
+                    busy_minutes INTEGER NOT NULL,
+                    first_start TEXT,
+                    last_end TEXT,
+                    top_titles TEXT,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_analysis_day_aggregates_month
+                ON analysis_day_aggregates (month)
+            """)
+            
+            # Evento de análisis creado en Google Calendar para cada mes
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS analysis_events (
+                    month TEXT PRIMARY KEY,
+                    event_id TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            
+            # Última sincronización de los agregados de cada mes con el calendario
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS analysis_months (
+                    month TEXT PRIMARY KEY,
+                    synced_at REAL NOT NULL
+                )
+            """)
+            
             conn.commit()
             logger.info("Database initialized successfully")
 
+    @metrics.timed('db.execute_query')
     def execute_query(self, query: str, params: tuple = None) -> list:
         """Ejecuta una consulta y retorna los resultados"""
         with sqlite3.connect(str(self.db_path)) as conn:
@@ -55,6 +107,7 @@ class DatabaseManager:
                 cursor.execute(query)
             return cursor.fetchall()
 
+    @metrics.timed('db.execute_update')
     def execute_update(self, query: str, params: tuple = None):
         """Ejecuta una actualización en la base de datos"""
         with sqlite3.connect(str(self.db_path)) as conn:
@@ -63,4 +116,11 @@ class DatabaseManager:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
-            conn.commit() 
\ No newline at end of file
+            conn.commit()
+
+    @metrics.timed('db.execute_many')
+    def execute_many(self, query: str, params_list: list):
+        """Ejecuta la misma actualización para varias filas en una transacción"""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            conn.executemany(query, params_list)
+            conn.commit()
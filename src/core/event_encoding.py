@@ -0,0 +1,80 @@
+from collections import Counter, OrderedDict
+import hashlib
+from typing import Iterable
+from models.event import Event
+
+LEGEND = (
+    "Formato: fecha (eventos, horas ocupadas): evento; evento...\n"
+    "Evento = título o alias Tn, hora de inicio HH:MM o +m (minutos desde el "
+    "inicio del evento anterior del día), /duración en minutos; "
+    "'todo el día' = evento de día completo."
+)
+
+def _minutes(delta) -> int:
+    return int(delta.total_seconds() // 60)
+
+def encode_events_compact(events: Iterable[Event]) -> str:
+    """Codifica eventos para prompts: títulos agrupados, horas en delta y carga por día"""
+    events = sorted(
+        (e for e in events if e.start_datetime and e.end_datetime),
+        key=lambda e: e.start_datetime
+    )
+    if not events:
+        return "Sin eventos."
+
+    # Títulos repetidos -> alias cortos, ordenados por frecuencia
+    counts = Counter(e.title or '' for e in events)
+    aliases = {}
+    for title, count in counts.most_common():
+        if count > 1:
+            aliases[title] = f"T{len(aliases) + 1}"
+
+    days = OrderedDict()
+    for event in events:
+        days.setdefault(event.start_datetime.date(), []).append(event)
+
+    total_minutes = 0
+    day_lines = []
+    for day, day_events in days.items():
+        items = []
+        busy_minutes = 0
+        previous_start = None
+        for event in day_events:
+            label = aliases.get(event.title or '', event.title or 'Sin título')
+            if event.is_all_day():
+                items.append(f"{label} todo el día")
+                continue
+            duration = _minutes(event.end_datetime - event.start_datetime)
+            busy_minutes += duration
+            if previous_start is None:
+                start = event.start_datetime.strftime('%H:%M')
+            else:
+                start = f"+{_minutes(event.start_datetime - previous_start)}"
+            previous_start = event.start_datetime
+            items.append(f"{label} {start}/{duration}")
+        total_minutes += busy_minutes
+        day_lines.append(
+            f"{day.isoformat()} ({len(day_events)}, {busy_minutes / 60:.1f}h): " + "; ".join(items)
+        )
+
+    lines = [
+        LEGEND,
+        f"Total: {len(events)} eventos en {len(days)} días, {total_minutes / 60:.1f}h ocupadas.",
+    ]
+    if aliases:
+        lines.append("Títulos recurrentes:")
+        lines.extend(f"{alias} = {title} (x{counts[title]})" for title, alias in aliases.items())
+    lines.append("Días:")
+    lines.extend(day_lines)
+    return "\n".join(lines)
+
+def fingerprint_events(events: Iterable[Event]) -> str:
+    """Huella del conjunto de eventos: cambia si se añade, quita o modifica alguno"""
+    digest = hashlib.sha256()
+    for key in sorted(
+        f"{e.google_event_id}|{e.title}|{e.start_datetime}|{e.end_datetime}|{e.description or ''}"
+        for e in events
+    ):
+        digest.update(key.encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
@@ -0,0 +1,136 @@
+import bisect
+import os
+from datetime import datetime, time, timedelta, tzinfo
+from typing import Iterable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from models.event import Event
+from core.conflict_detector import blocks_time
+from config.constants import WORKING_HOURS_START, WORKING_HOURS_END, WORKING_DAYS, CALENDAR_TIMEZONE
+from utils.logger import logger
+
+Slot = Tuple[datetime, datetime]
+
+def local_timezone() -> tzinfo:
+    """Zona horaria con reglas de cambio de horario (ZoneInfo) para la jornada laboral.
+
+    Usa CALENDAR_TIMEZONE, la variable TZ o el enlace /etc/localtime; si no
+    se puede determinar, el desfase actual del sistema (fijo).
+    """
+    name = CALENDAR_TIMEZONE or os.environ.get('TZ', '').lstrip(':')
+    if not name and os.path.islink('/etc/localtime'):
+        path = os.path.realpath('/etc/localtime')
+        if 'zoneinfo' + os.sep in path:
+            name = path.split('zoneinfo' + os.sep, 1)[1]
+    if name:
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            logger.warning(f"Zona horaria desconocida: {name}")
+    return datetime.now().astimezone().tzinfo
+
+class FreeBusyIndex:
+    """Intervalos ocupados fusionados y ordenados para consultar disponibilidad.
+
+    Se guardan como dos listas paralelas de timestamps (inicios y fines) sin
+    solapamientos, así cada consulta es una búsqueda binaria más un recorrido
+    por los huecos del rango pedido.
+    """
+
+    def __init__(self, events: Iterable[Event] = ()):
+        self._starts: List[float] = []
+        self._ends: List[float] = []
+        self.set_events(events)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def set_events(self, events: Iterable[Event]):
+        """Reconstruye el índice a partir de eventos de uno o varios calendarios"""
+        intervals = sorted(
+            (e.start_datetime.timestamp(), e.end_datetime.timestamp())
+            for e in events if blocks_time(e)
+        )
+        self._starts, self._ends = [], []
+        for start, end in intervals:
+            if self._ends and start <= self._ends[-1]:
+                self._ends[-1] = max(self._ends[-1], end)
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+
+    def add_busy(self, start: datetime, end: datetime):
+        """Marca un intervalo como ocupado fusionándolo con los vecinos"""
+        start, end = start.timestamp(), end.timestamp()
+        # Intervalos que tocan [start, end]: desde el primero que acaba después de start
+        low = bisect.bisect_left(self._ends, start)
+        high = bisect.bisect_right(self._starts, end)
+        if low < high:
+            start = min(start, self._starts[low])
+            end = max(end, self._ends[high - 1])
+        self._starts[low:high] = [start]
+        self._ends[low:high] = [end]
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        """True si ningún intervalo ocupado se cruza con [start, end)"""
+        start, end = start.timestamp(), end.timestamp()
+        index = bisect.bisect_right(self._ends, start)
+        return index == len(self._starts) or self._starts[index] >= end
+
+    def free_between(self, start: datetime, end: datetime, min_duration: timedelta) -> List[Slot]:
+        """Huecos de al menos `min_duration` dentro de [start, end)"""
+        tz = start.tzinfo
+        window_start, window_end = start.timestamp(), end.timestamp()
+        min_seconds = min_duration.total_seconds()
+        slots = []
+        cursor = window_start
+        # Primer intervalo ocupado que termina después del inicio de la ventana
+        index = bisect.bisect_right(self._ends, window_start)
+        while cursor < window_end:
+            busy_start = self._starts[index] if index < len(self._starts) else window_end
+            gap_end = min(busy_start, window_end)
+            if gap_end - cursor >= min_seconds:
+                slots.append((datetime.fromtimestamp(cursor, tz), datetime.fromtimestamp(gap_end, tz)))
+            if index >= len(self._starts):
+                break
+            cursor = max(cursor, self._ends[index])
+            index += 1
+        return slots
+
+    def find_free_slots(self, range_start: datetime, range_end: datetime, min_duration: timedelta,
+                        work_start: time = time(WORKING_HOURS_START),
+                        work_end: time = time(WORKING_HOURS_END),
+                        weekdays: Sequence[int] = WORKING_DAYS,
+                        tz: Optional[tzinfo] = None,
+                        limit: Optional[int] = None) -> List[Slot]:
+        """Huecos libres dentro de la jornada laboral entre dos fechas.
+
+        Las horas de la jornada se interpretan en `tz` (por defecto
+        local_timezone(), que respeta los cambios de horario).
+        """
+        tz = tz or local_timezone()
+        range_start = range_start.astimezone(tz)
+        range_end = range_end.astimezone(tz)
+        slots = []
+        day = range_start.date()
+        while day <= range_end.date():
+            if day.weekday() in weekdays:
+                window_start = max(datetime.combine(day, work_start, tz), range_start)
+                window_end = min(datetime.combine(day, work_end, tz), range_end)
+                if window_start < window_end:
+                    slots.extend(self.free_between(window_start, window_end, min_duration))
+                    if limit is not None and len(slots) >= limit:
+                        return slots[:limit]
+            day += timedelta(days=1)
+        return slots
+
+def describe_free_slots(slots: List[Slot], limit: int = 15) -> str:
+    """Resumen de huecos libres en texto para los prompts"""
+    if not slots:
+        return "Sin huecos libres en la jornada laboral."
+    lines = []
+    for start, end in slots[:limit]:
+        minutes = int((end - start).total_seconds() // 60)
+        lines.append(f"- {start.strftime('%Y-%m-%d %H:%M')}-{end.strftime('%H:%M')} ({minutes} min)")
+    if len(slots) > limit:
+        lines.append(f"- ... y {len(slots) - limit} huecos más")
+    return "\n".join(lines)
@@ -1,24 +1,74 @@
-import requests
 import json
 import logging
-from core.ai_assistant import AIAssistant  # Importar AIAssistant para acceder a la configuración
+import re
+import unicodedata
+from typing import Tuple
 from config.constants import OPENROUTER_API_KEY, APP_NAME
+from core import http_client
+from core.functions import FUNCTIONS, FUNCTION_PATTERNS, describe_functions
 
 logger = logging.getLogger(__name__)
 
+def _normalize(text: str) -> str:
+    """Pasa a minúsculas y elimina acentos"""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
 class FunctionIdentifier:
+    # Por encima se decide localmente; por debajo de LOW_CONFIDENCE no hay función
+    HIGH_CONFIDENCE = 0.8
+    LOW_CONFIDENCE = 0.3
+
     def __init__(self):
         self.api_url = "https://openrouter.ai/api/v1/chat/completions"
         self.api_key = OPENROUTER_API_KEY
+        self._rules = self._compile_rules()
+
+    def _compile_rules(self):
+        """Compila patrones y palabras clave de cada función registrada"""
+        rules = []
+        for function_id in FUNCTIONS:
+            patterns = [re.compile(pattern) for pattern in FUNCTION_PATTERNS.get(function_id, [])]
+            keywords = frozenset(_normalize(function_id).split('_'))
+            rules.append((function_id, patterns, keywords))
+        return rules
+
+    def route(self, message: str) -> Tuple[str, float]:
+        """Clasifica el mensaje localmente y devuelve (función, confianza)"""
+        text = _normalize(message)
+        words = set(re.findall(r'\w+', text))
+        best_id, best_score = "none", 0.0
+
+        for function_id, patterns, keywords in self._rules:
+            if any(pattern.search(text) for pattern in patterns):
+                score = 0.9
+            else:
+                # Coincidencia parcial con el nombre de la función
+                score = 0.6 * len(keywords & words) / len(keywords)
+            if score > best_score:
+                best_id, best_score = function_id, score
+
+        return best_id, best_score
 
     def identify_function(self, message: str) -> str:
         """Identifica si el mensaje solicita una función específica."""
+        function_id, confidence = self.route(message)
+        if confidence >= self.HIGH_CONFIDENCE:
+            logger.info("Función identificada localmente: %s (%.2f)", function_id, confidence)
+            return function_id
+        if confidence < self.LOW_CONFIDENCE:
+            return "none"
+
+        # Caso dudoso: consultar al modelo
+        return self._identify_remote(message)
+
+    def _identify_remote(self, message: str) -> str:
+        """Pide al modelo que identifique la función"""
         prompt = f"""
         Eres una IA enfocada en identificar funciones en el mensaje del usuario. 
         El mensaje es: "{message}"
         Las funciones disponibles son:
-        - codigo_morse: traduce el mensaje a código Morse
-        - otra_funcion: descripción de otra función
+{describe_functions()}
         Asegúrate de devolver solo la ID de la función en minúsculas, o 'none' si no hay función.
         """
 
@@ -33,12 +83,12 @@ class FunctionIdentifier:
         }
 
         try:
-            response = requests.post(self.api_url, headers=headers, data=json.dumps(data))
+            response = http_client.post(self.api_url, headers=headers, data=json.dumps(data))
             response.raise_for_status()
             response_data = response.json()
             function_id = response_data['choices'][0]['message']['content'].strip()
             logger.info("Función identificada: %s", function_id)
-            return function_id
+            return function_id if function_id in FUNCTIONS else "none"
         except Exception as e:
             logger.error("Error al identificar la función: %s", str(e))
-            return "none" 
\ No newline at end of file
+            return "none"
@@ -10,4 +10,30 @@ def codigo_morse(message: str) -> str:
         '4': '....-', '5': '.....', '6': '-....', '7': '--...', 
         '8': '---..', '9': '----.', '0': '-----', ' ': '/'
     }
-    return ' '.join(morse_code_dict.get(char.upper(), '') for char in message) 
\ No newline at end of file
+    return ' '.join(morse_code_dict.get(char.upper(), '') for char in message)
+
+# Funciones que el chat puede ejecutar localmente, por ID
+FUNCTIONS = {
+    'codigo_morse': codigo_morse,
+}
+
+# Expresiones (sobre texto en minúsculas y sin acentos) que activan cada
+# función directamente, sin consultar al modelo. Deben pedir la acción con un
+# imperativo y un destino ("pásalo a morse"); una simple mención ("¿quién
+# inventó el código morse?", "el lunes pasado aprendí morse") queda en la zona dudosa
+FUNCTION_PATTERNS = {
+    'codigo_morse': [r'\b(traduce|pasa|convierte|codifica)(me)?(lo|la|los|las)?\b.*\b(a|en)\s+(c[oó]digo\s+)?morse\b'],
+}
+
+def describe_functions() -> str:
+    """Lista las funciones disponibles en formato '- id: descripción'"""
+    return '\n'.join(
+        f"- {function_id}: {func.__doc__.strip().rstrip('.')}"
+        for function_id, func in FUNCTIONS.items()
+    )
+
+def execute_function(function_id: str, message: str) -> str:
+    """Ejecuta la función indicada sobre el mensaje del usuario"""
+    if function_id not in FUNCTIONS:
+        raise KeyError(f"Función no reconocida: {function_id}")
+    return FUNCTIONS[function_id](message)
@@ -7,6 +7,7 @@ import pickle
 from utils.logger import logger
 from utils.helpers import get_app_directory
 from .auth_server import start_success_page
+from .google_services import get_service, clear_services
 
 SCOPES = [
     'https://www.googleapis.com/auth/calendar',
@@ -116,6 +117,7 @@ class GoogleAuthManager:
             
             # Limpiar credenciales en memoria
             self.credentials = None
+            clear_services()
             logger.info("Credenciales limpiadas exitosamente")
             
         except Exception as e:
@@ -132,9 +134,8 @@ class GoogleAuthManager:
             if not self.credentials:
                 return {}
             
-            # Crear servicio de OAuth2
-            from googleapiclient.discovery import build
-            oauth2_service = build('oauth2', 'v2', credentials=self.credentials)
+            # Reutilizar el servicio de OAuth2 compartido
+            oauth2_service = get_service('oauth2', 'v2', self.credentials)
             
             # Obtener información del usuario
             user_info = oauth2_service.userinfo().get().execute()
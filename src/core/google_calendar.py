@@ -1,10 +1,14 @@
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from utils.logger import logger
+from utils.metrics import metrics
+from utils.tracing import tracer
 from models.event import Event
 from .google_auth import GoogleAuthManager
+from .google_services import get_service
+from .recurrence import RecurrenceExpander
+from config.settings import Settings
 import os
 import json
 
@@ -12,13 +16,17 @@ class GoogleCalendarManager:
     def __init__(self, auth_manager: GoogleAuthManager):
         self.auth_manager = auth_manager
         self.service = None
+        self.settings = Settings()
+        self.recurrence_expander = RecurrenceExpander(fetch_instances=self._fetch_instances)
         self._initialize_service()
 
     def _initialize_service(self):
         """Initialize the Google Calendar service"""
         credentials = self.auth_manager.get_credentials()
-        self.service = build('calendar', 'v3', credentials=credentials)
+        self.service = get_service('calendar', 'v3', credentials)
 
+    @metrics.timed('calendar.get_events')
+    @tracer.traced('calendar.get_events')
     def get_events(self, start_date: datetime = None, end_date: datetime = None, log_raw=True) -> List[Event]:
         """Get events between dates"""
         try:
@@ -42,19 +50,20 @@ class GoogleCalendarManager:
                 start_date = month_start
                 end_date = next_month
             
-            events_result = self.service.events().list(
-                calendarId='primary',
-                timeMin=start_date.isoformat(),
-                timeMax=end_date.isoformat(),
-                singleEvents=True,
-                orderBy='startTime',
-                maxResults=2500  # Aumentar límite para obtener más eventos
-            ).execute()
+            converted = None
+            if self.settings.expand_recurrence_locally:
+                events, converted = self._list_expanded(start_date, end_date)
+            else:
+                with tracer.span('google.events.list', cat='http'):
+                    events = self._list_items(
+                        timeMin=start_date.isoformat(),
+                        timeMax=end_date.isoformat(),
+                        singleEvents=True,
+                        orderBy='startTime'
+                    )
             
             if log_raw:  # Solo loggear si se solicita
-                self._log_raw_events(events_result.get('items', []))
-            
-            events = events_result.get('items', [])
+                self._log_raw_events(events)
             
             # Guardar eventos raw solo si es una carga inicial
             if not start_date and not end_date:
@@ -62,12 +71,70 @@ class GoogleCalendarManager:
                     json.dump(events, f, indent=2)
                 logger.info("Raw events logged to logs/raw_events.json")
 
-            return [self._convert_to_event(event) for event in events]
+            metrics.counter('calendar.events_fetched').inc(len(events))
+            if converted is not None:
+                return converted
+            with tracer.span('calendar.convert_events', count=len(events)):
+                return [self._convert_to_event(event) for event in events]
             
         except HttpError as error:
             logger.error(f'Error fetching events: {error}')
             return []
 
+    def _list_expanded(self, start_date: datetime, end_date: datetime) -> Tuple[List[Dict], List[Event]]:
+        """Pide solo las series maestras y expande sus instancias en local.
+
+        Devuelve los items y sus Event en el mismo orden; cada item se convierte una sola vez.
+        """
+        with tracer.span('google.events.list', cat='http', single_events=False):
+            masters = self._list_items(
+                timeMin=start_date.isoformat(),
+                timeMax=end_date.isoformat(),
+                singleEvents=False
+            )
+        with tracer.span('calendar.expand_recurrence'):
+            items = self.recurrence_expander.expand(masters, start_date, end_date)
+        with tracer.span('calendar.convert_events', count=len(items)):
+            pairs = [(item, self._convert_to_event(item)) for item in items]
+        # Sin orderBy=startTime (no se admite con singleEvents=False): ordenar aquí
+        pairs.sort(key=lambda pair: pair[1].start_datetime)
+        return [item for item, _ in pairs], [event for _, event in pairs]
+
+    def get_changed_event_ids(self, start_date: datetime, end_date: datetime, updated_min: datetime) -> List[str]:
+        """Ids de los eventos del rango creados, modificados o borrados desde `updated_min`"""
+        with tracer.span('google.events.list', cat='http', updated_min=True):
+            items = self._list_items(
+                timeMin=start_date.isoformat(),
+                timeMax=end_date.isoformat(),
+                updatedMin=updated_min.isoformat(),
+                showDeleted=True,
+                singleEvents=True
+            )
+        return [item['id'] for item in items]
+
+    def _list_items(self, **params) -> List[Dict]:
+        """events().list siguiendo nextPageToken: con más de 2500 eventos hay varias páginas"""
+        items = []
+        page_token = None
+        while True:
+            result = self.service.events().list(
+                calendarId='primary', maxResults=2500, pageToken=page_token, **params
+            ).execute()
+            items.extend(result.get('items', []))
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                return items
+
+    def _fetch_instances(self, master: Dict, start_date: datetime, end_date: datetime) -> List[Dict]:
+        """Instancias de una serie cuya regla no se evalúa en local"""
+        return self.service.events().instances(
+            calendarId='primary',
+            eventId=master['id'],
+            timeMin=start_date.isoformat(),
+            timeMax=end_date.isoformat(),
+            maxResults=2500
+        ).execute().get('items', [])
+
     def _log_raw_events(self, events: List[Dict]):
         """Log eventos en formato raw para debugging"""
         try:
@@ -123,6 +190,7 @@ class GoogleCalendarManager:
             logger.error(f"Error eliminando evento: {str(e)}")
             raise
 
+    @metrics.timed('calendar.convert_event')
     def _convert_to_event(self, google_event: Dict[str, Any]) -> Event:
         """Convert Google Calendar event to our Event model"""
         event = Event()
@@ -0,0 +1,66 @@
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+import threading
+import json
+from utils.logger import logger
+from config.constants import GOOGLE_CALENDAR_ENDPOINT
+
+# Documentos de discovery ya parseados, por (api, versión)
+_discovery_docs = {}
+# Servicios construidos, por (api, versión, credenciales)
+_services = {}
+# URL base alternativa por api (None: la de Google)
+_endpoints = {'calendar': GOOGLE_CALENDAR_ENDPOINT}
+_lock = threading.Lock()
+
+def get_discovery_document(api_name: str, version: str) -> dict:
+    """Obtiene el documento de discovery, parseándolo una sola vez"""
+    key = (api_name, version)
+    with _lock:
+        document = _discovery_docs.get(key)
+        if document is None:
+            # Usar la copia estática que incluye google-api-python-client
+            content = get_static_doc(api_name, version)
+            if content is None:
+                return None
+            document = json.loads(content)
+            _discovery_docs[key] = document
+            logger.debug(f"Documento de discovery cargado: {api_name} {version}")
+        return document
+
+def get_service(api_name: str, version: str, credentials):
+    """Devuelve el servicio de Google compartido para estas credenciales"""
+    key = (api_name, version, id(credentials))
+    with _lock:
+        cached = _services.get(key)
+        # Comparar identidad para no reutilizar un id() reciclado
+        if cached and cached[0] is credentials:
+            return cached[1]
+
+    endpoint = _endpoints.get(api_name)
+    client_options = {'api_endpoint': endpoint} if endpoint else None
+    document = get_discovery_document(api_name, version)
+    if document is not None:
+        service = build_from_document(document, credentials=credentials, client_options=client_options)
+    else:
+        logger.warning(f"Sin documento estático para {api_name} {version}, usando discovery remoto")
+        service = build(api_name, version, credentials=credentials, cache_discovery=False,
+                        client_options=client_options)
+
+    with _lock:
+        _services[key] = (credentials, service)
+    logger.info(f"Servicio {api_name} {version} construido" + (f" contra {endpoint}" if endpoint else ""))
+    return service
+
+def set_api_endpoint(api_name: str, endpoint: str = None):
+    """Cambia la URL base de una api (incluida la ruta, p. ej. '.../calendar/v3/'); None vuelve a la de Google"""
+    with _lock:
+        _endpoints[api_name] = endpoint
+        # Los servicios ya construidos apuntan a la URL anterior
+        for key in [key for key in _services if key[0] == api_name]:
+            del _services[key]
+
+def clear_services():
+    """Descarta los servicios construidos (p. ej. al cerrar sesión)"""
+    with _lock:
+        _services.clear()
@@ -0,0 +1,126 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import threading
+from urllib.parse import urlsplit
+from config.constants import (
+    HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_MAX_RETRIES
+)
+from utils.logger import logger
+from utils.tracing import tracer
+from .cancellation import CancellationToken
+
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+_session = None
+_lock = threading.Lock()
+# Hilos para peticiones cancelables; cada una sigue limitada por su timeout
+_executor = ThreadPoolExecutor(max_workers=HTTP_POOL_SIZE, thread_name_prefix='http')
+
+def _create_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """Crea una sesión con pool de conexiones y keep-alive"""
+    session = requests.Session()
+    # Reintentar solo fallos de conexión: un POST ya enviado no se repite
+    retries = Retry(total=HTTP_MAX_RETRIES, connect=HTTP_MAX_RETRIES, read=0, status=0)
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retries
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+def get_session() -> requests.Session:
+    """Devuelve la sesión HTTP compartida por todas las llamadas salientes"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _create_session()
+                logger.info(f"Sesión HTTP creada (pool={HTTP_POOL_SIZE})")
+    return _session
+
+def close_session():
+    """Cierra la sesión compartida y sus conexiones abiertas"""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def request(method: str, url: str, cancel_token: CancellationToken = None, **kwargs) -> requests.Response:
+    """Realiza una petición con la sesión compartida y timeout por defecto.
+
+    Con `cancel_token` la espera se puede abortar: la petición corre en un
+    hilo aparte y la llamada lanza OperationCancelled en cuanto el token se
+    cancela o vence su plazo, sin esperar a la red.
+    """
+    # Sin query string en la traza: puede llevar claves o datos del usuario
+    parts = urlsplit(url)
+    with tracer.span('http.request', cat='http', method=method, url=f"{parts.netloc}{parts.path}") as span:
+        response = _request(method, url, cancel_token, **kwargs)
+        span.set(status=response.status_code)
+        return response
+
+def _request(method: str, url: str, cancel_token: CancellationToken, **kwargs) -> requests.Response:
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    if cancel_token is None:
+        return get_session().request(method, url, **kwargs)
+
+    cancel_token.raise_if_cancelled()
+    remaining = cancel_token.remaining()
+    if remaining is not None:
+        # El hilo de la petición tampoco debe sobrevivir al plazo
+        # timeout=None (o None en la tupla) significa sin límite: queda el plazo
+        connect, read = kwargs['timeout'] if isinstance(kwargs['timeout'], tuple) else (kwargs['timeout'],) * 2
+        kwargs['timeout'] = tuple(remaining if value is None else min(value, remaining) for value in (connect, read))
+
+    future = _executor.submit(get_session().request, method, url, **kwargs)
+    while True:
+        try:
+            return future.result(timeout=0.05)
+        except requests.RequestException:
+            # El timeout recortado al plazo vence a la vez que el token
+            cancel_token.raise_if_cancelled()
+            raise
+        except FutureTimeout:
+            if cancel_token.is_cancelled:
+                # Liberar la conexión si la respuesta llega más tarde
+                future.add_done_callback(_close_abandoned)
+                logger.info(f"Petición {method} {url} abortada")
+                cancel_token.raise_if_cancelled()
+
+def _close_abandoned(future):
+    """Cierra la respuesta de una petición que ya nadie espera"""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request('GET', url, **kwargs)
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request('POST', url, **kwargs)
+
+def iter_sse_data(response: requests.Response):
+    """Itera los campos 'data' de una respuesta server-sent events a medida que llegan"""
+    data_lines = []
+    # chunk_size=None entrega los bytes según llegan, sin esperar a llenar un bloque
+    for raw_line in response.iter_lines(chunk_size=None):
+        line = raw_line.decode('utf-8')
+        if not line:
+            # Línea vacía: fin del evento
+            if data_lines:
+                yield '\n'.join(data_lines)
+                data_lines = []
+            continue
+        if line.startswith(':'):
+            # Comentario / keep-alive del servidor
+            continue
+        field, _, value = line.partition(':')
+        if field == 'data':
+            data_lines.append(value[1:] if value.startswith(' ') else value)
+    if data_lines:
+        yield '\n'.join(data_lines)
@@ -0,0 +1,87 @@
+import math
+from typing import List, Dict, Optional
+from config.constants import AI_PROMPT_TOKEN_BUDGET, AI_HISTORY_SUMMARY_TOKENS
+from utils.logger import logger
+
+# Coste fijo aproximado por mensaje (rol y separadores del formato de chat)
+MESSAGE_OVERHEAD_TOKENS = 4
+# Caracteres por token: aproximación habitual para texto en español/inglés
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    """Estima los tokens de un texto sin tokenizador"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+def estimate_message_tokens(message: Dict[str, str]) -> int:
+    """Estima los tokens de un mensaje de chat"""
+    return estimate_tokens(message.get('content', '')) + MESSAGE_OVERHEAD_TOKENS
+
+class PromptBuilder:
+    """Arma la lista de mensajes respetando un presupuesto de tokens.
+
+    Los turnos más recientes se envían completos; los que no caben se
+    resumen en un mensaje de sistema corto o se descartan.
+    """
+
+    def __init__(self, token_budget: int = AI_PROMPT_TOKEN_BUDGET,
+                 summary_tokens: int = AI_HISTORY_SUMMARY_TOKENS):
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+
+    def build(self, system_message: Dict[str, str], history: List[Dict[str, str]],
+              user_message: Dict[str, str]) -> List[Dict[str, str]]:
+        """Devuelve [sistema, (resumen), historial reciente..., usuario]"""
+        remaining = self.token_budget - estimate_message_tokens(system_message) - estimate_message_tokens(user_message)
+        if remaining <= 0:
+            logger.warning("El mensaje actual supera el presupuesto de tokens; se envía sin historial")
+            return [system_message, user_message]
+
+        # Reservar espacio para el resumen solo si algo queda fuera
+        history_tokens = sum(estimate_message_tokens(m) for m in history)
+        if history_tokens > remaining:
+            remaining -= min(self.summary_tokens, remaining // 2)
+
+        recent = []
+        for message in reversed(history):
+            cost = estimate_message_tokens(message)
+            if cost > remaining:
+                break
+            recent.append(message)
+            remaining -= cost
+        recent.reverse()
+
+        older = history[:len(history) - len(recent)]
+        messages = [system_message]
+        if older:
+            summary = self._summarize(older)
+            if summary:
+                messages.append(summary)
+            logger.debug(f"Historial recortado: {len(older)} mensajes resumidos, {len(recent)} completos")
+        return messages + recent + [user_message]
+
+    def _summarize(self, messages: List[Dict[str, str]]) -> Optional[Dict[str, str]]:
+        """Resume turnos antiguos quedándose con el inicio de cada mensaje"""
+        header = "Resumen de la conversación anterior:"
+        budget_chars = self.summary_tokens * CHARS_PER_TOKEN - len(header)
+        if budget_chars <= 0:
+            return None
+
+        # Repartir el espacio entre los turnos, priorizando los más recientes
+        per_message = max(40, budget_chars // len(messages))
+        lines = []
+        used = 0
+        for message in reversed(messages):
+            role = "USER" if message['role'] == 'user' else "IA"
+            content = ' '.join(message.get('content', '').split())
+            if len(content) > per_message:
+                content = content[:per_message - 1] + "…"
+            line = f"- {role}: {content}"
+            if used + len(line) + 1 > budget_chars:
+                break
+            lines.append(line)
+            used += len(line) + 1
+
+        if not lines:
+            return None
+        lines.reverse()
+        return {"role": "system", "content": header + "\n" + "\n".join(lines)}
@@ -0,0 +1,311 @@
+import calendar
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable, Iterator, List, Optional, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from utils.logger import logger
+
+WEEKDAY_CODES = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+SUPPORTED_FREQS = ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')
+SUPPORTED_PARTS = {'FREQ', 'INTERVAL', 'COUNT', 'UNTIL', 'BYDAY', 'BYMONTHDAY', 'BYMONTH', 'WKST'}
+# Límite de periodos recorridos por serie, por si una regla no termina
+MAX_PERIODS = 20000
+
+class UnsupportedRule(ValueError):
+    """La regla usa partes de RFC 5545 que no se evalúan en local"""
+
+def _parse_until(value: str) -> Union[date, datetime]:
+    """Fecha o fecha-hora en formato básico de iCalendar (sin strptime, que es lento)"""
+    day = date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+    if 'T' not in value:
+        return day
+    moment = datetime(day.year, day.month, day.day, int(value[9:11]), int(value[11:13]), int(value[13:15]))
+    if value.endswith('Z'):
+        return moment.replace(tzinfo=timezone.utc)
+    # Hora flotante: se interpreta en la zona de la serie al comparar
+    return moment
+
+class RecurrenceRule:
+    """Subconjunto de RRULE: DAILY/WEEKLY/MONTHLY/YEARLY con INTERVAL, COUNT,
+    UNTIL, BYDAY, BYMONTHDAY y BYMONTH"""
+
+    def __init__(self, text: str):
+        if text.upper().startswith('RRULE:'):
+            text = text[6:]
+        parts = dict(part.split('=', 1) for part in text.strip().upper().split(';') if part)
+        unsupported = set(parts) - SUPPORTED_PARTS
+        if unsupported:
+            raise UnsupportedRule(f"Partes no soportadas: {', '.join(sorted(unsupported))}")
+
+        self.freq = parts.get('FREQ')
+        if self.freq not in SUPPORTED_FREQS:
+            raise UnsupportedRule(f"Frecuencia no soportada: {self.freq}")
+        self.interval = int(parts.get('INTERVAL', 1))
+        self.count = int(parts['COUNT']) if 'COUNT' in parts else None
+        self.until = _parse_until(parts['UNTIL']) if 'UNTIL' in parts else None
+        self.bymonth = sorted(int(m) for m in parts['BYMONTH'].split(',')) if 'BYMONTH' in parts else None
+        self.bymonthday = [int(d) for d in parts['BYMONTHDAY'].split(',')] if 'BYMONTHDAY' in parts else None
+
+        # BYDAY: lista de (ordinal o None, día de la semana)
+        self.byday = None
+        if 'BYDAY' in parts:
+            self.byday = []
+            for item in parts['BYDAY'].split(','):
+                code = item[-2:]
+                if code not in WEEKDAY_CODES:
+                    raise UnsupportedRule(f"BYDAY inválido: {item}")
+                self.byday.append((int(item[:-2]) if item[:-2] else None, WEEKDAY_CODES[code]))
+
+        if any(ordinal for ordinal, _ in self.byday or ()):
+            if self.freq in ('DAILY', 'WEEKLY') or (self.freq == 'YEARLY' and not self.bymonth):
+                raise UnsupportedRule("BYDAY con ordinal solo se soporta por mes")
+        if parts.get('WKST', 'MO') != 'MO' and self.freq == 'WEEKLY' and self.interval > 1:
+            raise UnsupportedRule("WKST distinto de MO con INTERVAL > 1")
+
+    def _month_days(self, year: int, month: int, default_day: int) -> List[int]:
+        """Días del mes que cumplen BYMONTHDAY/BYDAY (o el día de inicio)"""
+        days_in_month = calendar.monthrange(year, month)[1]
+        candidates = None
+        if self.bymonthday:
+            candidates = {d if d > 0 else days_in_month + 1 + d for d in self.bymonthday}
+            candidates = {d for d in candidates if 1 <= d <= days_in_month}
+        if self.byday:
+            first_weekday = calendar.monthrange(year, month)[0]
+            by_weekday = set()
+            for ordinal, weekday in self.byday:
+                matches = list(range(1 + (weekday - first_weekday) % 7, days_in_month + 1, 7))
+                if ordinal is None:
+                    by_weekday.update(matches)
+                elif -len(matches) <= ordinal <= len(matches) and ordinal != 0:
+                    by_weekday.add(matches[ordinal - 1] if ordinal > 0 else matches[ordinal])
+            candidates = by_weekday if candidates is None else candidates & by_weekday
+        if candidates is None:
+            candidates = {default_day} if default_day <= days_in_month else set()
+        return sorted(candidates)
+
+    def iter_dates(self, first: date, skip_to: Optional[date] = None) -> Iterator[date]:
+        """Fechas de las ocurrencias en orden, desde `first`.
+
+        Sin COUNT se puede saltar directamente al periodo de `skip_to`.
+        """
+        skip = skip_to if skip_to and self.count is None and skip_to > first else None
+        weekdays = sorted({weekday for _, weekday in self.byday}) if self.byday else None
+
+        if self.freq == 'DAILY':
+            k = (skip - first).days // self.interval if skip else 0
+            for k in range(k, k + MAX_PERIODS):
+                day = first + timedelta(days=k * self.interval)
+                if (weekdays is None or day.weekday() in weekdays) and \
+                        (self.bymonth is None or day.month in self.bymonth):
+                    yield day
+
+        elif self.freq == 'WEEKLY':
+            week0 = first - timedelta(days=first.weekday())
+            k = (skip - week0).days // (7 * self.interval) if skip else 0
+            for k in range(k, k + MAX_PERIODS):
+                week = week0 + timedelta(weeks=k * self.interval)
+                for weekday in weekdays or [first.weekday()]:
+                    day = week + timedelta(days=weekday)
+                    if day >= first and (self.bymonth is None or day.month in self.bymonth):
+                        yield day
+
+        elif self.freq == 'MONTHLY':
+            month0 = first.year * 12 + first.month - 1
+            k = ((skip.year * 12 + skip.month - 1) - month0) // self.interval if skip else 0
+            for k in range(k, k + MAX_PERIODS):
+                year, month = divmod(month0 + k * self.interval, 12)
+                month += 1
+                if self.bymonth and month not in self.bymonth:
+                    continue
+                for day_number in self._month_days(year, month, first.day):
+                    day = date(year, month, day_number)
+                    if day >= first:
+                        yield day
+
+        else:  # YEARLY
+            k = (skip.year - first.year) // self.interval if skip else 0
+            for k in range(k, k + MAX_PERIODS):
+                year = first.year + k * self.interval
+                if year > 9999:
+                    return
+                for month in self.bymonth or [first.month]:
+                    for day_number in self._month_days(year, month, first.day):
+                        day = date(year, month, day_number)
+                        if day >= first:
+                            yield day
+
+    def occurrences(self, dtstart: Union[date, datetime], duration: timedelta,
+                    range_start: datetime, range_end: datetime,
+                    exdates: frozenset = frozenset()) -> List[Union[date, datetime]]:
+        """Inicios de las ocurrencias que se cruzan con [range_start, range_end).
+
+        `dtstart` es una fecha para series de día completo o un datetime con la
+        zona de la serie; la hora local se conserva en cada ocurrencia.
+        """
+        all_day = not isinstance(dtstart, datetime)
+        first = dtstart if all_day else dtstart.date()
+        if all_day:
+            low, high = range_start.date(), range_end.date()
+        else:
+            low, high = range_start, range_end
+        until = self.until
+        if isinstance(until, datetime) and until.tzinfo is None and not all_day:
+            until = until.replace(tzinfo=dtstart.tzinfo)
+
+        skip_to = range_start.date() - timedelta(days=duration.days + 1)
+        result = []
+        generated = 0
+        for day in self.iter_dates(first, skip_to):
+            start = day if all_day else datetime.combine(day, dtstart.timetz())
+            generated += 1
+            if self.count is not None and generated > self.count:
+                break
+            if until is not None:
+                if isinstance(until, datetime):
+                    if (datetime.combine(day, time(), until.tzinfo) if all_day else start) > until:
+                        break
+                elif day > until:
+                    break
+            if start >= high:
+                break
+            if start + duration > low and _exdate_key(start) not in exdates:
+                result.append(start)
+        return result
+
+def _occurrence_key(start: Union[date, datetime]) -> str:
+    """Clave de una ocurrencia (sufijo del id de instancia de Google)"""
+    if isinstance(start, datetime):
+        u = start.astimezone(timezone.utc)
+        return f"{u.year:04d}{u.month:02d}{u.day:02d}T{u.hour:02d}{u.minute:02d}{u.second:02d}Z"
+    return f"{start.year:04d}{start.month:02d}{start.day:02d}"
+
+def _exdate_key(start: Union[date, datetime]):
+    """Clave rápida para comparar con EXDATE: timestamp o fecha"""
+    return start.timestamp() if isinstance(start, datetime) else start
+
+def _zone(name: Optional[str], fallback):
+    if name:
+        try:
+            return ZoneInfo(name)
+        except ZoneInfoNotFoundError:
+            logger.warning(f"Zona horaria desconocida: {name}")
+    return fallback
+
+def _parse_google_time(value: dict) -> Union[date, datetime]:
+    """Convierte un start/end/originalStartTime de Google a date o datetime"""
+    if 'dateTime' in value:
+        moment = datetime.fromisoformat(value['dateTime'].replace('Z', '+00:00'))
+        return moment.astimezone(_zone(value.get('timeZone'), moment.tzinfo))
+    return date.fromisoformat(value['date'])
+
+def parse_exdates(lines: List[str], default_zone) -> frozenset:
+    """Fechas excluidas (timestamps o fechas) en las líneas EXDATE de una serie"""
+    keys = set()
+    for line in lines:
+        if not line.upper().startswith('EXDATE'):
+            continue
+        params, _, values = line.partition(':')
+        zone = default_zone
+        for param in params.split(';')[1:]:
+            name, _, value = param.partition('=')
+            if name.upper() == 'TZID':
+                zone = _zone(value, default_zone)
+        for value in values.split(','):
+            value = value.strip()
+            if not value:
+                continue
+            moment = _parse_until(value)
+            if isinstance(moment, datetime) and moment.tzinfo is None:
+                moment = moment.replace(tzinfo=zone or timezone.utc)
+            keys.add(_exdate_key(moment))
+    return frozenset(keys)
+
+class RecurrenceExpander:
+    """Expande series maestras de Google Calendar a instancias en un rango.
+
+    Las ocurrencias de cada serie se cachean por (id, updated, rango); las
+    excepciones (instancias movidas o canceladas) se aplican encima. Si una
+    regla no se puede evaluar en local se usa `fetch_instances`.
+    """
+
+    def __init__(self, fetch_instances: Callable[[dict, datetime, datetime], List[dict]] = None,
+                 max_cached: int = 256):
+        self.fetch_instances = fetch_instances
+        self.max_cached = max_cached
+        self._cache: OrderedDict = OrderedDict()
+
+    def clear(self):
+        self._cache.clear()
+
+    def expand(self, items: List[dict], range_start: datetime, range_end: datetime) -> List[dict]:
+        """Sustituye las series por sus instancias, como haría singleEvents=True"""
+        exceptions = {
+            (item['recurringEventId'], _occurrence_key(_parse_google_time(item['originalStartTime'])))
+            for item in items if item.get('recurringEventId') and item.get('originalStartTime')
+        }
+        result = [item for item in items if not item.get('recurrence') and item.get('status') != 'cancelled']
+
+        for master in items:
+            if not master.get('recurrence') or master.get('status') == 'cancelled':
+                continue
+            try:
+                instances = self._instances(master, range_start, range_end)
+            except UnsupportedRule as e:
+                if not self.fetch_instances:
+                    raise
+                logger.info(f"Serie {master.get('id')} expandida por la API: {str(e)}")
+                # La API ya aplica las excepciones de la serie
+                result = [item for item in result if item.get('recurringEventId') != master['id']]
+                result.extend(self.fetch_instances(master, range_start, range_end))
+                continue
+            # El id de cada instancia termina en su clave de ocurrencia
+            prefix = len(master['id']) + 1
+            result.extend(
+                instance for instance in instances
+                if (master['id'], instance['id'][prefix:]) not in exceptions
+            )
+        return result
+
+    def _instances(self, master: dict, range_start: datetime, range_end: datetime) -> List[dict]:
+        key = (master['id'], master.get('updated'), range_start.timestamp(), range_end.timestamp())
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        instances = self._build_instances(master, range_start, range_end)
+        self._cache[key] = instances
+        if len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return instances
+
+    def _build_instances(self, master: dict, range_start: datetime, range_end: datetime) -> List[dict]:
+        rules = [line for line in master['recurrence'] if line.upper().startswith('RRULE')]
+        if len(rules) != 1 or any(line.upper().startswith(('RDATE', 'EXRULE')) for line in master['recurrence']):
+            raise UnsupportedRule("Se necesita exactamente una RRULE y sin RDATE/EXRULE")
+        rule = RecurrenceRule(rules[0])
+
+        dtstart = _parse_google_time(master['start'])
+        duration = _parse_google_time(master['end']) - dtstart
+        all_day = not isinstance(dtstart, datetime)
+        exdates = parse_exdates(master['recurrence'], None if all_day else dtstart.tzinfo)
+        zone_name = master['start'].get('timeZone')
+
+        instances = []
+        for start in rule.occurrences(dtstart, duration, range_start, range_end, exdates):
+            end = start + duration
+            instance = {k: v for k, v in master.items() if k != 'recurrence'}
+            instance['id'] = f"{master['id']}_{_occurrence_key(start)}"
+            instance['recurringEventId'] = master['id']
+            if all_day:
+                instance['start'] = {'date': start.isoformat()}
+                instance['end'] = {'date': end.isoformat()}
+                instance['originalStartTime'] = {'date': start.isoformat()}
+            else:
+                instance['start'] = {'dateTime': start.isoformat()}
+                instance['end'] = {'dateTime': end.isoformat()}
+                if zone_name:
+                    instance['start']['timeZone'] = instance['end']['timeZone'] = zone_name
+                instance['originalStartTime'] = dict(instance['start'])
+            instances.append(instance)
+        return instances
@@ -0,0 +1,79 @@
+import hashlib
+import json
+import time
+from typing import Optional, List, Dict
+from config.constants import AI_CACHE_TTL_SECONDS, AI_CACHE_MAX_ENTRIES
+from utils.logger import logger
+
+class ResponseCache:
+    """Caché de respuestas de la IA en SQLite, con TTL y expulsión LRU"""
+
+    def __init__(self, db_manager, ttl_seconds: int = AI_CACHE_TTL_SECONDS,
+                 max_entries: int = AI_CACHE_MAX_ENTRIES):
+        self.db_manager = db_manager
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]], fingerprint: str = '') -> str:
+        """Clave estable a partir del modelo, los mensajes y la huella de eventos"""
+        payload = json.dumps(
+            {'model': model, 'messages': messages, 'fingerprint': fingerprint},
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Devuelve la respuesta cacheada o None si no existe o expiró"""
+        try:
+            rows = self.db_manager.execute_query(
+                "SELECT response, created_at FROM ai_response_cache WHERE cache_key = ?",
+                (key,)
+            )
+            if not rows:
+                return None
+
+            now = time.time()
+            if now - rows[0]['created_at'] > self.ttl_seconds:
+                self.db_manager.execute_update("DELETE FROM ai_response_cache WHERE cache_key = ?", (key,))
+                return None
+
+            self.db_manager.execute_update(
+                "UPDATE ai_response_cache SET last_access = ? WHERE cache_key = ?",
+                (now, key)
+            )
+            return rows[0]['response']
+        except Exception as e:
+            logger.error(f"Error leyendo caché de respuestas: {str(e)}")
+            return None
+
+    def set(self, key: str, response: str):
+        """Guarda una respuesta y expulsa las menos usadas si se supera el límite"""
+        try:
+            now = time.time()
+            self.db_manager.execute_update(
+                """
+                INSERT OR REPLACE INTO ai_response_cache (cache_key, response, created_at, last_access)
+                VALUES (?, ?, ?, ?)
+                """,
+                (key, response, now, now)
+            )
+            self.db_manager.execute_update(
+                "DELETE FROM ai_response_cache WHERE created_at < ?",
+                (now - self.ttl_seconds,)
+            )
+            self.db_manager.execute_update(
+                """
+                DELETE FROM ai_response_cache WHERE cache_key IN (
+                    SELECT cache_key FROM ai_response_cache
+                    ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+        except Exception as e:
+            logger.error(f"Error guardando en caché de respuestas: {str(e)}")
+
+    def clear(self):
+        """Vacía la caché"""
+        self.db_manager.execute_update("DELETE FROM ai_response_cache")
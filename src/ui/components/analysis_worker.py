@@ -1,6 +1,8 @@
 from PyQt6.QtCore import QThread, pyqtSignal
 from utils.logger import logger
 from typing import Optional
+from core.cancellation import CancellationToken, OperationCancelled, OperationTimeout
+from config.constants import PREDICTIONS_STEP_TIMEOUT, AI_STEP_TIMEOUT, CALENDAR_STEP_TIMEOUT
 
 class AnalysisWorker(QThread):
     statusUpdated = pyqtSignal(str)  # Para actualizar el estado
@@ -12,10 +14,13 @@ class AnalysisWorker(QThread):
         self.calendar_analyzer = calendar_analyzer
         self._is_running = False
         self._current_step = None
+        self._cancel_token = CancellationToken()
         
     def stop(self):
         """Detiene el proceso de análisis"""
         self._is_running = False
+        # Aborta también la petición HTTP en curso
+        self._cancel_token.cancel()
         logger.info("Deteniendo worker de análisis...")
 
     def _update_status(self, status: str):
@@ -24,13 +29,25 @@ class AnalysisWorker(QThread):
         self.statusUpdated.emit(status)
         self._current_step = status
 
-    def _execute_step(self, step_name: str, func, *args) -> Optional[any]:
-        """Ejecuta un paso del proceso con manejo de errores"""
+    def _execute_step(self, step_name: str, func, *args, timeout: Optional[float] = None) -> Optional[any]:
+        """Ejecuta un paso del proceso con manejo de errores.
+
+        `func` recibe `cancel_token`, un token hijo con el plazo del paso.
+        """
+        step_token = self._cancel_token.child(timeout)
         try:
             self._update_status(f"Ejecutando: {step_name}")
-            result = func(*args)
+            result = func(*args, cancel_token=step_token)
+            # Un paso no interrumpible pudo terminar fuera de plazo
+            step_token.raise_if_cancelled()
             logger.info(f"Paso completado: {step_name}")
             return result
+        except OperationTimeout:
+            logger.error(f"Tiempo agotado en {step_name} ({timeout}s)")
+            raise
+        except OperationCancelled:
+            logger.info(f"Paso cancelado: {step_name}")
+            raise
         except Exception as e:
             logger.error(f"Error en {step_name}: {str(e)}", exc_info=True)
             raise
@@ -44,7 +61,8 @@ class AnalysisWorker(QThread):
             # 1. Obtener predicciones
             api_response = self._execute_step(
                 "Obtención de predicciones",
-                self.calendar_analyzer.get_predictions
+                self.calendar_analyzer.get_predictions,
+                timeout=PREDICTIONS_STEP_TIMEOUT
             )
             if not self._is_running:
                 return
@@ -53,7 +71,8 @@ class AnalysisWorker(QThread):
             analysis_result = self._execute_step(
                 "Procesamiento con IA",
                 self.calendar_analyzer.process_with_ai,
-                api_response
+                api_response,
+                timeout=AI_STEP_TIMEOUT
             )
             if not self._is_running:
                 return
@@ -62,7 +81,8 @@ class AnalysisWorker(QThread):
             self._execute_step(
                 "Guardado en calendario",
                 self.calendar_analyzer.save_to_calendar,
-                analysis_result
+                analysis_result,
+                timeout=CALENDAR_STEP_TIMEOUT
             )
             if not self._is_running:
                 return
@@ -70,9 +90,13 @@ class AnalysisWorker(QThread):
             logger.info("=== Proceso completado exitosamente ===")
             self.finished.emit("Análisis completado exitosamente")
             
+        except OperationTimeout:
+            self.error.emit(f"Tiempo de espera agotado en {self._current_step}")
+        except OperationCancelled:
+            logger.info("Proceso de análisis cancelado")
         except Exception as e:
             logger.error("!!! Error en proceso de análisis !!!")
             logger.error(f"Error en paso '{self._current_step}': {str(e)}")
             self.error.emit(f"Error en {self._current_step}: {str(e)}")
         finally:
-            self._is_running = False 
\ No newline at end of file
+            self._is_running = False 
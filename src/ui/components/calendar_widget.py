@@ -6,7 +6,10 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QDate, pyqtSignal, QLocale, QTimer
 from PyQt6.QtGui import QIcon
 from models.event import Event
+from core.conflict_detector import ConflictDetector, event_key
 from config.settings import Settings
+from utils.metrics import metrics
+from utils.tracing import tracer
 from typing import List
 from datetime import datetime, date, timezone, timedelta
 from .day_cell_widget import (
@@ -32,6 +35,8 @@ class CalendarWidget(QWidget):
         self.settings.settingsChanged.connect(self.on_settings_changed)
         self.events = []
         self.highlighted_events = []  # Store highlighted events
+        self.conflict_detector = ConflictDetector()
+        self._conflicting_keys = set()
         self.current_view = 'month'  # Default view
         self.current_date = QDate.currentDate()
         self.header_label = None
@@ -140,9 +145,14 @@ class CalendarWidget(QWidget):
         
         layout.addWidget(self.view_stack)
 
+    @tracer.traced('calendar.set_events', cat='ui')
     def set_events(self, events: List[Event]):
         """Actualiza la lista de eventos y refresca la vista"""
         self.events = events
+        # Solo se reindexan los eventos que cambiaron
+        with tracer.span('calendar.sync_conflicts', count=len(events)):
+            self.conflict_detector.sync(events)
+            self._conflicting_keys = self.conflict_detector.conflicting_keys()
         self.refresh_view()
 
     def refresh_view(self):
@@ -161,6 +171,8 @@ class CalendarWidget(QWidget):
         year = self.current_date.year()
         self.header_label.setText(f"{month_name} {year}")
 
+    @metrics.timed('ui.refresh_month_view')
+    @tracer.traced('ui.refresh_month_view', cat='ui')
     def refresh_month_view(self, highlighted_events):
         """Refresca la vista de mes"""
         self._update_header()
@@ -284,7 +296,32 @@ class CalendarWidget(QWidget):
                 }}
             """)
         
-        layout.addWidget(day_label)
+        # Insignia con el número de eventos solapados del día
+        conflicting = [e for e in events if event_key(e) in self._conflicting_keys]
+        if conflicting:
+            header = QHBoxLayout()
+            header.setContentsMargins(0, 0, 0, 0)
+            badge = QLabel(f"⚠ {len(conflicting)}")
+            badge.setToolTip("Eventos solapados:\n" + "\n".join(
+                f"{e.start_datetime.strftime('%H:%M')}-{e.end_datetime.strftime('%H:%M')} {e.title}"
+                for e in conflicting
+            ))
+            badge.setStyleSheet("""
+                QLabel {
+                    color: white;
+                    background-color: #E53935;
+                    border-radius: 6px;
+                    padding: 0px 4px;
+                    font-size: 9px;
+                    font-weight: bold;
+                }
+            """)
+            header.addWidget(badge)
+            header.addStretch()
+            header.addWidget(day_label)
+            layout.addLayout(header)
+        else:
+            layout.addWidget(day_label)
         
         # Añadir eventos del día (máximo 3)
         event_count = 0
@@ -406,6 +443,7 @@ class CalendarWidget(QWidget):
         # en la vista actual
         pass
 
+    @tracer.traced('ui.refresh_week_view', cat='ui')
     def refresh_week_view(self, highlighted_events):
         """Refresca la vista de semana"""
         self._update_header()
@@ -608,6 +646,7 @@ class CalendarWidget(QWidget):
         # Mostrar la vista de semana
         self.view_stack.setCurrentWidget(self.week_container)
 
+    @tracer.traced('ui.refresh_day_view', cat='ui')
     def refresh_day_view(self, highlighted_events):
         """Refresca la vista de día"""
         self._update_header()
@@ -1020,32 +1059,22 @@ class CalendarWidget(QWidget):
 
     def previous_period(self):
         """Va al período anterior"""
-        if self.current_view == 'month':
-            self.current_date = self.current_date.addMonths(-1)
-        elif self.current_view == 'week':
-            self.current_date = self.current_date.addDays(-7)
-        else:  # day view
-            self.current_date = self.current_date.addDays(-1)
-        
-        # Emitir señal de cambio de mes si es necesario
-        if self.current_view == 'month':
-            self.monthChanged.emit(datetime(
-                self.current_date.year(),
-                self.current_date.month(),
-                1,
-                tzinfo=timezone.utc
-            ))
-        
-        self.refresh_view()
+        with tracer.span('calendar.navigate', cat='ui', direction='previous', view=self.current_view):
+            self._move_period(-1)
 
     def next_period(self):
         """Va al período siguiente"""
+        with tracer.span('calendar.navigate', cat='ui', direction='next', view=self.current_view):
+            self._move_period(1)
+
+    def _move_period(self, step: int):
+        """Avanza (1) o retrocede (-1) un mes, semana o día según la vista"""
         if self.current_view == 'month':
-            self.current_date = self.current_date.addMonths(1)
+            self.current_date = self.current_date.addMonths(step)
         elif self.current_view == 'week':
-            self.current_date = self.current_date.addDays(7)
+            self.current_date = self.current_date.addDays(7 * step)
         else:  # day view
-            self.current_date = self.current_date.addDays(1)
+            self.current_date = self.current_date.addDays(step)
         
         # Emitir señal de cambio de mes si es necesario
         if self.current_view == 'month':
@@ -1197,6 +1226,8 @@ class CalendarWidget(QWidget):
     def clear_events(self):
         """Limpia todos los eventos del calendario"""
         self.events = []
+        self.conflict_detector.set_events([])
+        self._conflicting_keys = set()
         self.refresh_view()
 
     def _event_on_date(self, event, date):
@@ -10,12 +10,16 @@ from core.ai_assistant import AIAssistant
 from core.calendar_analyzer import CalendarAnalyzer
 from .loading_overlay import LoadingOverlay
 from .analysis_worker import AnalysisWorker
+from .quick_action_worker import QuickActionWorker
 from .chat_worker import Worker
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 from core.function_identifier import FunctionIdentifier
-from core.functions import codigo_morse  # Importar las funciones
+from core.event_encoding import encode_events_compact
+from core.conflict_detector import ConflictDetector, describe_conflicts
+from core.free_slots import FreeBusyIndex, describe_free_slots
+from utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -117,6 +121,16 @@ class ChatMessage(QWidget):
             days = int(diff.total_seconds() / 86400)
             return f"{days} day{'s' if days > 1 else ''} ago"
     
+    def append_text(self, chunk: str):
+        """Agrega texto al mensaje (respuestas en streaming)"""
+        self.text += chunk
+        self.message_label.setText(self.text)
+
+    def set_text(self, text: str):
+        """Reemplaza el texto del mensaje"""
+        self.text = text
+        self.message_label.setText(text)
+
     def _update_timestamp(self):
         """Update the timestamp label"""
         self.timestamp_label.setText(self._format_timestamp())
@@ -135,6 +149,7 @@ class ChatSidebar(QWidget):
         self.init_ui()
         self.message_history = []
         self.setStyleSheet(Theme.SIDEBAR_STYLE)
+        self.db_manager = db_manager
         self.ai_assistant = AIAssistant(db_manager)
         self.calendar_analyzer = CalendarAnalyzer(
             calendar_manager=calendar_manager,
@@ -142,7 +157,12 @@ class ChatSidebar(QWidget):
         )
         
         self.analysis_worker = None
+        self.quick_action_worker = None
+        self._cancelled_workers = []
+        self.chat_action = None  # Traza del mensaje en curso (si el trazado está activo)
         self.loading_overlay = None
+        self.streaming_message = None  # Burbuja que recibe la respuesta en streaming
+        self.worker = None  # Worker del mensaje en curso; solo uno a la vez
         
         # Initialize thinking animation variables
         self.thinking_dots = 0
@@ -263,72 +283,88 @@ class ChatSidebar(QWidget):
     def handle_send(self):
         """Maneja la acción del botón de enviar"""
         message = self.message_input.text()
-        if message:
+        # Un segundo envío mezclaría sus tokens con la respuesta en curso
+        if message and self.worker is None:
             logger.info("Mensaje enviado por el usuario: %s", message)
-            self.message_input.clear()  # Limpiar el campo de texto
-            self.add_message(message, True)
-            self.start_thinking_animation()
-
-            # Identificar la función antes de procesar el mensaje
-            function_id = self.function_identifier.identify_function(message)
-            if function_id != "none":
-                # Lógica para ejecutar la función correspondiente
-                self.execute_function(function_id, message)
-                self.stop_thinking_animation()  # Detener la animación de pensamiento
-                return
-
-            # Crear un hilo para procesar la respuesta
-            self.thread = QThread()
-            self.worker = Worker(self.ai_assistant, message)
-            self.worker.moveToThread(self.thread)
-
-            # Conectar señales
-            self.thread.started.connect(self.worker.run)
-            self.worker.finished.connect(self.process_ai_response)
-            self.worker.error.connect(self.handle_error)
-            self.thread.finished.connect(self.thread.deleteLater)
-            self.worker.finished.connect(self.thread.quit)
-
-            # Iniciar el hilo
-            self.thread.start()
+            # La acción termina cuando se muestra la respuesta o el error
+            self.chat_action = tracer.begin_action('chat.send', chars=len(message))
+            with tracer.span('chat.handle_send', cat='ui', parent=self.chat_action.context):
+                self._start_chat_worker(message)
+
+    def _start_chat_worker(self, message: str):
+        """Muestra el mensaje del usuario y lanza el worker que obtiene la respuesta"""
+        self.message_input.clear()  # Limpiar el campo de texto
+        self._set_chat_enabled(False)
+        self.add_message(message, True)
+        self.start_thinking_animation()
+
+        # Crear un hilo para procesar la respuesta
+        self.thread = QThread()
+        self.worker = Worker(self.ai_assistant, message, self.function_identifier,
+                             trace_context=tracer.current())
+        self.worker.moveToThread(self.thread)
+
+        # Conectar señales
+        self.streaming_message = None
+        self.thread.started.connect(self.worker.run)
+        self.worker.tokenReceived.connect(self.handle_stream_token)
+        self.worker.finished.connect(self.process_ai_response)
+        self.worker.error.connect(self.handle_error)
+        self.thread.finished.connect(self.thread.deleteLater)
+        self.worker.finished.connect(self.thread.quit)
+        self.worker.error.connect(self.thread.quit)
+
+        # Iniciar el hilo
+        self.thread.start()
+
+    def handle_stream_token(self, token: str):
+        """Muestra cada fragmento de la respuesta en cuanto llega"""
+        if self.streaming_message is None:
+            tracer.instant('chat.first_token')
+            self.stop_thinking_animation()
+            self.streaming_message = self.add_message("", False)
+        self.streaming_message.append_text(token)
+        self.scroll_to_bottom()
 
     def process_ai_response(self, text):
-        """Procesa la respuesta del AI"""
-        try:
-            logger.info("Procesando respuesta de la IA para el mensaje: %s", text)
-            function_id = self.function_identifier.identify_function(text)
-            if function_id != "none":
-                # Lógica para ejecutar la función correspondiente
-                self.execute_function(function_id, text)
-            else:
-                response = self.ai_assistant.process_message(text)
-                self.stop_thinking_animation()
-                self.add_message(response, False)
-        except Exception as e:
-            logger.error("Error al procesar la respuesta de la IA: %s", str(e))
+        """Muestra la respuesta final del worker"""
+        with tracer.span('chat.render', cat='ui', parent=self._chat_trace_context()):
             self.stop_thinking_animation()
-            self.add_message(f"Error: {str(e)}", False)
-
-    def execute_function(self, function_id, text):
-        """Ejecuta la función correspondiente según la ID."""
-        try:
-            if function_id == "codigo_morse":
-                result = codigo_morse(text)
-                self.add_message(result, False)  # Mostrar el resultado en el chat
-            elif function_id == "otra_funcion":
-                # Implementar lógica para otra función
-                pass
+            if self.streaming_message is not None:
+                # La respuesta ya se mostró token a token; solo fijar el texto final
+                self.streaming_message.set_text(text)
+                self.streaming_message = None
             else:
-                logger.warning("Función no reconocida: %s", function_id)
-                self.add_message("Función no reconocida.", False)
-        except Exception as e:
-            logger.error("Error al ejecutar la función %s: %s", function_id, str(e))
-            self.add_message(f"Error al ejecutar la función: {str(e)}", False)
+                self.add_message(text, False)
+        self._end_chat_action(chars=len(text))
+        self._finish_chat()
 
     def handle_error(self, error_msg):
         """Maneja errores en el procesamiento de la IA"""
         self.stop_thinking_animation()
+        self.streaming_message = None
         self.add_message(f"Error: {error_msg}", False)
+        self._end_chat_action(error=error_msg)
+        self._finish_chat()
+
+    def _finish_chat(self):
+        """Libera el worker del mensaje y vuelve a permitir enviar"""
+        self.worker = None
+        self._set_chat_enabled(True)
+
+    def _set_chat_enabled(self, enabled: bool):
+        self.message_input.setEnabled(enabled)
+        # Un análisis en curso mantiene el botón deshabilitado
+        analysis_running = self.analysis_worker is not None and self.analysis_worker.isRunning()
+        self.send_button.setEnabled(enabled and not analysis_running)
+
+    def _chat_trace_context(self):
+        return self.chat_action.context if self.chat_action else None
+
+    def _end_chat_action(self, **args):
+        if self.chat_action:
+            self.chat_action.end(**args)
+            self.chat_action = None
 
     def start_thinking_animation(self):
         """Inicia la animación de 'pensando'"""
@@ -372,6 +408,8 @@ class ChatSidebar(QWidget):
         # Scroll to bottom
         QTimer.singleShot(100, self.scroll_to_bottom)
 
+        return message_widget
+
     def scroll_to_bottom(self):
         """Desplaza el chat al último mensaje"""
         scrollbar = self.chat_area.verticalScrollBar()
@@ -477,7 +515,7 @@ class ChatSidebar(QWidget):
 
             # Restaurar botones
             self.analyze_btn.setEnabled(True)
-            self.send_button.setEnabled(True)
+            self.send_button.setEnabled(self.worker is None)
             self.analyze_btn.setStyleSheet(Theme.QUICK_ACTION_BUTTON_STYLE)
 
             # Detener timer si existe
@@ -498,7 +536,7 @@ class ChatSidebar(QWidget):
 
     def update_calendar_manager(self, calendar_manager):
         """Actualiza el calendar_manager después de la autenticación"""
-        self.calendar_analyzer = CalendarAnalyzer(calendar_manager)
+        self.calendar_analyzer = CalendarAnalyzer(calendar_manager, self.db_manager)
 
     def resizeEvent(self, event):
         """Asegurar que el overlay cubra todo el widget"""
@@ -544,76 +582,50 @@ class ChatSidebar(QWidget):
 
     def handle_optimize(self):
         """Maneja la optimización de eventos"""
-        try:
-            if not self.calendar_analyzer.calendar_manager:
-                self.add_message("Error: Por favor, autentícate primero con Google Calendar", False)
-                return
-                
-            # Agregar mensaje del usuario
-            self.add_message("Optimiza mi calendario y sugiere mejoras", True)
-            
-            # Mostrar mensaje de carga
-            self.add_message("Analizando eventos y buscando oportunidades de optimización...", False)
-            
-            # Obtener eventos actuales
-            events = self.calendar_analyzer.calendar_manager.get_events()
-            
-            if not events:
-                self.add_message("No hay eventos para analizar. Agrega algunos eventos a tu calendario primero.", False)
-                return
-                
-            # Preparar prompt para el asistente
-            prompt = f"""
+        self._start_quick_action(
+            "Optimiza mi calendario y sugiere mejoras",
+            "Analizando eventos y buscando oportunidades de optimización...",
+            self._build_optimize_prompt
+        )
+
+    def handle_suggest(self):
+        """Maneja las sugerencias de horarios basadas en análisis de tareas existentes"""
+        self._start_quick_action(
+            "Sugiere mejoras basadas en mis tareas actuales",
+            "Analizando patrones de tareas y buscando oportunidades de mejora...",
+            self._build_suggest_prompt
+        )
+
+    def _build_optimize_prompt(self, events) -> str:
+        """Prompt de optimización (se ejecuta en el worker)"""
+        return f"""
             Analiza estos eventos de calendario y sugiere optimizaciones:
             
             {self._format_events_for_analysis(events)}
             
+            Conflictos detectados (calculados, no hace falta buscarlos):
+            {describe_conflicts(ConflictDetector(events))}
+            
             Proporciona sugerencias específicas para:
             1. Mejorar la distribución de eventos
             2. Evitar sobrecargas de trabajo
             3. Optimizar tiempos de descanso
             4. Agrupar tareas similares
-            5. Identificar conflictos potenciales
+            5. Resolver los conflictos detectados
             
             Responde en español con un formato claro y conciso.
             """
-            
-            # Procesar con el asistente
-            response = self.ai_assistant.process_message(prompt)
-            
-            # Mostrar respuesta
-            self.add_message(response, False)
-            
-        except Exception as e:
-            logger.error(f"Error en optimización: {str(e)}")
-            self.add_message(f"Error al optimizar eventos: {str(e)}", False)
 
-    def handle_suggest(self):
-        """Maneja las sugerencias de horarios basadas en análisis de tareas existentes"""
-        try:
-            if not self.calendar_analyzer.calendar_manager:
-                self.add_message("Error: Por favor, autentícate primero con Google Calendar", False)
-                return
-                
-            # Agregar mensaje del usuario
-            self.add_message("Sugiere mejoras basadas en mis tareas actuales", True)
-            
-            # Mostrar mensaje de carga
-            self.add_message("Analizando patrones de tareas y buscando oportunidades de mejora...", False)
-            
-            # Obtener eventos actuales
-            events = self.calendar_analyzer.calendar_manager.get_events()
-            
-            if not events:
-                self.add_message("No hay eventos para analizar. Agrega algunos eventos a tu calendario primero.", False)
-                return
-                
-            # Preparar prompt para el asistente
-            prompt = f"""
+    def _build_suggest_prompt(self, events) -> str:
+        """Prompt de sugerencias (se ejecuta en el worker)"""
+        return f"""
             Analiza estos eventos de calendario y sugiere mejoras basadas en patrones identificados:
             
             {self._format_events_for_analysis(events)}
             
+            Huecos libres de la próxima semana en horario laboral (calculados, úsalos al proponer horarios):
+            {describe_free_slots(self._find_free_slots(events))}
+            
             Proporciona sugerencias específicas para:
             1. Mejorar la productividad basada en patrones observados
             2. Identificar hábitos que podrían optimizarse
@@ -623,24 +635,107 @@ class ChatSidebar(QWidget):
             
             Responde en español con un formato claro y conciso.
             """
-            
-            # Procesar con el asistente
-            response = self.ai_assistant.process_message(prompt)
-            
-            # Mostrar respuesta
-            self.add_message(response, False)
-            
+
+    def _find_free_slots(self, events, min_minutes: int = 30):
+        """Huecos libres desde ahora hasta dentro de una semana"""
+        now = datetime.now().astimezone()
+        # Redondear a la media hora para que el prompt (y su caché) sea estable
+        start = now.replace(minute=0, second=0, microsecond=0) + timedelta(minutes=30 if now.minute < 30 else 60)
+        # Los eventos cargados cubren el mes actual; más allá no sabemos qué está ocupado
+        month_end = (now.replace(day=1, hour=0, minute=0, second=0, microsecond=0) + timedelta(days=32)).replace(day=1)
+        end = min(start + timedelta(days=7), month_end)
+        return FreeBusyIndex(events).find_free_slots(start, end, timedelta(minutes=min_minutes))
+
+    def _start_quick_action(self, user_text: str, status_text: str, build_prompt):
+        """Lanza una acción rápida en un worker con overlay de progreso"""
+        try:
+            if not self.calendar_analyzer.calendar_manager:
+                self.add_message("Error: Por favor, autentícate primero con Google Calendar", False)
+                return
+
+            # Evitar múltiples acciones simultáneas
+            if self.quick_action_worker and self.quick_action_worker.isRunning():
+                logger.warning("Acción rápida ya en proceso")
+                return
+
+            self.add_message(user_text, True)
+            self.optimize_btn.setEnabled(False)
+            self.suggest_btn.setEnabled(False)
+
+            # Overlay de progreso con opción de cancelar
+            self.loading_overlay = LoadingOverlay(self)
+            self.loading_overlay.cancelRequested.connect(self.cancel_quick_action)
+            self.loading_overlay.start(status_text, cancellable=True)
+
+            self.quick_action_worker = QuickActionWorker(
+                self.calendar_analyzer, self.ai_assistant, build_prompt
+            )
+            self.quick_action_worker.statusUpdated.connect(self.loading_overlay.update_status)
+            self.quick_action_worker.finished.connect(self._handle_quick_action_finished)
+            self.quick_action_worker.error.connect(self._handle_quick_action_error)
+            self.quick_action_worker.start()
+
         except Exception as e:
-            logger.error(f"Error en sugerencias: {str(e)}")
-            self.add_message(f"Error al generar sugerencias: {str(e)}", False)
+            logger.error(f"Error iniciando acción rápida: {str(e)}")
+            self._cleanup_quick_action()
+            self.add_message(f"Error: {str(e)}", False)
+
+    def cancel_quick_action(self):
+        """Cancela la acción rápida en curso sin bloquear la interfaz"""
+        worker = self.quick_action_worker
+        if not worker:
+            return
+        logger.info("Cancelando acción rápida")
+        worker.statusUpdated.disconnect()
+        worker.finished.disconnect()
+        worker.error.disconnect()
+        worker.stop()
+        # Mantener la referencia hasta que el hilo termine por sí solo
+        self._cancelled_workers.append(worker)
+        worker.cancelled.connect(lambda: self._release_worker(worker))
+        worker.finished.connect(lambda _: self._release_worker(worker))
+        worker.error.connect(lambda _: self._release_worker(worker))
+        self._cleanup_quick_action()
+        self.add_message("Acción cancelada.", False)
+
+    def _release_worker(self, worker):
+        """Libera un worker cancelado cuando su hilo termina"""
+        if worker in self._cancelled_workers:
+            self._cancelled_workers.remove(worker)
+            worker.wait()
+            worker.deleteLater()
+
+    def _handle_quick_action_finished(self, response: str):
+        """Muestra el resultado de la acción rápida"""
+        self._cleanup_quick_action()
+        self.add_message(response, False)
+
+    def _handle_quick_action_error(self, error_msg: str):
+        """Maneja errores de la acción rápida"""
+        logger.error(error_msg)
+        self._cleanup_quick_action()
+        self.add_message(error_msg, False)
+
+    def _cleanup_quick_action(self):
+        """Restaura botones y overlay tras una acción rápida"""
+        self.optimize_btn.setEnabled(True)
+        self.suggest_btn.setEnabled(True)
+
+        if self.loading_overlay:
+            try:
+                self.loading_overlay.stop()
+            except RuntimeError:
+                pass
+            self.loading_overlay = None
+
+        if self.quick_action_worker and self.quick_action_worker not in self._cancelled_workers:
+            self.quick_action_worker.wait()
+            self.quick_action_worker.deleteLater()
+        self.quick_action_worker = None
             
     def _format_events_for_analysis(self, events):
-        """Formatea los eventos para el análisis"""
-        formatted_events = []
-        for event in events:
-            formatted_events.append(f"- {event.title}: {event.start_datetime.strftime('%Y-%m-%d %H:%M')} a {event.end_datetime.strftime('%H:%M')}")
-        
-        return "\n".join(formatted_events)
+        """Formatea los eventos para el análisis en formato compacto"""
+        return encode_events_compact(events)
 
     def toggle_theme(self):
         """Toggle between light and dark themes"""
@@ -1,19 +1,60 @@
 from PyQt6.QtCore import QObject, pyqtSignal
 from core.ai_assistant import AIAssistant
+from core.functions import describe_functions, execute_function
+from core.function_identifier import FunctionIdentifier
+from utils.tracing import tracer, TraceContext
+import logging
+
+logger = logging.getLogger(__name__)
 
 class Worker(QObject):
     finished = pyqtSignal(str)  # Señal para enviar la respuesta de vuelta
     error = pyqtSignal(str)      # Señal para enviar errores
+    tokenReceived = pyqtSignal(str)  # Fragmentos de la respuesta según llegan
 
-    def __init__(self, ai_assistant: AIAssistant, message: str):
+    def __init__(self, ai_assistant: AIAssistant, message: str, function_identifier: FunctionIdentifier = None,
+                 trace_context: TraceContext = None):
         super().__init__()
         self.ai_assistant = ai_assistant
         self.message = message
+        self.function_identifier = function_identifier or FunctionIdentifier()
+        self.trace_context = trace_context  # Traza del envío en el hilo de la interfaz
 
     def run(self):
         """Método que se ejecuta en el hilo separado"""
+        tracer.name_thread('ChatWorker')
+        with tracer.span('chat.worker', parent=self.trace_context):
+            self._run()
+
+    def _run(self):
         try:
-            response = self.ai_assistant.process_message(self.message)
+            # Router local: si está claro, ejecutar sin tocar la red
+            with tracer.span('chat.route') as span:
+                function_id, confidence = self.function_identifier.route(self.message)
+                span.set(function=function_id, confidence=confidence)
+            if confidence >= FunctionIdentifier.HIGH_CONFIDENCE:
+                logger.info("Función resuelta localmente: %s", function_id)
+                with tracer.span('chat.execute_function', function=function_id):
+                    response = execute_function(function_id, self.message)
+                self.finished.emit(response)
+                return
+
+            # Una sola petición: la respuesta trae el texto o la función a ejecutar
+            response = self.ai_assistant.stream_message(
+                self.message,
+                on_token=self.tokenReceived.emit,
+                functions=describe_functions()
+            )
+            if self.ai_assistant.is_function_call(response):
+                function_id = self.ai_assistant.parse_function_call(response)
+                if function_id:
+                    logger.info("Ejecutando función local: %s", function_id)
+                    with tracer.span('chat.execute_function', function=function_id):
+                        response = execute_function(function_id, self.message)
+                    self.ai_assistant.record_turn(self.message, response)
+                else:
+                    # ID inventada por el modelo: volver a preguntar sin la lista de funciones
+                    response = self.ai_assistant.stream_message(self.message, on_token=self.tokenReceived.emit)
             self.finished.emit(response)  # Emitir la respuesta
         except Exception as e:
-            self.error.emit(str(e))  # Emitir el error 
\ No newline at end of file
+            self.error.emit(str(e))  # Emitir el error
@@ -2,7 +2,8 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, 
     QCheckBox, QLabel, QTextEdit, QPushButton,
     QTabWidget, QWidget, QPlainTextEdit,
-    QFrame, QSplitter
+    QFrame, QSplitter, QComboBox, QLineEdit,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog
 )
 from PyQt6.QtCore import QTimer, QPointF, Qt
 from PyQt6.QtGui import (
@@ -13,7 +14,12 @@ from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
 import psutil
 import threading
 import logging
-from utils.logger import logger
+from collections import deque
+from utils.logger import logger, add_sink, remove_sink, LOG_FILE, LOG_DIRECTORY
+from utils.metrics import metrics
+from utils.tracing import tracer
+from utils.sampling_profiler import profiler
+from utils.log_reader import tail_lines, scan_log
 from config.settings import Settings
 import os
 from datetime import datetime
@@ -123,20 +129,30 @@ class PerformanceGraph(QWidget):
         self.axis_y.setGridLineColor(QColor(grid_color))
 
 class LogViewer(QWidget):
+    LEVELS = ['Todos', 'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+    MAX_LOADED_LINES = 1000
+    MAX_BLOCK_COUNT = 5000
+    # Líneas nuevas pendientes de mostrar y cada cuánto se vuelcan al widget
+    LIVE_BUFFER_SIZE = 2000
+    FLUSH_INTERVAL_MS = 200
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
-        self.log_text.setMaximumBlockCount(5000)
+        self.log_text.setMaximumBlockCount(self.MAX_BLOCK_COUNT)
         self.log_handler = None  # Guardar referencia al handler
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.flush_log_buffer)
         self.init_ui()
         self.load_existing_logs()
         self.setup_log_handler()
 
     def closeEvent(self, event):
         """Limpiar el handler cuando se cierra el widget"""
-        if self.log_handler and self.log_handler in logging.getLogger().handlers:
-            logging.getLogger().removeHandler(self.log_handler)
+        self.flush_timer.stop()
+        if self.log_handler:
+            remove_sink(self.log_handler)
         super().closeEvent(event)
 
     def init_ui(self):
@@ -151,9 +167,20 @@ class LogViewer(QWidget):
         self.clear_button = QPushButton("Limpiar")
         self.clear_button.clicked.connect(self.log_text.clear)
         
+        # Filtros: se aplican al archivo y a las líneas nuevas
+        self.level_filter = QComboBox()
+        self.level_filter.addItems(self.LEVELS)
+        self.level_filter.currentIndexChanged.connect(self.load_existing_logs)
+        
+        self.text_filter = QLineEdit()
+        self.text_filter.setPlaceholderText("Filtrar texto...")
+        self.text_filter.returnPressed.connect(self.load_existing_logs)
+        
         toolbar.addWidget(self.reload_button)
         toolbar.addWidget(self.clear_button)
         toolbar.addStretch()
+        toolbar.addWidget(self.level_filter)
+        toolbar.addWidget(self.text_filter)
         
         layout.addLayout(toolbar)
         
@@ -164,8 +191,7 @@ class LogViewer(QWidget):
         """Carga los logs existentes desde el archivo"""
         try:
             # Obtener el archivo de log actual
-            current_date = datetime.now().strftime("%Y%m%d")
-            log_file = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'logs', f"calendar_app_{current_date}.log")
+            log_file = LOG_FILE
             app_log = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app.log')
             
             # Intentar primero el log específico del día, luego el log general
@@ -173,56 +199,86 @@ class LogViewer(QWidget):
             
             for file_path in log_files:
                 if os.path.exists(file_path):
-                    # Intentar diferentes codificaciones
-                    encodings = ['utf-8', 'latin1', 'cp1252']
-                    
-                    for encoding in encodings:
-                        try:
-                            with open(file_path, 'r', encoding=encoding) as f:
-                                # Leer las últimas 1000 líneas
-                                lines = f.readlines()[-1000:]
-                                self.log_text.setPlainText(''.join(lines))
-                                # Mover el cursor al final
-                                self.log_text.moveCursor(QTextCursor.MoveOperation.End)
-                                logger.info(f"Logs cargados exitosamente desde {file_path} usando codificación {encoding}")
-                                return
-                        except UnicodeDecodeError:
-                            continue
-                        except Exception as e:
-                            logger.error(f"Error leyendo logs con codificación {encoding}: {e}")
-                            continue
+                    try:
+                        level, text = self._active_filters()
+                        # Solo se leen las líneas que se muestran, no el archivo completo
+                        if level or text:
+                            lines = scan_log(file_path, level, text, limit=self.MAX_LOADED_LINES)
+                        else:
+                            lines = tail_lines(file_path, self.MAX_LOADED_LINES)
+                        self.log_text.setPlainText('\n'.join(lines))
+                        # Mover el cursor al final
+                        self.log_text.moveCursor(QTextCursor.MoveOperation.End)
+                        logger.info(f"{len(lines)} líneas de log cargadas desde {file_path}")
+                        return
+                    except Exception as e:
+                        logger.error(f"Error leyendo logs de {file_path}: {e}")
+                        continue
             
             logger.error("No se encontraron archivos de log o no se pudieron leer")
         except Exception as e:
             logger.error(f"Error cargando logs existentes: {e}")
 
+    def _active_filters(self):
+        level = self.level_filter.currentText()
+        return (None if level == 'Todos' else level), (self.text_filter.text() or None)
+
+    def _matches_filters(self, msg):
+        level, text = self._active_filters()
+        if level and f" - {level} - " not in msg:
+            return False
+        return not text or text in msg
+
     def setup_log_handler(self):
-        class QTextEditLogger(logging.Handler):
-            def __init__(self, widget):
+        class BufferedLogHandler(logging.Handler):
+            """Sink del listener de logs: guarda las líneas en un búfer circular.
+
+            No toca el widget; la interfaz vacía el búfer por lotes con un QTimer.
+            """
+            def __init__(self, size):
                 super().__init__()
-                self.widget = widget
+                self.buffer = deque(maxlen=size)
+                self.dropped = 0  # Solo lo modifica el hilo del listener
                 self.setLevel(logging.INFO)  # Capturar todos los niveles de log
 
             def emit(self, record):
-                try:
-                    msg = self.format(record)
-                    self.widget.appendPlainText(msg)
-                    self.widget.moveCursor(QTextCursor.MoveOperation.End)
-                except (RuntimeError, AttributeError):
-                    # Widget fue destruido o no es accesible
-                    pass
+                if len(self.buffer) == self.buffer.maxlen:
+                    self.dropped += 1  # El deque descarta la línea más antigua
+                self.buffer.append(self.format(record))
 
         # Remover handler anterior si existe
-        if self.log_handler and self.log_handler in logging.getLogger().handlers:
-            logging.getLogger().removeHandler(self.log_handler)
+        if self.log_handler:
+            remove_sink(self.log_handler)
 
         # Crear y configurar el nuevo handler
-        self.log_handler = QTextEditLogger(self.log_text)
+        self.log_handler = BufferedLogHandler(self.LIVE_BUFFER_SIZE)
         self.log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        self._dropped_seen = 0
         
-        # Agregar el handler al logger raíz para capturar todos los logs
-        root_logger = logging.getLogger()
-        root_logger.addHandler(self.log_handler)
+        # Se ejecuta en el hilo del listener, no en el que loguea
+        add_sink(self.log_handler)
+        self.flush_timer.start(self.FLUSH_INTERVAL_MS)
+
+    def flush_log_buffer(self):
+        """Pasa al widget, de una vez, las líneas acumuladas desde el último vaciado"""
+        handler = self.log_handler
+        if not handler or not handler.buffer:
+            return
+        lines = []
+        while True:
+            try:
+                lines.append(handler.buffer.popleft())
+            except IndexError:
+                break
+        # Lo que no cupo en el búfer entre dos vaciados se descarta
+        dropped = handler.dropped - self._dropped_seen
+        self._dropped_seen += dropped
+        lines = [line for line in lines if self._matches_filters(line)]
+        if dropped > 0:
+            lines.insert(0, f"... {dropped} líneas de log omitidas en la vista ...")
+        if lines:
+            self.log_text.appendPlainText('\n'.join(lines))
+            self.log_text.moveCursor(QTextCursor.MoveOperation.End)
         
     def update_theme(self):
         """Actualiza los estilos cuando cambia el tema"""
@@ -248,6 +304,88 @@ class LogViewer(QWidget):
             }}
         """)
 
+class MetricsView(QWidget):
+    """Tabla con el resumen de utils.metrics, refrescada mientras está visible"""
+    COLUMNS = ['Métrica', 'Tipo', 'Cuenta', 'Media', 'p50', 'p90', 'p99', 'Máx']
+    REFRESH_INTERVAL_MS = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.init_ui()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        
+        # Toolbar
+        toolbar = QHBoxLayout()
+        
+        self.export_button = QPushButton("Exportar JSON")
+        self.export_button.clicked.connect(self.export_json)
+        
+        self.reset_button = QPushButton("Reiniciar")
+        self.reset_button.clicked.connect(self.reset_metrics)
+        
+        toolbar.addWidget(self.export_button)
+        toolbar.addWidget(self.reset_button)
+        toolbar.addStretch()
+        layout.addLayout(toolbar)
+        
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start(self.REFRESH_INTERVAL_MS)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        snapshot = metrics.snapshot()
+        self.table.setRowCount(len(snapshot))
+        for row, (name, summary) in enumerate(snapshot.items()):
+            unit = summary.get('unit', '')
+            values = [name, summary['type'], str(summary['count'])]
+            for key in ('mean', 'p50', 'p90', 'p99', 'max'):
+                value = summary.get(key)
+                values.append('' if value is None else f"{value:.2f} {unit}".strip())
+            for column, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                if column >= 2:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+    def reset_metrics(self):
+        metrics.reset()
+        self.refresh()
+
+    def export_json(self):
+        default_name = f"metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Exportar métricas", os.path.join(LOG_DIRECTORY, default_name), "JSON (*.json)"
+        )
+        if not path:
+            return
+        try:
+            metrics.export_json(path)
+            logger.info(f"Métricas exportadas a {path}")
+        except OSError as e:
+            logger.error(f"Error exportando métricas: {e}")
+
+    def update_theme(self):
+        """Actualiza los estilos cuando cambia el tema"""
+        button_style = Theme.PRIMARY_BUTTON_STYLE if Theme.is_dark_mode else Theme.PRIMARY_BUTTON_STYLE_LIGHT
+        self.export_button.setStyleSheet(button_style)
+        self.reset_button.setStyleSheet(button_style)
+
 class DevPanel(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -274,6 +412,12 @@ class DevPanel(QDialog):
         self.performance_graph = PerformanceGraph()
         performance_layout.addWidget(self.performance_graph)
         
+        # Pestaña de métricas
+        metrics_tab = QWidget()
+        metrics_layout = QVBoxLayout(metrics_tab)
+        self.metrics_view = MetricsView()
+        metrics_layout.addWidget(self.metrics_view)
+        
         # Pestaña de logs
         logs_tab = QWidget()
         logs_layout = QVBoxLayout(logs_tab)
@@ -287,13 +431,16 @@ class DevPanel(QDialog):
         # Secciones de configuración
         api_section = self._create_api_section()
         refresh_section = self._create_refresh_section()
+        diagnostics_section = self._create_diagnostics_section()
         
         config_layout.addWidget(api_section)
         config_layout.addWidget(refresh_section)
+        config_layout.addWidget(diagnostics_section)
         config_layout.addStretch()
         
         # Agregar pestañas
         self.tabs.addTab(performance_tab, "Rendimiento")
+        self.tabs.addTab(metrics_tab, "Métricas")
         self.tabs.addTab(logs_tab, "Logs")
         self.tabs.addTab(config_tab, "Configuración")
         
@@ -348,6 +495,10 @@ class DevPanel(QDialog):
         self.use_mock_api = QCheckBox("Usar API Mock")
         self.use_mock_api.setChecked(self.settings.use_mock_api)
         
+        # Checkbox para calcular las predicciones en local
+        self.use_local_analytics = QCheckBox("Usar analítica local (sin API remota)")
+        self.use_local_analytics.setChecked(self.settings.use_local_analytics)
+        
         # Campo de texto para la respuesta mock
         mock_response_label = QLabel("Respuesta Mock API:")
         self.mock_api_response = QTextEdit()
@@ -356,6 +507,7 @@ class DevPanel(QDialog):
         
         layout.addWidget(title)
         layout.addWidget(self.use_mock_api)
+        layout.addWidget(self.use_local_analytics)
         layout.addWidget(mock_response_label)
         layout.addWidget(self.mock_api_response)
         
@@ -376,6 +528,10 @@ class DevPanel(QDialog):
         self.auto_refresh = QCheckBox("Habilitar refresco automático")
         self.auto_refresh.setChecked(self.settings.auto_refresh_enabled)
         
+        # Checkbox para expandir eventos recurrentes en local
+        self.expand_recurrence = QCheckBox("Expandir eventos recurrentes localmente")
+        self.expand_recurrence.setChecked(self.settings.expand_recurrence_locally)
+        
         # Botones para guardar cambios
         button_layout = QHBoxLayout()
         save_button = QPushButton("Guardar Cambios")
@@ -385,10 +541,60 @@ class DevPanel(QDialog):
         
         layout.addWidget(title)
         layout.addWidget(self.auto_refresh)
+        layout.addWidget(self.expand_recurrence)
         layout.addLayout(button_layout)
         
         return section
 
+    def _create_diagnostics_section(self):
+        """Crea la sección de herramientas de diagnóstico"""
+        section = QFrame()
+        section.setFrameShape(QFrame.Shape.StyledPanel)
+        
+        layout = QVBoxLayout(section)
+        
+        # Título
+        title = QLabel("Diagnóstico")
+        title.setStyleSheet("font-weight: bold; font-size: 14px;")
+        
+        # Checkbox para escribir trazas (se abren en chrome://tracing o ui.perfetto.dev)
+        self.enable_tracing = QCheckBox("Registrar trazas de acciones (logs/traces)")
+        self.enable_tracing.setChecked(self.settings.enable_tracing)
+        
+        # Perfilador por muestreo: sigue activo aunque se cierre el panel
+        profiler_layout = QHBoxLayout()
+        self.profiler_button = QPushButton()
+        self.profiler_button.clicked.connect(self.toggle_profiler)
+        self.profiler_status = QLabel()
+        self.profiler_status.setWordWrap(True)
+        profiler_layout.addWidget(self.profiler_button)
+        profiler_layout.addWidget(self.profiler_status, 1)
+        self._update_profiler_controls()
+        
+        layout.addWidget(title)
+        layout.addWidget(self.enable_tracing)
+        layout.addLayout(profiler_layout)
+        
+        return section
+
+    def toggle_profiler(self):
+        """Inicia o detiene el perfilador y muestra dónde quedó el resultado"""
+        if profiler.running:
+            profiler.stop()
+        else:
+            profiler.start()
+        self._update_profiler_controls()
+
+    def _update_profiler_controls(self):
+        if profiler.running:
+            self.profiler_button.setText("Detener perfilado")
+            self.profiler_status.setText("Muestreando todos los hilos...")
+        else:
+            self.profiler_button.setText("Iniciar perfilado")
+            self.profiler_status.setText(
+                f"Último perfil: {profiler.path}" if profiler.path else "Pilas plegadas en logs/profiles"
+            )
+
     def _create_button_section(self):
         """Crea la sección de botones de acción"""
         section = QFrame()
@@ -411,11 +617,15 @@ class DevPanel(QDialog):
         try:
             # Actualizar configuración
             self.settings.use_mock_api = self.use_mock_api.isChecked()
+            self.settings.use_local_analytics = self.use_local_analytics.isChecked()
             self.settings.auto_refresh_enabled = self.auto_refresh.isChecked()
+            self.settings.expand_recurrence_locally = self.expand_recurrence.isChecked()
+            self.settings.enable_tracing = self.enable_tracing.isChecked()
             self.settings.mock_api_response = self.mock_api_response.toPlainText()
             
             # Guardar configuración
             self.settings.save()
+            tracer.configure(self.settings.enable_tracing)
             
             # Notificar al usuario
             logger.info("Configuración guardada exitosamente")
@@ -480,6 +690,9 @@ class DevPanel(QDialog):
         if hasattr(self, 'log_viewer') and hasattr(self.log_viewer, 'update_theme'):
             self.log_viewer.update_theme()
             
+        if hasattr(self, 'metrics_view'):
+            self.metrics_view.update_theme()
+            
     def update_theme(self):
         """Actualiza los estilos cuando cambia el tema"""
         self.apply_theme() 
\ No newline at end of file
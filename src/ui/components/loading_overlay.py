@@ -1,5 +1,5 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PyQt6.QtCore import Qt, QTimer, QPointF, QRectF
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton
+from PyQt6.QtCore import Qt, QTimer, QPointF, QRectF, pyqtSignal
 from PyQt6.QtGui import QPainter, QPainterPath, QColor, QPen, QLinearGradient
 from datetime import datetime
 import logging
@@ -98,6 +98,8 @@ class GenericOverlay(QWidget):
         self.hide()
 
 class LoadingOverlay(GenericOverlay):
+    cancelRequested = pyqtSignal()  # El usuario pulsó "Cancelar"
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.start_time = None
@@ -125,18 +127,27 @@ class LoadingOverlay(GenericOverlay):
             }
         """)
         
+        # Botón de cancelar (solo visible en operaciones cancelables)
+        self.cancel_button = QPushButton("Cancelar")
+        self.cancel_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.cancel_button.clicked.connect(self.cancelRequested.emit)
+        self.cancel_button.hide()
+        
         # Agregar labels al layout
         self.status_layout.addWidget(self.status_label, alignment=Qt.AlignmentFlag.AlignCenter)
         self.status_layout.addWidget(self.time_label, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.status_layout.addWidget(self.cancel_button, alignment=Qt.AlignmentFlag.AlignCenter)
         
-        # Reemplazar el contenido del layout principal
-        layout = QVBoxLayout(self)
-        layout.addStretch()
-        layout.addLayout(self.status_layout)
-        layout.addStretch()
+        # Insertar en el layout principal, antes del último stretch
+        layout = self.layout()
+        layout.insertLayout(layout.count() - 1, self.status_layout)
         
-    def start(self, initial_status="Iniciando análisis..."):
+    def start(self, initial_status="Iniciando análisis...", cancellable=False):
+        if self.parent():
+            self.resize(self.parent().size())
+        self.cancel_button.setVisible(cancellable)
         self.show()
+        self.raise_()
         self.status_label.setText(initial_status)
         self.start_time = datetime.now()
         self.timer.start(1000)
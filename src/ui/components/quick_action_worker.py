@@ -0,0 +1,66 @@
+from PyQt6.QtCore import pyqtSignal
+from utils.logger import logger
+from core.event_encoding import fingerprint_events
+from core.cancellation import OperationCancelled, OperationTimeout
+from config.constants import CALENDAR_STEP_TIMEOUT, AI_STEP_TIMEOUT
+from .analysis_worker import AnalysisWorker
+
+class QuickActionWorker(AnalysisWorker):
+    """Ejecuta Optimizar/Sugerir fuera del hilo de la interfaz"""
+    cancelled = pyqtSignal()  # El proceso se detuvo a petición del usuario
+
+    def __init__(self, calendar_analyzer, ai_assistant, build_prompt):
+        super().__init__(calendar_analyzer)
+        self.ai_assistant = ai_assistant
+        self.build_prompt = build_prompt  # events -> prompt
+
+    def run(self):
+        """Obtiene los eventos, arma el prompt y consulta a la IA"""
+        self._is_running = True
+        try:
+            events = self._execute_step(
+                "Obtención de eventos",
+                lambda cancel_token: self.calendar_analyzer.calendar_manager.get_events(),
+                timeout=CALENDAR_STEP_TIMEOUT
+            )
+            if not self._is_running:
+                self.cancelled.emit()
+                return
+
+            if not events:
+                self.finished.emit("No hay eventos para analizar. Agrega algunos eventos a tu calendario primero.")
+                return
+
+            prompt = self._execute_step(
+                "Preparación de eventos",
+                lambda cancel_token: self.build_prompt(events)
+            )
+            if not self._is_running:
+                self.cancelled.emit()
+                return
+
+            # Cacheado mientras los eventos no cambien
+            response = self._execute_step(
+                "Consulta a la IA",
+                lambda cancel_token: self.ai_assistant.process_message(
+                    prompt,
+                    cache_fingerprint=fingerprint_events(events),
+                    cancel_token=cancel_token
+                ),
+                timeout=AI_STEP_TIMEOUT
+            )
+            if not self._is_running:
+                self.cancelled.emit()
+                return
+
+            self.finished.emit(response)
+
+        except OperationTimeout:
+            self.error.emit(f"Tiempo de espera agotado en {self._current_step}")
+        except OperationCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            logger.error(f"Error en paso '{self._current_step}': {str(e)}")
+            self.error.emit(f"Error en {self._current_step}: {str(e)}")
+        finally:
+            self._is_running = False
@@ -1,22 +1,33 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel
 from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
-from PyQt6.QtCore import QTimer, QPointF, Qt
-import psutil
+from PyQt6.QtCore import QPointF, Qt
 from PyQt6.QtGui import QPainter, QColor, QFont
+from utils.ring_buffer import RingBuffer
+from ..workers.resource_sampler import ResourceSampler
 
 class ResourceMonitor(QWidget):
+    HISTORY_SIZE = 300  # Puntos que se conservan (uno por segundo)
+    VISIBLE_SECONDS = 60
+    TOP_THREADS = 5
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumHeight(300)
         self.cpu_series = QLineSeries()
+        self.process_cpu_series = QLineSeries()
         self.memory_series = QLineSeries()
         self.is_monitoring = True
+        self.sample_count = 0
+        # Historial en búferes circulares; las series se reemplazan de una vez
+        self.history = {
+            key: RingBuffer(self.HISTORY_SIZE)
+            for key in ('time', 'system_cpu', 'process_cpu', 'memory_percent')
+        }
         self.init_ui()
 
-        # Timer para actualizar datos
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_data)
-        self.update_timer.start(1000)
+        # Las muestras se toman en otro hilo mientras el monitor está visible
+        self.sampler = ResourceSampler(interval=1.0)
+        self.sampler.sampled.connect(self.update_data)
 
     def init_ui(self):
         main_layout = QVBoxLayout(self)
@@ -30,9 +41,11 @@ class ResourceMonitor(QWidget):
 
         # Configurar series
         self.cpu_series.setName("CPU")
+        self.process_cpu_series.setName("CPU proceso")
         self.memory_series.setName("Memoria")
 
         self.chart.addSeries(self.cpu_series)
+        self.chart.addSeries(self.process_cpu_series)
         self.chart.addSeries(self.memory_series)
 
         # Configurar ejes
@@ -49,16 +62,21 @@ class ResourceMonitor(QWidget):
         self.chart.addAxis(self.axis_x, Qt.AlignmentFlag.AlignBottom)
         self.chart.addAxis(self.axis_y, Qt.AlignmentFlag.AlignLeft)
 
-        self.cpu_series.attachAxis(self.axis_x)
-        self.cpu_series.attachAxis(self.axis_y)
-        self.memory_series.attachAxis(self.axis_x)
-        self.memory_series.attachAxis(self.axis_y)
+        for series in (self.cpu_series, self.process_cpu_series, self.memory_series):
+            series.attachAxis(self.axis_x)
+            series.attachAxis(self.axis_y)
 
         # Crear chart view
         chart_view = QChartView(self.chart)
         chart_view.setRenderHint(QPainter.RenderHint.Antialiasing)
         main_layout.addWidget(chart_view)
 
+        # Desglose del proceso: memoria, descriptores, GC e hilos con más CPU
+        self.details_label = QLabel("Esperando la primera muestra...")
+        self.details_label.setFont(QFont("monospace", 9))
+        self.details_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        main_layout.addWidget(self.details_label)
+
         # Añadir botones de control
         buttons_layout = QHBoxLayout()
         
@@ -74,44 +92,85 @@ class ResourceMonitor(QWidget):
         
         main_layout.addLayout(buttons_layout)
 
+    def showEvent(self, event):
+        if self.is_monitoring:
+            self._start_sampler()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._stop_sampler()
+        super().hideEvent(event)
+
+    def closeEvent(self, event):
+        self._stop_sampler()
+        super().closeEvent(event)
+
+    def _start_sampler(self):
+        if not self.sampler.isRunning():
+            self.sampler.start()
+
+    def _stop_sampler(self):
+        if self.sampler.isRunning():
+            self.sampler.stop()
+            self.sampler.wait()
+
     def toggle_monitoring(self):
         self.is_monitoring = not self.is_monitoring
         if self.is_monitoring:
             self.pause_button.setText("Pausar")
-            self.update_timer.start()
+            self._start_sampler()
         else:
             self.pause_button.setText("Reanudar")
-            self.update_timer.stop()
+            self._stop_sampler()
 
     def reset_monitoring(self):
         # Limpiar datos
+        for buffer in self.history.values():
+            buffer.clear()
+        self.sample_count = 0
         self.cpu_series.clear()
+        self.process_cpu_series.clear()
         self.memory_series.clear()
         # Resetear el rango del eje X
-        self.axis_x.setRange(0, 60)
+        self.axis_x.setRange(0, self.VISIBLE_SECONDS)
         # Asegurar que el monitoreo está activo
         self.is_monitoring = True
         self.pause_button.setText("Pausar")
-        self.update_timer.start()
+        if self.isVisible():
+            self._start_sampler()
 
-    def update_data(self):
+    def update_data(self, sample: dict):
+        """Recibe una muestra del ResourceSampler (ya en el hilo de la interfaz)"""
         if not self.is_monitoring:
             return
-            
-        cpu_usage = psutil.cpu_percent()
-        memory_usage = psutil.Process().memory_percent()
-        
-        current_time = self.cpu_series.count()
-        
-        # Actualizar series
-        self.cpu_series.append(QPointF(current_time, cpu_usage))
-        self.memory_series.append(QPointF(current_time, memory_usage))
+
+        current_time = self.sample_count
+        self.sample_count += 1
+        self.history['time'].append(current_time)
+        for key in ('system_cpu', 'process_cpu', 'memory_percent'):
+            self.history[key].append(sample[key])
+
+        # Reemplazar cada serie de una vez en lugar de añadir y recortar punto a punto
+        times = self.history['time'].values()
+        for series, key in ((self.cpu_series, 'system_cpu'),
+                            (self.process_cpu_series, 'process_cpu'),
+                            (self.memory_series, 'memory_percent')):
+            series.replace([QPointF(x, y) for x, y in zip(times, self.history[key].values())])
 
         # Actualizar el rango del eje X para crear efecto de desplazamiento
-        if current_time > 60:
-            self.axis_x.setRange(current_time - 60, current_time)
-            
-            # Mantener solo los últimos 300 puntos para evitar uso excesivo de memoria
-            while self.cpu_series.count() > 300:
-                self.cpu_series.remove(0)
-                self.memory_series.remove(0) 
\ No newline at end of file
+        if current_time > self.VISIBLE_SECONDS:
+            self.axis_x.setRange(current_time - self.VISIBLE_SECONDS, current_time)
+
+        self.details_label.setText(self._format_details(sample))
+
+    def _format_details(self, sample: dict) -> str:
+        gc_stats = sample['gc']
+        lines = [
+            f"RSS {sample['rss_mb']:.1f} MB  |  descriptores {sample['fds']}  |  "
+            f"archivos {sample['open_files']}  |  sockets {sample['sockets']}",
+            f"GC pendientes {gc_stats['counts']}  recolecciones {gc_stats['collections']}  "
+            f"pausa {gc_stats['pause_ms']:.1f} ms en {gc_stats['pauses']}",
+        ]
+        for thread in sample['threads'][:self.TOP_THREADS]:
+            lines.append(f"{thread['cpu']:5.1f}%  {thread['name']}")
+        return "\n".join(lines)
@@ -9,6 +9,7 @@ from .styles.theme import Theme
 from core.google_auth import GoogleAuthManager
 from core.google_calendar import GoogleCalendarManager
 from utils.logger import logger
+from utils.tracing import tracer
 from .components.calendar_widget import CalendarWidget
 from .components.chat_sidebar import ChatSidebar
 from datetime import datetime, timezone
@@ -32,6 +33,7 @@ class MainWindow(QMainWindow):
         self.chat_sidebar = None
         self.settings = Settings()
         self.settings.settingsChanged.connect(self.on_settings_changed)  # Conectar a la señal
+        tracer.configure(self.settings.enable_tracing)
         self.clean_logs()
         self.set_app_icon()
         self.init_ui()
@@ -323,6 +325,7 @@ class MainWindow(QMainWindow):
         response = "Respuesta del asistente..."
         self.chat_sidebar.add_message(response)
 
+    @tracer.traced('main.on_month_changed', cat='ui')
     def on_month_changed(self, new_month: datetime):
         """Maneja el cambio de mes en el calendario"""
         if self.calendar_manager:
@@ -405,6 +408,8 @@ class MainWindow(QMainWindow):
         """Manejar cambios en la configuración"""
         self.update_api_status()  # Actualizar indicador de API
         # Actualizar otros componentes que dependan de la configuración 
+        if self.calendar_manager:
+            self.calendar_manager.settings.load()
 
     def set_app_icon(self):
         """Establece el ícono de la aplicación"""
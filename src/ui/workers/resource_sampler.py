@@ -0,0 +1,103 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+import gc
+import os
+import threading
+import time
+import psutil
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ResourceSampler(QThread):
+    """Mide los recursos del proceso en un hilo propio y emite una muestra por intervalo.
+
+    psutil puede tardar (hilos, archivos abiertos, sockets), así que nada de
+    esto se ejecuta en el hilo de la interfaz; la señal llega encolada.
+    """
+    sampled = pyqtSignal(dict)
+
+    def __init__(self, interval: float = 1.0, parent=None):
+        super().__init__(parent)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._process = psutil.Process(os.getpid())
+        # net_connections() existe desde psutil 6; antes se llamaba connections()
+        self._connections = getattr(self._process, 'net_connections', None) or self._process.connections
+        self._thread_times = {}
+        self._gc_started = {}
+        self._gc_pause = 0.0
+        self._gc_collections = 0
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        self._stop.clear()
+        gc.callbacks.append(self._on_gc)
+        try:
+            # Primera lectura para que los porcentajes de CPU tengan referencia
+            psutil.cpu_percent(None)
+            self._process.cpu_percent(None)
+            self._thread_times = self._read_thread_times()
+            last = time.perf_counter()
+            while not self._stop.wait(self.interval):
+                now = time.perf_counter()
+                try:
+                    self.sampled.emit(self._sample(now - last))
+                except psutil.Error as e:
+                    logger.warning(f"No se pudieron leer los recursos del proceso: {e}")
+                last = now
+        finally:
+            gc.callbacks.remove(self._on_gc)
+
+    def _on_gc(self, phase, info):
+        # Se ejecuta en el hilo que dispara la recolección
+        tid = threading.get_ident()
+        if phase == 'start':
+            self._gc_started[tid] = time.perf_counter()
+        else:
+            started = self._gc_started.pop(tid, None)
+            if started is not None:
+                self._gc_pause += time.perf_counter() - started
+                self._gc_collections += 1
+
+    def _read_thread_times(self):
+        return {t.id: t.user_time + t.system_time for t in self._process.threads()}
+
+    def _sample(self, elapsed: float) -> dict:
+        process = self._process
+        with process.oneshot():
+            memory = process.memory_info()
+            sample = {
+                'system_cpu': psutil.cpu_percent(None),
+                'process_cpu': process.cpu_percent(None),
+                'memory_percent': process.memory_percent(),
+                'rss_mb': memory.rss / (1024 * 1024),
+                'open_files': len(process.open_files()),
+                'sockets': len(self._connections(kind='inet')),
+                'fds': process.num_fds() if hasattr(process, 'num_fds') else process.num_handles(),
+            }
+
+        # CPU por hilo: tiempo consumido desde la muestra anterior
+        names = {t.native_id: t.name for t in threading.enumerate()}
+        times = self._read_thread_times()
+        threads = []
+        for tid, total in times.items():
+            used = total - self._thread_times.get(tid, total)
+            threads.append({
+                'id': tid,
+                'name': names.get(tid, f"hilo {tid}"),
+                'cpu': used / elapsed * 100 if elapsed > 0 else 0.0,
+            })
+        self._thread_times = times
+        threads.sort(key=lambda t: t['cpu'], reverse=True)
+        sample['threads'] = threads
+
+        # Pendientes y recolecciones por generación; pausas medidas desde que se inició el muestreo
+        sample['gc'] = {
+            'counts': gc.get_count(),
+            'collections': [stats['collections'] for stats in gc.get_stats()],
+            'pause_ms': self._gc_pause * 1000,
+            'pauses': self._gc_collections,
+        }
+        return sample
@@ -1,6 +1,7 @@
 from PyQt6.QtCore import QObject, pyqtSignal
 from collections import defaultdict
 import re
+from utils.metrics import metrics
 
 class SearchWorker(QObject):
     finished = pyqtSignal(list)
@@ -40,6 +41,7 @@ class SearchWorker(QObject):
             return 1
         return 2
 
+    @metrics.timed('search.search')
     def search(self):
         try:
             events = self.calendar_manager.get_events(log_raw=False)
@@ -0,0 +1,78 @@
+import mmap
+import os
+from typing import List, Optional
+
+BLOCK_SIZE = 64 * 1024
+
+def _decode(raw: bytes) -> str:
+    # Los logs son utf-8; latin1 solo para archivos antiguos escritos con otra codificación
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return raw.decode('latin1')
+
+def tail_lines(path: str, count: int, block_size: int = BLOCK_SIZE) -> List[str]:
+    """Últimas `count` líneas del archivo, leyendo bloques desde el final.
+
+    Solo se lee lo necesario para esas líneas, no el archivo completo.
+    """
+    if count <= 0:
+        return []
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        blocks = []
+        newlines = 0
+        # Una línea más de las pedidas para saber dónde empieza la primera
+        while position > 0 and newlines <= count:
+            size = min(block_size, position)
+            position -= size
+            f.seek(position)
+            block = f.read(size)
+            blocks.append(block)
+            newlines += block.count(b'\n')
+    data = b''.join(reversed(blocks))
+    lines = data.splitlines()
+    if position > 0:
+        lines = lines[1:]  # La primera puede estar cortada por el bloque
+    return [_decode(line) for line in lines[-count:]]
+
+def scan_log(path: str, level: Optional[str] = None, contains: Optional[str] = None,
+             limit: Optional[int] = None) -> List[str]:
+    """Líneas del log que tienen el nivel y/o el texto indicados (las `limit` más recientes).
+
+    El archivo se proyecta en memoria y se salta de coincidencia en
+    coincidencia con rfind, desde el final, sin partirlo en líneas. El nivel
+    se busca con el separador de LOG_FORMAT (' - ERROR - '); el texto
+    distingue mayúsculas.
+    """
+    needles = []
+    if level:
+        needles.append(f" - {level.upper()} - ".encode('utf-8'))
+    if contains:
+        needles.append(contains.encode('utf-8'))
+    if not needles:
+        return tail_lines(path, limit) if limit else []
+    if os.path.getsize(path) == 0:
+        return []
+
+    # Se salta con el patrón más largo (suele ser el más selectivo) y se comprueban los demás
+    needles.sort(key=len, reverse=True)
+    anchor, others = needles[0], needles[1:]
+    matches = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        end = len(mm)
+        while limit is None or len(matches) < limit:
+            index = mm.rfind(anchor, 0, end)
+            if index < 0:
+                break
+            line_start = mm.rfind(b'\n', 0, index) + 1
+            line_end = mm.find(b'\n', index)
+            if line_end < 0:
+                line_end = len(mm)
+            line = mm[line_start:line_end]
+            if all(needle in line for needle in others):
+                matches.append(_decode(line.rstrip(b'\r')))
+            end = line_start
+    matches.reverse()
+    return matches
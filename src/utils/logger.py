@@ -1,54 +1,219 @@
+import atexit
+import copy
+import gzip
+import json
 import logging
 import os
-from datetime import datetime
+import queue
+import shutil
+import time
+from datetime import datetime, timedelta
+from logging.handlers import BaseRotatingHandler, QueueHandler, QueueListener
 
 # Definir constantes aquí en lugar de importarlas
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 LOG_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logs')
+LOG_FILE = os.path.join(LOG_DIRECTORY, 'calendar_app.log')
+EVENTS_LOG_FILE = os.path.join(LOG_DIRECTORY, 'events.log')
+LOG_ARCHIVE_DIRECTORY = os.path.join(LOG_DIRECTORY, 'archive')
+LOG_ARCHIVE_INDEX = os.path.join(LOG_ARCHIVE_DIRECTORY, 'index.json')
+# Rotación: por tamaño (MB), a medianoche, y retención de los archivos comprimidos
+LOG_MAX_BYTES = int(float(os.getenv('LOG_MAX_MB', '5')) * 1024 * 1024)
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '14'))
+LOG_RETENTION_DAYS = int(os.getenv('LOG_RETENTION_DAYS', '30'))
 
-# Configurar logger
-logger = logging.getLogger('CalendarAI')
-logger.setLevel(logging.DEBUG)
+_listener = None
 
-# Crear directorio de logs si no existe
-os.makedirs(LOG_DIRECTORY, exist_ok=True)
+class AsyncQueueHandler(QueueHandler):
+    """Encola los registros sin formatearlos en el hilo que loguea.
 
-# Configurar handler para archivo
-log_file = os.path.join(LOG_DIRECTORY, f'calendar_app_{datetime.now().strftime("%Y%m%d")}.log')
-file_handler = logging.FileHandler(log_file)
-file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
-logger.addHandler(file_handler)
+    Solo se resuelve el mensaje (msg % args) para no retener objetos mutables;
+    el formato completo y la escritura se hacen en el hilo del listener.
+    """
 
-# Configurar handler para consola
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
-logger.addHandler(console_handler)
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            # Los tracebacks retienen frames: se convierten a texto aquí
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class CompressedRotatingFileHandler(BaseRotatingHandler):
+    """Archivo de log que rota por tamaño y a medianoche.
+
+    El archivo rotado se comprime con gzip en LOG_ARCHIVE_DIRECTORY y se
+    apunta en index.json; se conservan como mucho `backup_count` archivos
+    por log y ninguno más antiguo que `retention_days`.
+    """
+
+    def __init__(self, filename, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT,
+                 retention_days=LOG_RETENTION_DAYS, archive_dir=LOG_ARCHIVE_DIRECTORY):
+        super().__init__(filename, 'a', encoding='utf-8', delay=True)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.retention_days = retention_days
+        self.archive_dir = archive_dir
+        self.index_file = os.path.join(archive_dir, 'index.json')
+        # Un archivo que viene de otro día rota con el primer registro
+        opened_at = os.path.getmtime(filename) if os.path.exists(filename) else time.time()
+        self.rollover_at = self._next_midnight(opened_at)
+
+    @staticmethod
+    def _next_midnight(timestamp):
+        day = datetime.fromtimestamp(timestamp).date() + timedelta(days=1)
+        return datetime.combine(day, datetime.min.time()).timestamp()
+
+    def shouldRollover(self, record):
+        now = time.time()
+        if now >= self.rollover_at:
+            if os.path.exists(self.baseFilename):
+                return True
+            # Nada que rotar: programar la siguiente medianoche igualmente
+            self.rollover_at = self._next_midnight(now)
+        if self.max_bytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            # Sin volver a formatear el registro: el archivo puede pasarse en una línea
+            if self.stream.tell() >= self.max_bytes:
+                return True
+        return False
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        now = time.time()
+        reason = 'time' if now >= self.rollover_at else 'size'
+        self.rollover_at = self._next_midnight(now)
+        if not os.path.exists(self.baseFilename) or os.path.getsize(self.baseFilename) == 0:
+            return
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(self.baseFilename))[0]
+        name = f"{stem}_{datetime.fromtimestamp(now).strftime('%Y%m%d-%H%M%S')}.log.gz"
+        archive = os.path.join(self.archive_dir, name)
+        suffix = 1
+        while os.path.exists(archive):
+            archive = os.path.join(self.archive_dir, name.replace('.log.gz', f'-{suffix}.log.gz'))
+            suffix += 1
+
+        size = os.path.getsize(self.baseFilename)
+        with open(self.baseFilename, 'rb') as source, gzip.open(archive, 'wb') as target:
+            shutil.copyfileobj(source, target)
+        os.remove(self.baseFilename)
+
+        entries = self._read_index()
+        entries.append({
+            'file': os.path.basename(archive),
+            'log': os.path.basename(self.baseFilename),
+            'rotated_at': datetime.fromtimestamp(now).isoformat(timespec='seconds'),
+            'reason': reason,
+            'size': size,
+            'compressed_size': os.path.getsize(archive),
+        })
+        self._write_index(self._apply_retention(entries, now))
+
+    def _apply_retention(self, entries, now):
+        """Borra los archivos que sobran o caducaron y devuelve el índice restante"""
+        log_name = os.path.basename(self.baseFilename)
+        cutoff = datetime.fromtimestamp(now - self.retention_days * 86400).isoformat(timespec='seconds')
+        own = [e for e in entries if e['log'] == log_name]
+        keep = own[-self.backup_count:] if self.backup_count > 0 else own
+        if self.retention_days > 0:
+            keep = [e for e in keep if e['rotated_at'] >= cutoff]
+        for entry in own:
+            if entry not in keep:
+                try:
+                    os.remove(os.path.join(self.archive_dir, entry['file']))
+                except OSError:
+                    pass
+        return [e for e in entries if e['log'] != log_name or e in keep]
+
+    def _read_index(self):
+        try:
+            with open(self.index_file, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _write_index(self, entries):
+        # Escritura atómica para no dejar el índice a medias si la app se cierra
+        tmp = f"{self.index_file}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp, self.index_file)
+
+def _create_sinks():
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+
+    # Un único handler por archivo: antes cada registro se escribía dos veces
+    file_handler = CompressedRotatingFileHandler(LOG_FILE)
+    file_handler.setFormatter(formatter)
+
+    # Además, los registros de 'events' van a su propio archivo
+    events_handler = CompressedRotatingFileHandler(EVENTS_LOG_FILE)
+    events_handler.setFormatter(formatter)
+    events_handler.addFilter(logging.Filter('events'))
+
+    return [console_handler, file_handler, events_handler]
 
 def setup_logger():
-    """Setup application loggers"""
+    """Configura el pipeline de logging: una cola en el logger raíz y un
+    listener en segundo plano con los sinks (consola y archivos).
+
+    Es idempotente: llamadas posteriores devuelven el logger raíz sin
+    volver a añadir handlers.
+    """
+    global _listener
+    root = logging.getLogger()
+    if _listener is not None:
+        return root
+
     os.makedirs(LOG_DIRECTORY, exist_ok=True)
-    
-    # Configurar logger principal
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-    
-    # Handler para consola
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
-    logger.addHandler(console_handler)
-    
-    # Handler para archivo general
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
-    logger.addHandler(file_handler)
-    
-    # Handler específico para eventos
-    events_logger = logging.getLogger('events')
-    events_handler = logging.FileHandler(os.path.join(LOG_DIRECTORY, 'events.log'))
-    events_handler.setFormatter(logging.Formatter(LOG_FORMAT))
-    events_logger.addHandler(events_handler)
-    
-    return logger
+    root.setLevel(logging.INFO)
+
+    log_queue = queue.SimpleQueue()  # Sin límite: quien loguea nunca espera
+    root.addHandler(AsyncQueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, *_create_sinks(), respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return root
+
+def add_sink(handler: logging.Handler):
+    """Añade un handler que se ejecuta en el hilo del listener"""
+    if _listener is None:
+        logging.getLogger().addHandler(handler)
+        return
+    _listener.handlers = _listener.handlers + (handler,)
+
+def remove_sink(handler: logging.Handler):
+    """Quita un handler añadido con add_sink"""
+    if _listener is None:
+        logging.getLogger().removeHandler(handler)
+        return
+    _listener.handlers = tuple(h for h in _listener.handlers if h is not handler)
+
+def shutdown_logging():
+    """Vacía la cola y detiene el listener (se llama al salir)"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        try:
+            handler.flush()
+        except (OSError, ValueError):
+            # El stream ya estaba cerrado (p. ej. la consola capturada por pytest)
+            pass
+    _listener = None
 
 logger = setup_logger()
-events_logger = logging.getLogger('events') 
\ No newline at end of file
+events_logger = logging.getLogger('events')
@@ -0,0 +1,153 @@
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# Muestras recientes que guarda cada histograma para los percentiles
+HISTOGRAM_RESERVOIR = 2048
+
+class Counter:
+    """Contador acumulado"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self.value += amount
+
+    def reset(self):
+        with self._lock:
+            self.value = 0
+
+    def summary(self) -> Dict:
+        return {'type': 'counter', 'count': self.value}
+
+class Histogram:
+    """Distribución de valores: totales exactos y percentiles de las últimas muestras"""
+
+    def __init__(self, unit: str = ''):
+        self._lock = threading.Lock()
+        self.unit = unit
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.total = 0.0
+            self.min = None
+            self.max = None
+            self._samples = deque(maxlen=HISTOGRAM_RESERVOIR)
+
+    def observe(self, value: float):
+        with self._lock:
+            self.count += 1
+            self.total += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+            self._samples.append(value)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        return _percentile(samples, p)
+
+    def summary(self) -> Dict:
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total, low, high = self.count, self.total, self.min, self.max
+        return {
+            'type': 'histogram',
+            'unit': self.unit,
+            'count': count,
+            'mean': total / count if count else None,
+            'min': low,
+            'max': high,
+            'p50': _percentile(samples, 50),
+            'p90': _percentile(samples, 90),
+            'p99': _percentile(samples, 99),
+        }
+
+def _percentile(samples, p):
+    if not samples:
+        return None
+    # Interpolación lineal entre las dos muestras más cercanas
+    position = (len(samples) - 1) * p / 100
+    lower = int(position)
+    upper = min(lower + 1, len(samples) - 1)
+    return samples[lower] + (samples[upper] - samples[lower]) * (position - lower)
+
+class MetricsRegistry:
+    """Registro de métricas con nombre ('calendar.get_events', 'db.execute_query'...).
+
+    Los temporizadores son histogramas en milisegundos. Es seguro usarlo
+    desde cualquier hilo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get(self, name, factory):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, factory())
+        return metric
+
+    def counter(self, name: str) -> Counter:
+        return self._get(name, Counter)
+
+    def histogram(self, name: str, unit: str = '') -> Histogram:
+        return self._get(name, lambda: Histogram(unit))
+
+    @contextmanager
+    def timer(self, name: str):
+        """Mide el bloque y lo registra en el histograma `name` (ms)"""
+        histogram = self.histogram(name, 'ms')
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram.observe((time.perf_counter() - start) * 1000)
+
+    def timed(self, name: str):
+        """Decorador equivalente a envolver la función en timer(name)"""
+        def decorator(func):
+            histogram = self.histogram(name, 'ms')
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    histogram.observe((time.perf_counter() - start) * 1000)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Resumen de todas las métricas, ordenado por nombre"""
+        with self._lock:
+            items = sorted(self._metrics.items())
+        return {name: metric.summary() for name, metric in items}
+
+    def reset(self):
+        """Vacía las métricas manteniendo las ya registradas (los decoradores las conservan)"""
+        with self._lock:
+            registered = list(self._metrics.values())
+        for metric in registered:
+            metric.reset()
+
+    def export_json(self, path: str):
+        """Guarda el resumen actual en un archivo JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'timestamp': time.time(), 'metrics': self.snapshot()}, f, indent=2)
+
+metrics = MetricsRegistry()
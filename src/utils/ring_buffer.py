@@ -0,0 +1,42 @@
+from array import array
+from typing import List
+
+class RingBuffer:
+    """Búfer circular de tamaño fijo sobre un array de doubles.
+
+    append es O(1) y no mueve datos: al llenarse sobrescribe el valor más
+    antiguo. values() devuelve el contenido en orden de llegada.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = array('d', bytes(8 * capacity))
+        self._start = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value: float):
+        index = (self._start + self._count) % self.capacity
+        self._data[index] = value
+        if self._count < self.capacity:
+            self._count += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def clear(self):
+        self._start = 0
+        self._count = 0
+
+    def last(self) -> float:
+        if not self._count:
+            raise IndexError('RingBuffer vacío')
+        return self._data[(self._start + self._count - 1) % self.capacity]
+
+    def values(self) -> List[float]:
+        end = self._start + self._count
+        if end <= self.capacity:
+            return self._data[self._start:end].tolist()
+        # Dos tramos: del inicio al final del array y del principio hasta completar
+        return self._data[self._start:].tolist() + self._data[:end - self.capacity].tolist()
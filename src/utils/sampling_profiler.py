@@ -0,0 +1,105 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional
+from utils.logger import logger, LOG_DIRECTORY
+
+PROFILE_DIRECTORY = os.path.join(LOG_DIRECTORY, 'profiles')
+# Intervalo entre muestras (segundos)
+SAMPLE_INTERVAL = 0.005
+# Profundidad máxima de pila que se guarda por muestra
+MAX_STACK_DEPTH = 128
+
+class SamplingProfiler:
+    """Perfilador por muestreo de todos los hilos del proceso.
+
+    Un hilo aparte lee la pila de cada hilo con sys._current_frames() cada
+    `interval` segundos; el código perfilado no se instrumenta. Al detenerlo
+    se escribe un archivo de pilas plegadas ('hilo;f1;f2 N') en
+    logs/profiles/, compatible con flamegraph.pl, speedscope o inferno.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = 0
+        self.path = None
+        self._stacks: Counter = Counter()
+        self._labels: Dict = {}
+        self._thread = None
+        self._stop = threading.Event()
+        self._started_at = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self.samples = 0
+        self._stacks = Counter()
+        self._stop.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        logger.info(f"Perfilado iniciado (muestra cada {self.interval * 1000:.0f} ms)")
+
+    def stop(self) -> Optional[str]:
+        """Detiene el muestreo y escribe las pilas plegadas; devuelve la ruta del archivo"""
+        if not self.running:
+            return None
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        elapsed = time.perf_counter() - self._started_at
+        self.path = self._write()
+        logger.info(
+            f"Perfilado detenido: {self.samples} muestras en {elapsed:.1f}s, "
+            f"{len(self._stacks)} pilas distintas -> {self.path}"
+        )
+        return self.path
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for tid, frame in sys._current_frames().items():
+                if tid == own:
+                    continue
+                # Solo los objetos de código: las etiquetas se calculan al escribir
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                self._stacks[(names.get(tid) or f"thread-{tid}", tuple(stack))] += 1
+            self.samples += 1
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            # Mismo formato que py-spy; ';' separa marcos en el formato plegado
+            name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            label = self._labels[code] = name.replace(';', ':')
+        return label
+
+    def folded_stacks(self) -> Dict[str, int]:
+        """Pilas acumuladas como 'hilo;raíz;...;hoja' -> muestras"""
+        folded = Counter()
+        for (thread_name, stack), count in self._stacks.items():
+            frames = [thread_name.replace(';', ':')]
+            frames.extend(self._label(code) for code in reversed(stack))
+            folded[';'.join(frames)] += count
+        return folded
+
+    def _write(self) -> str:
+        os.makedirs(PROFILE_DIRECTORY, exist_ok=True)
+        path = os.path.join(PROFILE_DIRECTORY, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.folded")
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.folded_stacks().items()):
+                f.write(f"{stack} {count}\n")
+        return path
+
+profiler = SamplingProfiler()
@@ -0,0 +1,271 @@
+import atexit
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from utils.logger import logger, LOG_DIRECTORY
+
+TRACE_DIRECTORY = os.path.join(LOG_DIRECTORY, 'traces')
+# Cada cuánto (segundos) el hilo escritor vuelca los eventos pendientes
+TRACE_FLUSH_INTERVAL = 1.0
+
+def _now_us() -> float:
+    # perf_counter es monótono y común a todos los hilos del proceso
+    return time.perf_counter_ns() / 1000
+
+class TraceContext:
+    """Lo que un hilo pasa a otro para continuar la misma traza.
+
+    Si se capturó dentro de un span (`tracer.current()`), el span que lo
+    reciba se enlaza con una flecha de flujo desde ese punto.
+    """
+
+    def __init__(self, trace_id: int, source_tid: Optional[int] = None, source_ts: Optional[float] = None):
+        self.trace_id = trace_id
+        self.source_tid = source_tid
+        self.source_ts = source_ts
+
+class _NullSpan:
+    """Span vacío cuando el trazado está desactivado"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Span:
+    """Intervalo en el hilo actual; se escribe como evento completo ('X')"""
+
+    def __init__(self, tracer, name, cat, parent, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.parent = parent
+        self.args = args
+
+    def set(self, **args):
+        """Añade argumentos al span (se ven al seleccionarlo en el visor)"""
+        self.args.update(args)
+
+    def __enter__(self):
+        stack = self.tracer._stack()
+        if self.parent is not None:
+            trace_id = self.parent.trace_id
+        elif stack:
+            trace_id = stack[-1]
+        else:
+            trace_id = next(self.tracer._ids)
+        stack.append(trace_id)
+        self.args['trace'] = trace_id
+        self.tid = self.tracer._thread_id()
+        self.start = _now_us()
+        if self.parent is not None and self.parent.source_tid is not None:
+            self.tracer._flow(self.parent, self.tid, self.start)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = _now_us()
+        self.tracer._stack().pop()
+        if exc_type is not None:
+            self.args['error'] = f"{exc_type.__name__}: {exc}"
+        self.tracer._record({
+            'name': self.name, 'cat': self.cat, 'ph': 'X',
+            'ts': self.start, 'dur': end - self.start,
+            'pid': self.tracer.pid, 'tid': self.tid, 'args': self.args,
+        })
+        return False
+
+class Action:
+    """Acción de usuario que empieza en un hilo y acaba en otro momento (evento asíncrono 'b'/'e')"""
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.context = TraceContext(next(tracer._ids))
+        self.ended = False
+        tracer._record({
+            'name': name, 'cat': cat, 'ph': 'b', 'id': self.context.trace_id,
+            'ts': _now_us(), 'pid': tracer.pid, 'tid': tracer._thread_id(),
+            'args': dict(args, trace=self.context.trace_id),
+        })
+
+    def end(self, **args):
+        if self.ended:
+            return
+        self.ended = True
+        self.tracer._record({
+            'name': self.name, 'cat': self.cat, 'ph': 'e', 'id': self.context.trace_id,
+            'ts': _now_us(), 'pid': self.tracer.pid, 'tid': self.tracer._thread_id(), 'args': args,
+        })
+
+class _NullAction:
+    context = None
+
+    def end(self, **args):
+        pass
+
+_NULL_ACTION = _NullAction()
+
+class Tracer:
+    """Spans de acciones de usuario en formato Chrome trace-event.
+
+    Los eventos se acumulan en memoria y un hilo aparte los añade al archivo
+    de logs/traces/ (se abre con chrome://tracing o ui.perfetto.dev). Con el
+    trazado desactivado span() y begin_action() no registran nada.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.pid = os.getpid()
+        self.path = None
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending: List[Dict] = []
+        self._named_threads = set()
+        self._file = None
+        self._writer = None
+        self._stop = threading.Event()
+        self._exit_registered = False
+
+    def configure(self, enabled: bool):
+        """Activa o desactiva el trazado; al activarlo se abre un archivo nuevo"""
+        if enabled and not self.enabled:
+            self._start()
+        elif not enabled and self.enabled:
+            self.stop()
+
+    def _start(self):
+        os.makedirs(TRACE_DIRECTORY, exist_ok=True)
+        self.path = os.path.join(TRACE_DIRECTORY, f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        # Formato de array JSON: el visor admite el archivo aunque falte el ']' final
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._file.write('[\n')
+        self._named_threads = set()
+        self._stop.clear()
+        self._writer = threading.Thread(target=self._write_loop, name='trace-writer', daemon=True)
+        self._writer.start()
+        if not self._exit_registered:
+            atexit.register(self.stop)
+            self._exit_registered = True
+        self.enabled = True
+        logger.info(f"Trazado activado: {self.path}")
+
+    def stop(self):
+        """Vuelca lo pendiente y cierra el archivo de traza"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._stop.set()
+        self._writer.join()
+        self._flush()
+        self._file.write(json.dumps({
+            'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'tid': 0, 'args': {'name': 'Calendar AI Assistant'}
+        }))
+        self._file.write('\n]\n')
+        self._file.close()
+        self._file = None
+        logger.info(f"Traza guardada en {self.path}")
+
+    def span(self, name: str, cat: str = 'app', parent: Optional[TraceContext] = None, **args):
+        """Span en el hilo actual. Hereda la traza del span que lo contiene o la de `parent`"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, cat, parent, args)
+
+    def traced(self, name: str, cat: str = 'app'):
+        """Decorador equivalente a envolver la función en span(name)"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, name, cat, None, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def begin_action(self, name: str, cat: str = 'action', **args):
+        """Inicia una acción que terminará con action.end() (posiblemente en otro hilo)"""
+        if not self.enabled:
+            return _NULL_ACTION
+        return Action(self, name, cat, args)
+
+    def current(self) -> Optional[TraceContext]:
+        """Contexto del span actual, para pasarlo a otro hilo"""
+        if not self.enabled:
+            return None
+        stack = self._stack()
+        if not stack:
+            return None
+        return TraceContext(stack[-1], self._thread_id(), _now_us())
+
+    def instant(self, name: str, cat: str = 'app', **args):
+        """Marca puntual en el hilo actual"""
+        if not self.enabled:
+            return
+        stack = self._stack()
+        if stack:
+            args['trace'] = stack[-1]
+        self._record({
+            'name': name, 'cat': cat, 'ph': 'i', 's': 't', 'ts': _now_us(),
+            'pid': self.pid, 'tid': self._thread_id(), 'args': args,
+        })
+
+    def name_thread(self, name: str):
+        """Nombre con el que aparece el hilo actual en el visor (p. ej. el de un QThread)"""
+        if not self.enabled:
+            return
+        tid = threading.get_ident()
+        with self._lock:
+            self._named_threads.add(tid)
+            self._pending.append({'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid, 'args': {'name': name}})
+
+    def _thread_id(self) -> int:
+        """Identificador del hilo actual; la primera vez se registra su nombre"""
+        tid = threading.get_ident()
+        if tid not in self._named_threads:
+            self.name_thread(threading.current_thread().name)
+        return tid
+
+    def _stack(self) -> List[int]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _flow(self, parent: TraceContext, tid: int, ts: float):
+        # Flecha desde el punto donde se capturó el contexto hasta este span
+        flow_id = next(self._ids)
+        self._record({'name': 'flow', 'cat': 'flow', 'ph': 's', 'id': flow_id,
+                      'ts': parent.source_ts, 'pid': self.pid, 'tid': parent.source_tid})
+        self._record({'name': 'flow', 'cat': 'flow', 'ph': 'f', 'bp': 'e', 'id': flow_id,
+                      'ts': ts, 'pid': self.pid, 'tid': tid})
+
+    def _record(self, event: Dict):
+        with self._lock:
+            self._pending.append(event)
+
+    def _write_loop(self):
+        while not self._stop.wait(TRACE_FLUSH_INTERVAL):
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            events, self._pending = self._pending, []
+        if events and self._file:
+            self._file.write(''.join(json.dumps(e, default=str) + ',\n' for e in events))
+            self._file.flush()
+
+tracer = Tracer()
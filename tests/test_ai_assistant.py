@@ -0,0 +1,15 @@
+from core.ai_assistant import AIAssistant
+
+
+def test_parse_function_call_accepts_known_function():
+    assert AIAssistant().parse_function_call('FUNCION: codigo_morse') == 'codigo_morse'
+
+
+def test_parse_function_call_rejects_invented_function():
+    assistant = AIAssistant()
+    assert assistant.is_function_call('funcion: traductor_klingon')
+    assert assistant.parse_function_call('funcion: traductor_klingon') is None
+
+
+def test_parse_function_call_ignores_text():
+    assert AIAssistant().parse_function_call('Hola, ¿en qué te ayudo?') is None
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.calendar_analytics import CalendarAnalytics, build_predictions_response
+from core.cancellation import CancellationToken, OperationCancelled
+from models.event import Event
+
+# Miércoles: la semana actual va a medias
+NOW = datetime(2025, 3, 19, 12, 0, tzinfo=timezone.utc)
+CURRENT_MONDAY = datetime(2025, 3, 17, 9, 0, tzinfo=timezone.utc)
+
+
+def make_event(start, hours):
+    event = Event()
+    event.title = 'Trabajo'
+    event.start_datetime = start
+    event.end_datetime = start + timedelta(hours=hours)
+    return event
+
+
+def week_events(weeks_ago, hours):
+    """Un evento de `hours` horas el lunes de hace `weeks_ago` semanas"""
+    return [make_event(CURRENT_MONDAY - timedelta(weeks=weeks_ago), hours)]
+
+
+def test_forecast_ignores_partial_current_week():
+    events = []
+    for weeks_ago in range(1, 5):
+        events += week_events(weeks_ago, 10)
+    # Solo el lunes de la semana actual: con ella la tendencia bajaría
+    events += week_events(0, 1)
+
+    forecast = CalendarAnalytics(events, NOW).forecast_next_week(weeks=4)
+
+    assert forecast['weeks_used'] == 4
+    assert forecast['hours'] == 10.0
+    assert forecast['trend_per_week'] == 0
+
+
+def test_forecast_counts_empty_weeks_as_zero():
+    # Hace 2 semanas no hubo eventos
+    events = week_events(4, 12) + week_events(3, 12) + week_events(1, 12)
+
+    forecast = CalendarAnalytics(events, NOW).forecast_next_week(weeks=4)
+
+    assert forecast['weeks_used'] == 4
+    assert forecast['average'] == 9.0
+
+
+def test_forecast_without_history_is_none():
+    assert CalendarAnalytics(week_events(0, 5), NOW).forecast_next_week(weeks=4) is None
+
+
+def test_compute_stops_between_metrics_when_cancelled(monkeypatch):
+    token = CancellationToken()
+    analytics = CalendarAnalytics(week_events(1, 10), NOW)
+    calls = []
+
+    def busiest_hours():
+        calls.append('busiest_hours')
+        token.cancel()
+        return []
+
+    monkeypatch.setattr(analytics, 'busiest_hours', busiest_hours)
+    monkeypatch.setattr(analytics, 'busiest_weekdays', lambda: calls.append('busiest_weekdays'))
+    with pytest.raises(OperationCancelled):
+        analytics.compute(token)
+    assert calls == ['busiest_hours']
+
+
+def test_predictions_response_honours_a_cancelled_token():
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(OperationCancelled):
+        build_predictions_response(week_events(1, 10), NOW, token)
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from core.calendar_analyzer import CalendarAnalyzer
+
+EVENT_DATA = {'summary': 'Análisis Mensual de Eventos', 'start': {'date': '2025-03-31'}, 'end': {'date': '2025-04-01'}}
+
+
+class FakeStore:
+    def __init__(self, event_ids):
+        self.event_ids = dict(event_ids)
+
+    def get_analysis_event_id(self, month):
+        return self.event_ids.get(month)
+
+    def set_analysis_event_id(self, month, event_id):
+        self.event_ids[month] = event_id
+
+    def clear_analysis_event_id(self, month):
+        self.event_ids.pop(month, None)
+
+
+class FakeCalendar:
+    def __init__(self, update_status=None):
+        self.update_status = update_status
+        self.created = []
+
+    def update_event(self, event_data):
+        if self.update_status:
+            raise HttpError(httplib2.Response({'status': self.update_status}), b'{}')
+
+    def create_event(self, event_data):
+        self.created.append(event_data)
+        return SimpleNamespace(google_event_id=f"nuevo{len(self.created)}")
+
+
+def make_analyzer(calendar_manager, store):
+    analyzer = CalendarAnalyzer(calendar_manager)
+    analyzer.analysis_store = store
+    return analyzer
+
+
+@pytest.mark.parametrize('status', [404, 410])
+def test_deleted_analysis_event_is_recreated(status):
+    calendar, store = FakeCalendar(status), FakeStore({'2025-03': 'viejo'})
+    make_analyzer(calendar, store)._save_analysis_event(EVENT_DATA, '2025-03')
+    assert len(calendar.created) == 1
+    assert store.event_ids == {'2025-03': 'nuevo1'}
+
+
+@pytest.mark.parametrize('status', [403, 500, 503])
+def test_transient_update_error_keeps_the_event(status):
+    calendar, store = FakeCalendar(status), FakeStore({'2025-03': 'viejo'})
+    with pytest.raises(HttpError):
+        make_analyzer(calendar, store)._save_analysis_event(EVENT_DATA, '2025-03')
+    assert calendar.created == []
+    assert store.event_ids == {'2025-03': 'viejo'}
+
+
+def test_save_uses_the_analysed_month(monkeypatch):
+    # El análisis se hizo en marzo aunque al guardar ya sea abril
+    calendar, store = FakeCalendar(), FakeStore({'2025-03': 'marzo', '2025-04': 'abril'})
+    analyzer = make_analyzer(calendar, store)
+    monkeypatch.setattr(analyzer, '_current_month', lambda: '2025-04')
+    saved = []
+    monkeypatch.setattr(analyzer, '_save_analysis_event', lambda data, month: saved.append((data, month)))
+    analyzer.save_to_calendar({'ai_analysis': '', 'api_analysis': '', 'month': '2025-03'})
+    data, month = saved[0]
+    assert month == '2025-03'
+    assert data['start'] == {'date': '2025-03-31'}
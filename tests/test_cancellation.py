@@ -0,0 +1,18 @@
+import gc
+
+from core.cancellation import CancellationToken
+
+
+def test_cancel_propagates_to_children():
+    parent = CancellationToken()
+    child = parent.child(timeout=60)
+    parent.cancel()
+    assert child.is_cancelled
+
+
+def test_finished_children_are_released():
+    parent = CancellationToken()
+    for _ in range(100):
+        parent.child(timeout=60).raise_if_cancelled()
+    gc.collect()
+    assert len(parent._children) == 0
@@ -0,0 +1,25 @@
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import core.free_slots as free_slots
+from core.free_slots import FreeBusyIndex
+
+
+def test_default_timezone_follows_dst(monkeypatch):
+    # En Madrid se pasa de UTC+1 a UTC+2 el domingo 30 de marzo de 2025
+    monkeypatch.setattr(free_slots, 'CALENDAR_TIMEZONE', 'Europe/Madrid')
+    start = datetime(2025, 3, 28, tzinfo=timezone.utc)
+    end = datetime(2025, 4, 1, tzinfo=timezone.utc)
+
+    slots = FreeBusyIndex().find_free_slots(start, end, timedelta(minutes=30),
+                                            work_start=time(9), work_end=time(18), weekdays=range(7))
+
+    opening = {slot_start.date().isoformat(): slot_start.astimezone(timezone.utc).hour for slot_start, _ in slots}
+    assert opening['2025-03-28'] == 8
+    assert opening['2025-03-31'] == 7
+    assert all(slot_start.hour == 9 for slot_start, _ in slots)
+
+
+def test_local_timezone_is_a_zone(monkeypatch):
+    monkeypatch.setattr(free_slots, 'CALENDAR_TIMEZONE', 'America/Santiago')
+    assert free_slots.local_timezone() == ZoneInfo('America/Santiago')
@@ -0,0 +1,36 @@
+import pytest
+
+from core.function_identifier import FunctionIdentifier
+
+
+@pytest.fixture
+def identifier():
+    return FunctionIdentifier()
+
+
+@pytest.mark.parametrize('message', [
+    'traduce "hola mundo" a morse',
+    'Pásalo a código Morse: SOS',
+    'convierte esto en morse por favor',
+    'tradúcemelo a morse: hola',
+])
+def test_explicit_request_is_routed_locally(identifier, message):
+    function_id, confidence = identifier.route(message)
+    assert function_id == 'codigo_morse'
+    assert confidence >= FunctionIdentifier.HIGH_CONFIDENCE
+
+
+@pytest.mark.parametrize('message', [
+    '¿Quién inventó el código morse?',
+    'explícame qué es morse',
+    'el lunes pasado aprendí morse',
+    'escribe un poema sobre el código morse',
+    'convertí mi vida, ahora hablo morse',
+])
+def test_mention_without_request_is_left_to_the_model(identifier, message):
+    function_id, confidence = identifier.route(message)
+    assert FunctionIdentifier.LOW_CONFIDENCE <= confidence < FunctionIdentifier.HIGH_CONFIDENCE
+
+
+def test_unrelated_message_has_no_function(identifier):
+    assert identifier.route('¿Qué tengo mañana en el calendario?')[1] < FunctionIdentifier.LOW_CONFIDENCE